@@ -1,22 +1,32 @@
-import json
 import asyncio
-import websockets
 import logging
 
 from scrapy import signals
-from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+
+from scrapy_agent.ws_client import ReportingClient
 
 logger = logging.getLogger(__name__)
 
 
 class ErrorReportingExtension:
+    def __init__(self, settings):
+        self.settings = settings
+        self.client = None
+
     @classmethod
     def from_crawler(cls, crawler):
-        ext = cls()
+        ext = cls(crawler.settings)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
         crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
         crawler.signals.connect(ext.spider_error, signal=signals.spider_error)
         return ext
 
+    def spider_opened(self, spider):
+        self.client = ReportingClient.from_settings(
+            self.settings, f"/ws/scrapy/{spider.name}/errors"
+        )
+
     def spider_error(self, failure, response, spider):
         # Get the error message.
         error_message = (
@@ -31,6 +41,8 @@ class ErrorReportingExtension:
         if reason != "finished":
             error_message = f"Spider '{spider.name}' closed due to error: {reason}"
             self.send_error(error_message, spider)
+        # Let queued errors flush before the reactor stops.
+        return Deferred.fromFuture(asyncio.ensure_future(self.client.close()))
 
     def send_error(self, error_message, spider):
         # Log the error message locally.
@@ -41,22 +53,5 @@ class ErrorReportingExtension:
             "error": error_message,
             "usage_context": "scraping-error",
         }
-        # Schedule the asynchronous sending inside the reactor's event loop.
-        reactor.callLater(
-            0, lambda: asyncio.create_task(self.send_error_to_ws(payload, spider))
-        )
-
-    async def send_error_to_ws(self, payload, spider):
-        # Define your websocket endpoint.
-        uri = f"ws://localhost:8001/ws/scrapy/{spider.name}/errors"
-        spider.logger.info("Connecting to error reporting service at %s", uri)
-        try:
-            async with websockets.connect(uri) as websocket:
-                # Send the payload as JSON.
-                await websocket.send(json.dumps(payload))
-                spider.logger.info("Sent error payload: %s", payload)
-                # Optionally, wait for a response from the server.
-                report = await websocket.recv()
-                spider.logger.info("Received report: %s", report)
-        except Exception as e:
-            spider.logger.error("Error sending error payload via WebSocket: %s", e)
+        # Queued on the spider's long-lived error reporting connection.
+        self.client.send(payload)
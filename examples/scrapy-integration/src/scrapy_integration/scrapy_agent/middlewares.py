@@ -1,11 +1,10 @@
-import base64
-import json
 import asyncio
-import websockets
 import logging
 
 from scrapy import signals
-from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+
+from scrapy_agent.ws_client import ReportingClient
 
 
 logger = logging.getLogger(__name__)
@@ -24,31 +23,30 @@ def safe_decode(value):
         return value
 
 
-def get_body_snippet(body, length=500, encode_base64=False):
-    """Return a snippet of the body limited to 'length' bytes, optionally Base64 encoded."""
-    if body:
-        if isinstance(body, bytes):
-            snippet = body[:length]
-        else:
-            snippet = body.encode("utf-8")[:length]
-        if encode_base64:
-            snippet = base64.b64encode(snippet).decode("utf-8")
-        else:
-            snippet = snippet.decode("utf-8", errors="replace")
-        return snippet
-    return None
-
-
 class ReportingMiddleware:
+    def __init__(self, settings):
+        self.settings = settings
+        self.client = None
+
     @classmethod
     def from_crawler(cls, crawler):
-        s = cls()
+        s = cls(crawler.settings)
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
     def spider_opened(self, spider):
+        # One long-lived connection per spider; reports are pipelined server-side.
+        max_in_flight = self.settings.getint("REPORTING_MAX_IN_FLIGHT", 8)
+        self.client = ReportingClient.from_settings(
+            self.settings, f"/ws/scrapy/{spider.name}?max_in_flight={max_in_flight}"
+        )
         logger.info("ReportingMiddleware initialized for spider: %s", spider.name)
 
+    def spider_closed(self, spider):
+        # Let queued reports flush before the reactor stops.
+        return Deferred.fromFuture(asyncio.ensure_future(self.client.close()))
+
     def process_response(self, request, response, spider):
         """
         Process the response, collect metadata, and send it to the reporting service.
@@ -68,7 +66,10 @@ class ReportingMiddleware:
             "response": {
                 "url": response.url,
                 "status": response.status,
-                "body": get_body_snippet(response.body, encode_base64=True),
+                # Sent as raw bytes over msgpack; the client Base64-encodes and flags
+                # it over JSON.
+                "body": response.body[:500] or None,
+                "latency": request.meta.get("download_latency"),
                 "headers": {
                     k.decode("utf-8", errors="replace")
                     if isinstance(k, bytes)
@@ -80,23 +81,6 @@ class ReportingMiddleware:
         }
 
         logger.debug("Collected metadata: %s", metadata)
-        # Schedule the asynchronous sending inside a proper task context:
-        reactor.callLater(
-            0, lambda: asyncio.create_task(self.send_metadata(metadata, spider))
-        )
+        # Queued without waiting on the network; the client sends it in batches.
+        self.client.send(metadata)
         return response
-
-    async def send_metadata(self, metadata, spider):
-        """
-        Connects to the reporting service WebSocket and sends the metadata.
-        """
-        uri = f"ws://localhost:8001/ws/scrapy/{spider.name}"
-        logger.info("Connecting to reporting service at %s", uri)
-        try:
-            async with websockets.connect(uri) as websocket:
-                await websocket.send(json.dumps(metadata))
-                logger.info("Sent metadata: %s", metadata)
-                report = await websocket.recv()
-                logger.info("Received report: %s", report)
-        except Exception as e:
-            logger.error("Error sending metadata via WebSocket: %s", e)
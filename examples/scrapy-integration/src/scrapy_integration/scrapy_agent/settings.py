@@ -64,6 +64,14 @@ EXTENSIONS = {
     "scrapy_agent.extensions.ErrorReportingExtension": 500,
 }
 
+# Reporting service connection (one long-lived WebSocket per spider).
+REPORTING_WS_URL = "ws://localhost:8001"
+# REPORTING_QUEUE_SIZE = 1000
+# REPORTING_BATCH_SIZE = 50
+# REPORTING_BATCH_WAIT = 0.05
+# REPORTING_MAX_BACKOFF = 30.0
+# REPORTING_MAX_IN_FLIGHT = 8
+
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 # ITEM_PIPELINES = {
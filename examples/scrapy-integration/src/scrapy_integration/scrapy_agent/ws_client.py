@@ -0,0 +1,246 @@
+import asyncio
+import base64
+import json
+import logging
+import random
+
+import websockets
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    """Base64-encode raw bytes for JSON frames."""
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("utf-8")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_message(message):
+    """
+    Base64-encode a raw response body for a JSON frame and flag it with
+    `body_encoding`, so the service never has to guess whether text is encoded.
+    """
+    response = message.get("response") if isinstance(message, dict) else None
+    if not response or not isinstance(response.get("body"), (bytes, bytearray)):
+        return message
+    body = base64.b64encode(response["body"]).decode("utf-8")
+    response = {**response, "body": body, "body_encoding": "base64"}
+    return {**message, "response": response}
+
+
+class ReportingClient:
+    """
+    Long-lived WebSocket connection to the reporting service.
+
+    Messages are queued without waiting on the network and a background task
+    sends them in batches (a list per frame) over a single connection,
+    reconnecting with exponential backoff when it drops. Reports pushed back by
+    the service are handled by `on_report` as they arrive, so callers never
+    block on a round trip.
+
+    When the outbound queue is full, new messages are dropped and counted
+    rather than slowing the crawl down. A `pause` control message from a
+    draining service stops sending until the next connection, while reports of
+    jobs already accepted keep arriving; messages stay queued meanwhile.
+    """
+
+    def __init__(
+        self,
+        uri,
+        max_queue_size=1000,
+        batch_size=50,
+        batch_wait=0.05,
+        min_backoff=0.5,
+        max_backoff=30.0,
+        on_report=None,
+    ):
+        self.uri = uri
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.on_report = on_report or self._log_report
+        self.subprotocols = ["msgpack", "json"] if msgpack is not None else ["json"]
+        self.sent = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self._queue = None
+        self._task = None
+        self._sending = None
+        self._closing = False
+        # Batch taken from the queue but not yet delivered; resent on reconnect.
+        self._unsent = []
+
+    @classmethod
+    def from_settings(cls, settings, path, **kwargs):
+        """Build a client for an endpoint path using the REPORTING_* settings."""
+        base_url = settings.get("REPORTING_WS_URL", "ws://localhost:8001")
+        return cls(
+            f"{base_url.rstrip('/')}{path}",
+            max_queue_size=settings.getint("REPORTING_QUEUE_SIZE", 1000),
+            batch_size=settings.getint("REPORTING_BATCH_SIZE", 50),
+            batch_wait=settings.getfloat("REPORTING_BATCH_WAIT", 0.05),
+            max_backoff=settings.getfloat("REPORTING_MAX_BACKOFF", 30.0),
+            **kwargs,
+        )
+
+    def send(self, message):
+        """Queue a message; must be called from the event loop's thread."""
+        if self._closing:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    "Reporting queue full, %d messages dropped so far", self.dropped
+                )
+
+    async def close(self, timeout=10.0):
+        """Flush queued messages, waiting at most `timeout` seconds, then disconnect."""
+        self._closing = True
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._drained(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Closing reporting client with %d unsent messages",
+                self._queue.qsize() + len(self._unsent),
+            )
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        logger.info(
+            "Reporting client for %s closed: %d sent, %d dropped, %d reconnects",
+            self.uri,
+            self.sent,
+            self.dropped,
+            self.reconnects,
+        )
+
+    def _ensure_started(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._sending = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _drained(self):
+        while not self._queue.empty() or self._unsent:
+            await asyncio.sleep(0.05)
+
+    async def _run(self):
+        backoff = self.min_backoff
+        while True:
+            try:
+                async with websockets.connect(
+                    self.uri, subprotocols=self.subprotocols
+                ) as websocket:
+                    logger.info(
+                        "Connected to reporting service at %s (%s)",
+                        self.uri,
+                        websocket.subprotocol or "json",
+                    )
+                    backoff = self.min_backoff
+                    await self._serve(websocket)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Reporting connection to %s lost (%s), retrying in %.1fs",
+                    self.uri,
+                    e,
+                    backoff,
+                )
+            self.reconnects += 1
+            # Full jitter keeps restarted spiders from reconnecting in lockstep.
+            await asyncio.sleep(random.uniform(0, backoff))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _serve(self, websocket):
+        binary = websocket.subprotocol == "msgpack"
+        self._sending.set()
+        sender = asyncio.ensure_future(self._send_loop(websocket, binary))
+        receiver = asyncio.ensure_future(self._receive(websocket))
+        try:
+            # Whichever side notices the connection drop first ends the session.
+            done, _ = await asyncio.wait(
+                {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            sender.cancel()
+            receiver.cancel()
+        for task in done:
+            task.result()
+        raise ConnectionError("connection closed by the reporting service")
+
+    async def _send_loop(self, websocket, binary):
+        while True:
+            if not self._unsent:
+                self._unsent = await self._next_batch()
+            await self._sending.wait()
+            await self._send_batch(websocket, self._unsent, binary)
+            self.sent += len(self._unsent)
+            self._unsent = []
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    @staticmethod
+    async def _send_batch(websocket, batch, binary):
+        if binary:
+            frame = batch[0] if len(batch) == 1 else batch
+            await websocket.send(msgpack.packb(frame, use_bin_type=True))
+        else:
+            batch = [_json_message(message) for message in batch]
+            frame = batch[0] if len(batch) == 1 else batch
+            await websocket.send(json.dumps(frame, default=_json_default))
+
+    async def _receive(self, websocket):
+        async for message in websocket:
+            try:
+                if isinstance(message, bytes):
+                    report = msgpack.unpackb(message, raw=False)
+                else:
+                    report = json.loads(message)
+                if isinstance(report, dict) and report.get("type") == "control":
+                    self._handle_control(report)
+                else:
+                    self.on_report(report)
+            except Exception as e:
+                logger.error("Failed to handle report from %s: %s", self.uri, e)
+
+    def _handle_control(self, message):
+        if message.get("action") == "pause":
+            logger.info(
+                "Reporting service at %s asked to pause (%s)",
+                self.uri,
+                message.get("reason"),
+            )
+            self._sending.clear()
+
+    @staticmethod
+    def _log_report(report):
+        logger.info("Received report: %s", report)
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from agents_core.executor import run_sync
+
 
 class Agent(ABC):
     """Abstract base class for all agents."""
@@ -8,3 +10,13 @@ class Agent(ABC):
     def run(self, **kwargs) -> dict:
         """Execute the agent's logic."""
         pass
+
+    async def arun(self, **kwargs) -> dict:
+        """
+        Execute the agent's logic asynchronously.
+
+        Agents that only implement `run` are offloaded to a bounded executor so
+        they never block the event loop; override this with a native async
+        implementation whenever the agent can await its I/O.
+        """
+        return await run_sync(self.run, **kwargs)
@@ -6,9 +6,16 @@ class BaseMetadataAgent(Agent):
     """A simple agent implementation that accepts a name."""
 
     def __init__(self, name: str):
-        self.id = AgentID.generate()
+        self._id = None
         self.name = name
 
+    @property
+    def id(self) -> AgentID:
+        """The agent's identifier, generated on first access."""
+        if self._id is None:
+            self._id = AgentID.generate()
+        return self._id
+
 
 class BaseAgent(BaseMetadataAgent):
     def __init__(self, name: str, llm, config: dict):
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into small batches evaluated by a single call.
+
+    A batch is flushed once `max_batch_size` items are pending or `max_wait`
+    seconds after its first item arrived, whichever comes first. `batch_fn`
+    receives the distinct (hashable) items of the batch and must return one
+    result, or exception instance, per item in order; results are fanned back
+    out to every caller that submitted the item.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[Sequence[Any]]],
+        max_batch_size: int = 16,
+        max_wait: float = 0.01,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid max batch size: {max_batch_size}")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Batches never span event loops.
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._running = set()
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        # Identical items in the same batch are evaluated once.
+        items = list(dict.fromkeys(item for item, _ in batch))
+        try:
+            results = dict(zip(items, await self.batch_fn(items)))
+        except Exception as e:
+            results = {item: e for item in items}
+
+        for item, future in batch:
+            if future.done():
+                continue
+            result = results.get(
+                item, RuntimeError("Batch returned no result for the item.")
+            )
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
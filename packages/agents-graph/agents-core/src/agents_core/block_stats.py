@@ -0,0 +1,232 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+class _Bucket:
+    """Counters of one time slice of a ring buffer."""
+
+    __slots__ = (
+        "epoch",
+        "requests",
+        "statuses",
+        "judged",
+        "blocked",
+        "latency_count",
+        "latency_sum",
+        "latency_max",
+    )
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.requests = 0
+        self.statuses = [0] * len(STATUS_CLASSES)
+        self.judged = 0
+        self.blocked = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+
+
+class _Ring:
+    """Fixed number of time buckets; slots are recycled as time moves on."""
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, size: int):
+        self.buckets: List[Optional[_Bucket]] = [None] * size
+
+    def bucket(self, epoch: int) -> _Bucket:
+        slot = epoch % len(self.buckets)
+        bucket = self.buckets[slot]
+        if bucket is None or bucket.epoch != epoch:
+            bucket = self.buckets[slot] = _Bucket(epoch)
+        return bucket
+
+    def live(self, epoch: int) -> List[_Bucket]:
+        oldest = epoch - len(self.buckets)
+        return [b for b in self.buckets if b is not None and b.epoch > oldest]
+
+
+def response_domain(url: Optional[str]) -> str:
+    """Return the host name of a response URL, or an empty string."""
+    if not url:
+        return ""
+    try:
+        return (urlsplit(url).hostname or "")[:253]
+    except ValueError:
+        return ""
+
+
+class BlockStatsStore:
+    """
+    Rolling per-bot, per-domain response statistics in bounded memory.
+
+    Every (bot, domain) pair owns a ring of `num_buckets` buckets covering
+    `bucket_seconds` each, so statistics span the last
+    `num_buckets * bucket_seconds` seconds. At most `max_keys` pairs are kept,
+    least recently updated first out, which bounds memory regardless of the
+    size of the crawl.
+
+    Block verdicts are only counted when they were reached independently of
+    these statistics (`blocked` is None otherwise), so the rate used as a prior
+    does not feed on itself.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: Optional[float] = None,
+        num_buckets: Optional[int] = None,
+        max_keys: Optional[int] = None,
+    ):
+        self.bucket_seconds = bucket_seconds or float(
+            os.getenv("BLOCK_STATS_BUCKET_SECONDS", "10")
+        )
+        self.num_buckets = num_buckets or int(os.getenv("BLOCK_STATS_BUCKETS", "60"))
+        self.max_keys = max_keys or int(os.getenv("BLOCK_STATS_MAX_KEYS", "10000"))
+        self._rings: OrderedDict[Tuple[str, str], _Ring] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> float:
+        return self.bucket_seconds * self.num_buckets
+
+    def _epoch(self) -> int:
+        return int(time.monotonic() // self.bucket_seconds)
+
+    def record(
+        self,
+        bot_name: str,
+        domain: str,
+        status: int,
+        blocked: Optional[bool] = None,
+        latency_ms: Optional[float] = None,
+    ) -> None:
+        """Count a response and, when known, its block verdict and latency."""
+        key = (bot_name, domain)
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = _Ring(self.num_buckets)
+                while len(self._rings) > self.max_keys:
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(key)
+            bucket = ring.bucket(self._epoch())
+            bucket.requests += 1
+            status_class = status // 100 - 1
+            if 0 <= status_class < len(STATUS_CLASSES):
+                bucket.statuses[status_class] += 1
+            if blocked is not None:
+                bucket.judged += 1
+                bucket.blocked += int(blocked)
+            if latency_ms is not None:
+                bucket.latency_count += 1
+                bucket.latency_sum += latency_ms
+                bucket.latency_max = max(bucket.latency_max, latency_ms)
+
+    def block_rate(
+        self, bot_name: str, domain: str, min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        Return the recent block rate of a bot on a domain, or None when fewer
+        than `min_samples` verdicts were recorded in the window.
+        """
+        with self._lock:
+            ring = self._rings.get((bot_name, domain))
+            if ring is None:
+                return None
+            buckets = ring.live(self._epoch())
+        judged = sum(b.judged for b in buckets)
+        if judged < max(min_samples, 1):
+            return None
+        return sum(b.blocked for b in buckets) / judged
+
+    def snapshot(
+        self, bot_name: Optional[str] = None, domain: Optional[str] = None
+    ) -> List[dict]:
+        """Aggregate the window of every matching (bot, domain) pair."""
+        return [
+            summarize(totals, self.window_seconds)
+            for totals in self.totals(bot_name, domain)
+        ]
+
+    def totals(
+        self, bot_name: Optional[str] = None, domain: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Raw counters of the window of every matching (bot, domain) pair, which
+        unlike summaries can be added up across processes.
+        """
+        epoch = self._epoch()
+        with self._lock:
+            selected = [
+                (key, ring.live(epoch))
+                for key, ring in self._rings.items()
+                if (bot_name is None or key[0] == bot_name)
+                and (domain is None or key[1] == domain)
+            ]
+        return [self._totals(key, buckets) for key, buckets in selected]
+
+    @staticmethod
+    def _totals(key: Tuple[str, str], buckets: List[_Bucket]) -> dict:
+        return {
+            "bot_name": key[0],
+            "domain": key[1],
+            "requests": sum(b.requests for b in buckets),
+            "statuses": [
+                sum(b.statuses[i] for b in buckets) for i in range(len(STATUS_CLASSES))
+            ],
+            "judged": sum(b.judged for b in buckets),
+            "blocked": sum(b.blocked for b in buckets),
+            "latency_count": sum(b.latency_count for b in buckets),
+            "latency_sum": sum(b.latency_sum for b in buckets),
+            "latency_max": max((b.latency_max for b in buckets), default=0.0),
+        }
+
+
+def merge_totals(totals: Iterable[dict]) -> List[dict]:
+    """Add up the totals of the same (bot, domain) pair, e.g. from several workers."""
+    merged: Dict[Tuple[str, str], dict] = {}
+    for entry in totals:
+        key = (entry["bot_name"], entry["domain"])
+        current = merged.get(key)
+        if current is None:
+            merged[key] = {**entry, "statuses": list(entry["statuses"])}
+            continue
+        for name in ("requests", "judged", "blocked", "latency_count", "latency_sum"):
+            current[name] += entry[name]
+        current["statuses"] = [
+            a + b for a, b in zip(current["statuses"], entry["statuses"])
+        ]
+        current["latency_max"] = max(current["latency_max"], entry["latency_max"])
+    return list(merged.values())
+
+
+def summarize(totals: dict, window_seconds: float) -> dict:
+    """Turn the raw totals of a (bot, domain) pair into its reported statistics."""
+    judged = totals["judged"]
+    blocked = totals["blocked"]
+    latency_count = totals["latency_count"]
+    return {
+        "bot_name": totals["bot_name"],
+        "domain": totals["domain"],
+        "window_seconds": window_seconds,
+        "requests": totals["requests"],
+        "statuses": dict(zip(STATUS_CLASSES, totals["statuses"])),
+        "judged": judged,
+        "blocked": blocked,
+        "block_rate": blocked / judged if judged else None,
+        "latency_ms": {
+            "avg": totals["latency_sum"] / latency_count if latency_count else None,
+            "max": totals["latency_max"] if latency_count else None,
+        },
+    }
+
+
+block_stats = BlockStatsStore()
@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+import functools
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from agents_core.metrics import current_labels, metrics
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+node_timeouts = metrics.counter(
+    "workflow_node_timeouts_total",
+    "Workflow nodes cancelled at their timeout or the request deadline.",
+    ("orchestrator", "node", "agent", "bot"),
+)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Point in time by which a request must be answered.
+
+    The budget starts when the payload is ingested, so time spent queued counts
+    against it, and is handed down from the orchestrator to the workflow and
+    its nodes.
+    """
+
+    # `time.monotonic()` at which the budget runs out.
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, 0 once expired."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0
+
+
+# Deadline of the request being processed, for the calls made inside a node.
+current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+def remaining_budget() -> Optional[float]:
+    """
+    Seconds left until the deadline of the request being processed, to bound
+    the calls made inside a node; None outside a request with a deadline.
+    """
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def bounded_node(node: str, timeout: Optional[float] = None):
+    """
+    Decorate an async workflow node to bound it by `timeout` seconds and by the
+    request's deadline, read from the state's `deadline`, whichever is closer.
+
+    A node running out of time is cancelled, along with the agent call it
+    awaits, and returns `{"timed_out": [node]}` instead of its output; a node
+    reached after the deadline is not started. The deadline is exposed through
+    `current_deadline` to the LLM calls made inside the node, which are bounded
+    by what is left of it. The state must accumulate
+    `timed_out` (e.g. `Annotated[List[str], operator.add]`).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(state: dict):
+            deadline = state.get("deadline")
+            limit = timeout
+            if deadline is not None:
+                remaining = deadline.remaining()
+                limit = remaining if limit is None else min(limit, remaining)
+            if limit is None:
+                return await func(state)
+
+            token = current_deadline.set(deadline)
+            try:
+                if limit <= 0:
+                    raise asyncio.TimeoutError
+                return await asyncio.wait_for(func(state), limit)
+            except asyncio.TimeoutError:
+                log.warning(
+                    "Node '%s' timed out for bot '%s'.", node, state.get("bot_name")
+                )
+                if metrics.enabled:
+                    node_timeouts.inc(**current_labels.get())
+                return {"timed_out": [node]}
+            finally:
+                current_deadline.reset(token)
+
+        return wrapper
+
+    return decorator
@@ -1,56 +1,177 @@
 import importlib
-from typing import List
+import os
+import threading
+import tomllib
+from importlib import resources
+from importlib.metadata import entry_points
+from typing import Dict, Iterable, Optional, Tuple, Type
 from agents_core.base_agent import BaseAgent  # adjust import path as needed
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+ENTRY_POINT_GROUP = "agents_service.agents"
+SINGLETON = "singleton"
+TRANSIENT = "transient"
 
 
 class DynamicAgentFactory:
+    """
+    Creates agents by alias.
+
+    Registrations are read once per process from a TOML file (the packaged
+    `agent_registrations.toml`, or `AGENT_REGISTRATIONS_PATH`) and from the
+    `agents_service.agents` entry point group, and indexed by alias. Agent
+    modules are imported on first use and resolved classes are shared by every
+    factory instance.
+    """
+
+    _registrations: Optional[Dict[str, dict]] = None
+    _classes: Dict[str, Type[BaseAgent]] = {}
+    _instances: Dict[Tuple[str, int], Tuple[object, BaseAgent]] = {}
+    _lock = threading.RLock()
+
     def __init__(self, llm):
         self.llm = llm
         self.agent_registrations = self._get_agent_registrations()
 
-    def _get_agent_registrations(self) -> List[dict]:
-        return [
-            {
-                "alias": "joke_generator",
-                "class_path": "agents.joke_agents.JokeGeneratorAgent",
-                "config": {"prompt_template": "Write a short joke about {topic}"},
-            },
-            {
-                "alias": "joke_improver",
-                "class_path": "agents.joke_agents.JokeImproverAgent",
-                "config": {
-                    "prompt_template": "Make this joke funnier by adding wordplay: {joke}"
-                },
-            },
-            {
-                "alias": "joke_polisher",
-                "class_path": "agents.joke_agents.JokePolisherAgent",
-                "config": {
-                    "prompt_template": "Add a surprising twist to this joke: {improved_joke}"
-                },
-            },
-            {
-                "alias": "ip_detector",
-                "class_path": "agents.scraping_agents.IPBlockDetectorAgent",
-            },
-        ]
+    @classmethod
+    def _get_agent_registrations(cls) -> Dict[str, dict]:
+        if cls._registrations is None:
+            with cls._lock:
+                if cls._registrations is None:
+                    registrations = cls._load_entry_points()
+                    registrations.update(cls._load_file())
+                    cls._registrations = registrations
+        return cls._registrations
 
-    def create_agent(self, alias: str) -> BaseAgent:
+    @staticmethod
+    def _load_file() -> Dict[str, dict]:
+        path = os.getenv("AGENT_REGISTRATIONS_PATH")
+        if path:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            source = resources.files("agents_core") / "agent_registrations.toml"
+            data = tomllib.loads(source.read_text(encoding="utf-8"))
+        return {
+            alias: {"alias": alias, **registration}
+            for alias, registration in data.get("agents", {}).items()
+        }
+
+    @staticmethod
+    def _load_entry_points() -> Dict[str, dict]:
+        # Entry points are only resolved to classes when the alias is requested.
+        return {
+            ep.name: {"alias": ep.name, "class_path": ep.value.replace(":", ".")}
+            for ep in entry_points(group=ENTRY_POINT_GROUP)
+        }
+
+    @classmethod
+    def register(
+        cls,
+        alias: str,
+        class_path: str,
+        config: Optional[dict] = None,
+        reuse: str = TRANSIENT,
+    ) -> None:
         """
-        Create an agent instance by its alias.
+        Register (or replace) an agent alias at runtime.
+        """
+        with cls._lock:
+            registrations = dict(cls._get_agent_registrations())
+            registrations[alias] = {
+                "alias": alias,
+                "class_path": class_path,
+                "config": config or {},
+                "reuse": reuse,
+            }
+            cls._registrations = registrations
+            cls._instances = {
+                key: value for key, value in cls._instances.items() if key[0] != alias
+            }
+
+    @classmethod
+    def preload(cls) -> None:
+        """
+        Load the registrations and import every registered agent class, e.g.
+        before forking workers that should share them.
+        """
+        for agent_info in cls._get_agent_registrations().values():
+            try:
+                cls._resolve_class(agent_info["class_path"])
+            except (ImportError, AttributeError) as e:
+                log.warning("Could not preload agent '%s': %s", agent_info["alias"], e)
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Forget loaded registrations, resolved classes and reused instances.
+        """
+        with cls._lock:
+            cls._registrations = None
+            cls._classes = {}
+            cls._instances = {}
+
+    def registration_key(self, aliases: Iterable[str]) -> Tuple:
         """
-        agent_info = next(
-            (item for item in self.agent_registrations if item["alias"] == alias), None
-        )
+        Return a hashable fingerprint of the registrations behind the given aliases.
+        """
+        key = []
+        for alias in aliases:
+            agent_info = self._get_registration(alias)
+            config = agent_info.get("config", {})
+            key.append(
+                (
+                    alias,
+                    agent_info["class_path"],
+                    tuple(sorted((k, repr(v)) for k, v in config.items())),
+                )
+            )
+        return tuple(key)
+
+    def _get_registration(self, alias: str) -> dict:
+        agent_info = self.agent_registrations.get(alias)
         if not agent_info:
             raise ValueError(f"Agent with alias '{alias}' not found.")
+        return agent_info
+
+    @classmethod
+    def _resolve_class(cls, class_path: str) -> Type[BaseAgent]:
+        agent_class = cls._classes.get(class_path)
+        if agent_class is None:
+            module_name, class_name = class_path.rsplit(".", 1)
+            module = importlib.import_module(module_name)
+            agent_class = getattr(module, class_name)
+            cls._classes[class_path] = agent_class
+            log.debug("Resolved agent class %s", class_path)
+        return agent_class
+
+    def create_agent(self, alias: str) -> BaseAgent:
+        """
+        Create an agent instance by its alias.
+
+        Agents registered with `reuse = "singleton"` are built once per LLM and
+        shared afterwards.
+        """
+        agent_info = self._get_registration(alias)
+        if agent_info.get("reuse", TRANSIENT) != SINGLETON:
+            return self._build(agent_info)
 
-        class_path = agent_info["class_path"]
-        module_name, class_name = class_path.rsplit(".", 1)
-        module = importlib.import_module(module_name)
-        agent_class = getattr(module, class_name)
+        key = (alias, id(self.llm))
+        entry = self._instances.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._instances.get(key)
+                if entry is None:
+                    # The LLM is kept with the agent so its id cannot be reused.
+                    entry = (self.llm, self._build(agent_info))
+                    self._instances[key] = entry
+        return entry[1]
 
-        return agent_class(alias, self.llm, agent_info.get("config", {}))
+    def _build(self, agent_info: dict) -> BaseAgent:
+        agent_class = self._resolve_class(agent_info["class_path"])
+        return agent_class(agent_info["alias"], self.llm, agent_info.get("config", {}))
 
     def create_agents(self, aliases: list) -> dict:
         """
@@ -0,0 +1,41 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_sync_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared, bounded executor used to run sync-only agents.
+
+    The pool size is read from `AGENTS_SYNC_MAX_WORKERS` (default 32) the first
+    time the executor is requested.
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                max_workers = int(os.getenv("AGENTS_SYNC_MAX_WORKERS", "32"))
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="agents-sync"
+                )
+    return _executor
+
+
+async def run_sync(func: Callable, /, *args, **kwargs):
+    """
+    Run a blocking callable on the shared executor without blocking the event loop.
+
+    The caller's context is copied so context variables (e.g. LangChain callbacks)
+    keep propagating into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_sync_executor(), call)
@@ -0,0 +1,228 @@
+import contextvars
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets, in seconds, from cache hits to slow LLM calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Labels of the workflow node being executed, for the LLM calls it makes.
+current_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "metrics_labels", default={}
+)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter per label values."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, k)), v) for k, v in values]
+
+
+class Histogram:
+    """Cumulative histogram per label values."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> (per-bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = [(k, list(c), t, n) for k, (c, t, n) in self._values.items()]
+        samples = []
+        for key, counts, total, count in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": repr(bound)}, cumulative)
+                )
+            samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text format.
+
+    Counters and histograms are updated by the instrumented code; collectors
+    are called at scrape time to report gauges read from existing stats, such
+    as queue depths and cache counters, so they cost nothing in between.
+
+    Instrumentation is only installed when `METRICS_ENABLED` is 'true'; when
+    disabled, instrumented call sites are left untouched.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else os.getenv("METRICS_ENABLED", "false").lower() == "true"
+        )
+        self._metrics: Dict[str, object] = {}
+        self._collectors: Dict[str, Tuple[Callable[[], Iterable[Sample]], str]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            # Registering twice returns the existing metric.
+            return self._metrics.setdefault(metric.name, metric)
+
+    def register_collector(
+        self, name: str, collect: Callable[[], Iterable[Sample]], type: str = "gauge"
+    ) -> None:
+        """
+        Register a collector; samples are (name, labels, value). Collectors of
+        `type` 'counter' report running totals kept elsewhere, e.g. in stats.
+        """
+        with self._lock:
+            self._collectors[name] = (collect, type)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        collected: Dict[str, Tuple[str, List[str]]] = {}
+        for collect, type in collectors:
+            for name, labels, value in collect():
+                collected.setdefault(name, (type, []))[1].append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        for name, (type, samples) in collected.items():
+            lines.append(f"# TYPE {name} {type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+node_latency = metrics.histogram(
+    "workflow_node_duration_seconds",
+    "Duration of workflow nodes.",
+    ("orchestrator", "node", "agent", "bot"),
+)
+node_errors = metrics.counter(
+    "workflow_node_errors_total",
+    "Workflow nodes that raised.",
+    ("orchestrator", "node", "agent", "bot"),
+)
+
+
+def instrument_node(orchestrator: str, node: str, agent: str = ""):
+    """
+    Decorate an async workflow node to record its duration and errors.
+
+    The node's labels, with the bot taken from the state, are exposed through
+    `current_labels` to the LLM calls made inside the node. A no-op when
+    metrics are disabled.
+    """
+
+    def decorator(func):
+        if not metrics.enabled:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(state: dict):
+            labels = {
+                "orchestrator": orchestrator,
+                "node": node,
+                "agent": agent,
+                "bot": state.get("bot_name") or "",
+            }
+            token = current_labels.set(labels)
+            started = time.perf_counter()
+            try:
+                return await func(state)
+            except Exception:
+                node_errors.inc(**labels)
+                raise
+            finally:
+                node_latency.observe(time.perf_counter() - started, **labels)
+                current_labels.reset(token)
+
+        return wrapper
+
+    return decorator
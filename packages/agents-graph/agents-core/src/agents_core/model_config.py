@@ -1,8 +1,41 @@
+import json
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Mapping, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class ModelConfig:
-    provider: str  # e.g., "openai" or "anthropic"
+    provider: str  # e.g., "openai", "anthropic" or "fake"
     model_name: str  # e.g., "gpt-3.5-turbo" or "claude-v1"
     temperature: float = 0
+    # Provider-specific settings, e.g. the fake provider's latency model.
+    # Accepts a mapping and is stored as sorted pairs so the config stays hashable.
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    def __post_init__(self):
+        options = self.options
+        if isinstance(options, Mapping):
+            options = options.items()
+        frozen = tuple(
+            sorted(
+                (key, tuple(value) if isinstance(value, list) else value)
+                for key, value in options
+            )
+        )
+        object.__setattr__(self, "options", frozen)
+
+    @cached_property
+    def key(self) -> Tuple[str, str, float, str]:
+        """
+        Hashable identity of the configuration, e.g. for registries.
+
+        Options may hold nested dicts and lists, which are not hashable, so they
+        are keyed by their canonical JSON instead.
+        """
+        options = json.dumps(dict(self.options), sort_keys=True, default=str)
+        return (self.provider, self.model_name, self.temperature, options)
+
+    def option(self, name: str, default: Any = None) -> Any:
+        """Return a provider-specific option."""
+        return dict(self.options).get(name, default)
@@ -1,13 +1,28 @@
-from typing import Type, Dict
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Type
 from agents_core.agent import Agent
 from agents_core.base_agent import BaseMetadataAgent
+from agents_core.registry_protocol import AgentRecord
 
 
 class AgentRegistry:
-    """Concrete implementation of AgentRegistryProtocol."""
+    """
+    Concrete implementation of AgentRegistryProtocol.
+
+    Agents are kept in an in-memory index: lookups by id are dictionary hits
+    and pages are sliced from the creation-ordered sequence.
+    """
 
     _registry: Dict[str, Type[Agent]] = {"base": BaseMetadataAgent}
 
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, AgentRecord] = {}
+        # Sequence numbers in creation order, and the matching records.
+        self._seqs: List[int] = []
+        self._records: List[AgentRecord] = []
+
     def register(self, name: str, agent_cls: Type[Agent]) -> None:
         """Register a new agent class."""
         self._registry[name] = agent_cls
@@ -17,3 +32,49 @@ class AgentRegistry:
         if name not in self._registry:
             raise ValueError(f"Agent '{name}' not found in registry.")
         return self._registry[name]
+
+    def save_agents(self, records: Iterable[AgentRecord]) -> None:
+        """Store agents, all or none."""
+        records = list(records)
+        with self._lock:
+            self._check_new(records)
+            last = self._seqs[-1] if self._seqs else 0
+            self._index(records, last)
+
+    def find_agent(self, agent_id: str) -> Optional[AgentRecord]:
+        """Retrieve a stored agent by id."""
+        return self._by_id.get(agent_id)
+
+    def find_agents(self, agent_ids: Iterable[str]) -> List[AgentRecord]:
+        """Retrieve the stored agents among the given ids, in order."""
+        found = (self._by_id.get(agent_id) for agent_id in agent_ids)
+        return [record for record in found if record is not None]
+
+    def list_agents(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[AgentRecord], Optional[str]]:
+        """
+        Return up to `limit` agents in creation order, after `cursor`, and the
+        cursor of the next page (None on the last page).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        after = int(cursor) if cursor else 0
+        with self._lock:
+            start = bisect.bisect_right(self._seqs, after)
+            page = self._records[start : start + limit]
+            more = start + limit < len(self._records)
+            next_cursor = str(self._seqs[start + limit - 1]) if more else None
+        return page, next_cursor
+
+    def _check_new(self, records: List[AgentRecord]) -> None:
+        ids = [record.id for record in records]
+        if len(set(ids)) != len(ids) or any(i in self._by_id for i in ids):
+            raise ValueError("Agent ids must be unique.")
+
+    def _index(self, records: List[AgentRecord], last_seq: int) -> None:
+        for seq, record in enumerate(records, start=last_seq + 1):
+            self._by_id[record.id] = record
+            self._seqs.append(seq)
+            self._records.append(record)
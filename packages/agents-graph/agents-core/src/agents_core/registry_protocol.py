@@ -1,7 +1,25 @@
-from typing import Protocol, Type
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Protocol, Tuple, Type
 from agents_core.agent import Agent
 
 
+@dataclass(frozen=True)
+class AgentRecord:
+    """A persisted agent.
+
+    Attributes:
+        id (str): The agent's identifier (a UUID).
+        name (str): The agent's name.
+        kind (str): Name of the registered agent class the agent was built from.
+        created_at (float): Unix time of creation.
+    """
+
+    id: str
+    name: str
+    kind: str
+    created_at: float
+
+
 class AgentRegistryProtocol(Protocol):
     """Defines a protocol for agent registries."""
 
@@ -12,3 +30,21 @@ class AgentRegistryProtocol(Protocol):
     def get_agent(self, name: str) -> Type[Agent]:
         """Retrieves an agent class by name."""
         pass
+
+    def save_agents(self, records: Iterable[AgentRecord]) -> None:
+        """Persists agents, all or none."""
+        pass
+
+    def find_agent(self, agent_id: str) -> Optional[AgentRecord]:
+        """Retrieves a persisted agent by id."""
+        pass
+
+    def find_agents(self, agent_ids: Iterable[str]) -> List[AgentRecord]:
+        """Retrieves the persisted agents among the given ids, in order."""
+        pass
+
+    def list_agents(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[AgentRecord], Optional[str]]:
+        """Lists persisted agents after a cursor; returns a page and the next cursor."""
+        pass
@@ -0,0 +1,402 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from agents_core.metrics import metrics
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = frozenset([COMPLETED, FAILED, CANCELLED])
+
+job_wait = metrics.histogram(
+    "job_queue_wait_seconds", "Time jobs waited in the queue.", ("usage_context",)
+)
+job_duration = metrics.histogram(
+    "job_duration_seconds", "Duration of jobs.", ("usage_context", "status")
+)
+jobs_completed = metrics.counter(
+    "jobs_completed_total", "Jobs that completed.", ("usage_context",)
+)
+jobs_failed = metrics.counter(
+    "jobs_failed_total", "Jobs that failed.", ("usage_context",)
+)
+jobs_cancelled = metrics.counter(
+    "jobs_cancelled_total", "Jobs cancelled, queued or running.", ("usage_context",)
+)
+
+
+class SchedulerFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """A unit of work tracked by the scheduler.
+
+    Attributes:
+        id (str): Unique job id.
+        usage_context (str): Usage context the job belongs to; concurrency is
+            limited per context.
+        priority (int): Lower values run first.
+        status (str): 'queued', 'running', 'completed', 'failed' or 'cancelled'.
+        result (Any): Value returned by the job, once completed.
+        error (Optional[str]): Failure description, once failed.
+    """
+
+    usage_context: str
+    priority: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "usage_context": self.usage_context,
+            "priority": self.priority,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+JobFunc = Callable[[], Awaitable[Any]]
+JobCallback = Callable[[Job], Awaitable[None]]
+
+
+def _context_limits_from_env() -> Dict[str, int]:
+    return {
+        k: int(v) for k, v in json.loads(os.getenv("JOB_CONTEXT_LIMITS", "{}")).items()
+    }
+
+
+class JobScheduler:
+    """
+    In-process asynchronous job scheduler.
+
+    Jobs are queued per usage context in priority order and executed by a pool
+    of `workers` tasks started on first use. A worker always picks the highest
+    priority job (FIFO among equal priorities) among the contexts that are
+    below their concurrency limit, so a saturated context never holds workers
+    hostage. Finished jobs are retained, up to `max_retained`, oldest first
+    out, so their result can be looked up by id.
+
+    Each job runs in its own task, so it can be cancelled by id without
+    stopping the worker that runs it. `on_done` runs in a task of its own, for
+    cancelled jobs too, so a slow callback never holds a worker.
+
+    Defaults are read from `JOB_WORKERS` (8), `JOB_CONTEXT_LIMITS` (a JSON
+    object mapping usage contexts to limits; unlimited by default),
+    `JOB_MAX_QUEUED` (10000) and `JOB_RESULTS_MAX` (10000).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        context_limits: Optional[Dict[str, int]] = None,
+        max_queued: Optional[int] = None,
+        max_retained: Optional[int] = None,
+        id_prefix: str = "",
+    ):
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "8"))
+        self.context_limits = (
+            context_limits if context_limits is not None else _context_limits_from_env()
+        )
+        self.max_queued = max_queued or int(os.getenv("JOB_MAX_QUEUED", "10000"))
+        self.max_retained = max_retained or int(os.getenv("JOB_RESULTS_MAX", "10000"))
+        # Prepended to job ids, e.g. to tell which worker process owns a job.
+        self.id_prefix = id_prefix
+        # Queued and running jobs; finished ones move to `_finished`.
+        self._jobs: Dict[str, Job] = {}
+        self._finished: OrderedDict[str, Job] = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Running completion callbacks.
+        self._callbacks: Set[asyncio.Task] = set()
+        self._queues: Dict[str, List[Tuple[int, int, Job, JobFunc, Any]]] = {}
+        self._running: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._idle: Optional[asyncio.Event] = None
+        self._worker_tasks: Set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def submit(
+        self,
+        usage_context: str,
+        func: JobFunc,
+        priority: int = 0,
+        on_done: Optional[JobCallback] = None,
+    ) -> Job:
+        """
+        Queue a job and return it immediately; must be called from the event loop.
+
+        `on_done` is called with the job once it finished, e.g. to push the
+        result to a client, in a task of its own.
+
+        Raises:
+            SchedulerFullError: If `max_queued` jobs are already waiting.
+        """
+        self._ensure_started()
+        if self.queued >= self.max_queued:
+            raise SchedulerFullError(
+                f"Job queue is full ({self.max_queued} jobs waiting)."
+            )
+        job = Job(
+            usage_context=usage_context,
+            priority=priority,
+            id=f"{self.id_prefix}{uuid.uuid4().hex}",
+        )
+        self._jobs[job.id] = job
+        queue = self._queues.setdefault(usage_context, [])
+        heapq.heappush(queue, (priority, next(self._sequence), job, func, on_done))
+        self._idle.clear()
+        self._wake(1)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a queued, running or retained finished job."""
+        job = self._jobs.get(job_id)
+        return job if job is not None else self._finished.get(job_id)
+
+    async def join(self) -> None:
+        """Wait until no job is queued or running, and their callbacks returned."""
+        if self._idle is not None and self._loop is asyncio.get_running_loop():
+            await self._idle.wait()
+            while self._callbacks:
+                await asyncio.wait(set(self._callbacks))
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job, e.g. once nobody waits for its result;
+        returns whether it was cancelled.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        task = self._tasks.get(job_id)
+        if task is not None:
+            # The worker records the cancellation and calls `on_done`.
+            task.cancel()
+            return True
+        queue = self._queues.get(job.usage_context, [])
+        for index, entry in enumerate(queue):
+            if entry[2] is job:
+                queue[index] = queue[-1]
+                queue.pop()
+                heapq.heapify(queue)
+                self._cancel_queued_job(job, entry[4])
+                self._update_idle()
+                return True
+        return False
+
+    def cancel_queued(self) -> int:
+        """Cancel every job that has not started yet; returns how many."""
+        cancelled = 0
+        for queue in self._queues.values():
+            for _, _, job, _, on_done in queue:
+                self._cancel_queued_job(job, on_done)
+                cancelled += 1
+            queue.clear()
+        self._update_idle()
+        return cancelled
+
+    def stats(self) -> dict:
+        """Queue depths and running jobs per usage context, and job counters."""
+        contexts = set(self._queues) | set(self._running)
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "contexts": {
+                context: {
+                    "queued": len(self._queues.get(context, ())),
+                    "running": self._running.get(context, 0),
+                    "limit": self.context_limits.get(context),
+                }
+                for context in sorted(contexts)
+            },
+        }
+
+    # --- Internals ---
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        # Workers and their primitives never span event loops; jobs left on the
+        # previous loop will never finish there.
+        for job in list(self._jobs.values()):
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            self._retain(job)
+        self._loop = loop
+        self._queues = {}
+        self._running = {}
+        self._waiters = deque()
+        self._tasks = {}
+        self._callbacks = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker_tasks = {
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        }
+
+    def _wake(self, count: Optional[int] = None) -> None:
+        # Wake up to `count` idle workers, all of them when None.
+        while self._waiters and (count is None or count > 0):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                if count is not None:
+                    count -= 1
+
+    def _retain(self, job: Job) -> None:
+        # Only finished jobs count against `max_retained`.
+        self._jobs.pop(job.id, None)
+        self._finished[job.id] = job
+        while len(self._finished) > self.max_retained:
+            self._finished.popitem(last=False)
+
+    def _cancel_queued_job(self, job: Job, on_done: Optional[JobCallback]) -> None:
+        job.status = CANCELLED
+        job.finished_at = time.time()
+        if metrics.enabled:
+            jobs_cancelled.inc(usage_context=job.usage_context)
+        self._retain(job)
+        if on_done is not None:
+            self._spawn_notify(job, on_done)
+
+    def _spawn_notify(self, job: Job, on_done: JobCallback) -> None:
+        task = asyncio.ensure_future(self._notify(job, on_done))
+        self._callbacks.add(task)
+        task.add_done_callback(self._callbacks.discard)
+
+    @staticmethod
+    async def _notify(job: Job, on_done: JobCallback) -> None:
+        try:
+            await on_done(job)
+        except Exception as e:
+            log.warning("Completion callback of job %s failed: %s", job.id, e)
+
+    def _next_job(self) -> Optional[Tuple[Job, JobFunc, Any]]:
+        best = None
+        for context, queue in self._queues.items():
+            if not queue:
+                continue
+            limit = self.context_limits.get(context)
+            if limit is not None and self._running.get(context, 0) >= limit:
+                continue
+            if best is None or queue[0][:2] < self._queues[best][0][:2]:
+                best = context
+        if best is None:
+            return None
+        _, _, job, func, on_done = heapq.heappop(self._queues[best])
+        self._running[best] = self._running.get(best, 0) + 1
+        return job, func, on_done
+
+    def _update_idle(self) -> None:
+        if self._idle is not None and not self.queued and not self.running:
+            self._idle.set()
+
+    async def _worker(self) -> None:
+        while True:
+            entry = self._next_job()
+            while entry is None:
+                waiter = self._loop.create_future()
+                self._waiters.append(waiter)
+                await waiter
+                entry = self._next_job()
+            job, func, on_done = entry
+            try:
+                await self._execute(job, func, on_done)
+            finally:
+                self._running[job.usage_context] -= 1
+                self._update_idle()
+                # A context slot was freed: let every idle worker re-check.
+                self._wake()
+
+    async def _execute(
+        self, job: Job, func: JobFunc, on_done: Optional[JobCallback]
+    ) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        if metrics.enabled:
+            job_wait.observe(
+                job.started_at - job.created_at, usage_context=job.usage_context
+            )
+        task = asyncio.ensure_future(func())
+        self._tasks[job.id] = task
+        try:
+            job.result = await task
+            job.status = COMPLETED
+            self.completed += 1
+            if metrics.enabled:
+                jobs_completed.inc(usage_context=job.usage_context)
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+            if metrics.enabled:
+                jobs_cancelled.inc(usage_context=job.usage_context)
+            if asyncio.current_task().cancelling():
+                # The worker itself is being cancelled, e.g. at shutdown.
+                raise
+        except Exception as e:
+            log.error("Job %s (%s) failed: %s", job.id, job.usage_context, e)
+            job.status = FAILED
+            job.error = str(e)
+            self.failed += 1
+            if metrics.enabled:
+                jobs_failed.inc(usage_context=job.usage_context)
+        finally:
+            del self._tasks[job.id]
+            job.finished_at = time.time()
+            self._retain(job)
+            if metrics.enabled:
+                job_duration.observe(
+                    job.finished_at - job.started_at,
+                    usage_context=job.usage_context,
+                    status=job.status,
+                )
+            # Not awaited: the worker moves on while, e.g., a slow client is
+            # sent the report; also reached when the worker is cancelled.
+            if on_done is not None:
+                self._spawn_notify(job, on_done)
+
+
+job_scheduler = JobScheduler()
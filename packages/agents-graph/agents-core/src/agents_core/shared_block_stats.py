@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from agents_core.block_stats import (
+    BlockStatsStore,
+    block_stats,
+    merge_totals,
+    summarize,
+)
+from agents_core.executor import run_sync
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS block_stats (
+    worker TEXT NOT NULL,
+    bot_name TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    published_at REAL NOT NULL,
+    totals TEXT NOT NULL,
+    PRIMARY KEY (worker, bot_name, domain)
+)
+"""
+
+
+class SharedBlockStats:
+    """
+    Block statistics of every WebSocket worker, gathered in SQLite.
+
+    Each worker keeps its statistics in its own `BlockStatsStore` and
+    periodically publishes the window totals, replacing the rows it published
+    before; readers, such as the REST API, merge the fresh rows of all workers.
+    Rows not republished within `stale_after` seconds, e.g. those of a worker
+    that stopped, are ignored and eventually deleted. Published totals lag the
+    workers by at most one `interval`.
+
+    The database path is read from `BLOCK_STATS_DB_PATH` (default
+    `block_stats.db`), the publish interval from `BLOCK_STATS_PUBLISH_SECONDS`
+    (default 10).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        interval: Optional[float] = None,
+        worker: Optional[str] = None,
+    ):
+        self.path = path or os.getenv("BLOCK_STATS_DB_PATH", "block_stats.db")
+        self.interval = interval or float(
+            os.getenv("BLOCK_STATS_PUBLISH_SECONDS", "10")
+        )
+        self.stale_after = 3 * self.interval
+        self._worker = worker
+        # Opened on first use, in the process that uses it.
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def worker(self) -> str:
+        # Resolved late: workers are forked after this object is created.
+        return self._worker or str(os.getpid())
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def publish(self, store: BlockStatsStore = block_stats) -> None:
+        """Replace this worker's rows with the current totals of `store`."""
+        now = time.time()
+        rows = [
+            (
+                self.worker,
+                totals["bot_name"],
+                totals["domain"],
+                now,
+                json.dumps(totals),
+            )
+            for totals in store.totals()
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM block_stats WHERE worker = ?", (self.worker,))
+                conn.execute(
+                    "DELETE FROM block_stats WHERE published_at < ?",
+                    (now - self.stale_after,),
+                )
+                conn.executemany(
+                    "INSERT INTO block_stats "
+                    "(worker, bot_name, domain, published_at, totals) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def snapshot(
+        self, bot_name: Optional[str] = None, domain: Optional[str] = None
+    ) -> List[dict]:
+        """Aggregate the published window of every matching (bot, domain) pair."""
+        query = "SELECT totals FROM block_stats WHERE published_at >= ?"
+        params: list = [time.time() - self.stale_after]
+        if bot_name is not None:
+            query += " AND bot_name = ?"
+            params.append(bot_name)
+        if domain is not None:
+            query += " AND domain = ?"
+            params.append(domain)
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        totals = merge_totals(json.loads(row[0]) for row in rows)
+        return [summarize(entry, block_stats.window_seconds) for entry in totals]
+
+    async def publish_periodically(self, store: BlockStatsStore = block_stats) -> None:
+        """Publish the totals of `store` every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await run_sync(self.publish, store)
+            except sqlite3.Error as e:
+                log.warning("Failed to publish block statistics: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+shared_block_stats = SharedBlockStats()
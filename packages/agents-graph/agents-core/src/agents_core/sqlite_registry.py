@@ -0,0 +1,76 @@
+import os
+import sqlite3
+from typing import Iterable, Optional
+
+from agents_core.registry import AgentRegistry
+from agents_core.registry_protocol import AgentRecord
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class SQLiteAgentRegistry(AgentRegistry):
+    """
+    Agent registry persisting agents in SQLite.
+
+    The in-memory index is loaded once at startup and serves every read;
+    SQLite is only written to, each batch in a single transaction. The database
+    runs in WAL mode, so commits append to the log instead of rewriting pages
+    and never block readers.
+
+    The index assumes this registry is the only writer of the database, which
+    holds as long as a single process serves the agent endpoints.
+
+    The database path is read from `AGENTS_DB_PATH` (default `agents.db`).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        self.path = path or os.getenv("AGENTS_DB_PATH", "agents.db")
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Durable across application crashes; WAL keeps it consistent on power loss.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT seq, id, name, kind, created_at FROM agents ORDER BY seq"
+        ).fetchall()
+        for seq, *fields in rows:
+            self._index([AgentRecord(*fields)], seq - 1)
+        log.info("Loaded %s agents from %s", len(rows), self.path)
+
+    def save_agents(self, records: Iterable[AgentRecord]) -> None:
+        """Persist agents in a single transaction, all or none."""
+        records = list(records)
+        with self._lock:
+            self._check_new(records)
+            last = self._seqs[-1] if self._seqs else 0
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO agents (seq, id, name, kind, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (seq, r.id, r.name, r.kind, r.created_at)
+                        for seq, r in enumerate(records, start=last + 1)
+                    ],
+                )
+            # Only indexed once committed.
+            self._index(records, last)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
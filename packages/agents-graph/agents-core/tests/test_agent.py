@@ -0,0 +1,24 @@
+import asyncio
+import threading
+
+from agents_core.base_agent import BaseAgent
+
+
+class SyncOnlyAgent(BaseAgent):
+    def run(self, value: int) -> dict:
+        return {"value": value, "thread": threading.current_thread().name}
+
+
+def test_arun_offloads_sync_agents_to_executor():
+    agent = SyncOnlyAgent("sync", llm=None, config={})
+
+    result = asyncio.run(agent.arun(value=3))
+
+    assert result["value"] == 3
+    assert result["thread"].startswith("agents-sync")
+
+
+def test_base_agent_arun_defaults_to_run():
+    agent = BaseAgent("base", llm=None, config={"key": "value"})
+
+    assert asyncio.run(agent.arun()) == agent.run()
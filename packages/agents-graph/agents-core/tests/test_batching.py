@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from agents_core.batching import MicroBatcher
+
+
+def test_concurrent_items_share_one_batch():
+    calls = []
+
+    async def batch_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=10, max_wait=0.01)
+        return await asyncio.gather(*(batcher.submit(i) for i in (1, 2, 2, 3)))
+
+    assert asyncio.run(scenario()) == [2, 4, 4, 6]
+    assert calls == [[1, 2, 3]]
+
+
+def test_full_batches_flush_without_waiting():
+    calls = []
+
+    async def batch_fn(items):
+        calls.append(len(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait=60)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=1)) == [0, 1, 2, 3]
+    assert calls == [2, 2]
+
+
+def test_per_item_exceptions_are_fanned_out():
+    async def batch_fn(items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(batch_fn)
+        return await asyncio.gather(
+            batcher.submit("good"), batcher.submit("bad"), return_exceptions=True
+        )
+
+    good, bad = asyncio.run(scenario())
+
+    assert good == "good"
+    assert isinstance(bad, ValueError)
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
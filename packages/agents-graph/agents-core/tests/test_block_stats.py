@@ -0,0 +1,78 @@
+import time
+
+from agents_core import block_stats as block_stats_module
+from agents_core import shared_block_stats as shared_module
+from agents_core.block_stats import BlockStatsStore, response_domain
+from agents_core.shared_block_stats import SharedBlockStats
+
+
+def test_counts_statuses_verdicts_and_latency():
+    store = BlockStatsStore(bucket_seconds=10, num_buckets=6, max_keys=10)
+    store.record("shop", "example.com", 200, blocked=False, latency_ms=100)
+    store.record("shop", "example.com", 403, blocked=True, latency_ms=300)
+    store.record("shop", "example.com", 503)
+
+    [stats] = store.snapshot(bot_name="shop")
+
+    assert stats["requests"] == 3
+    assert stats["statuses"] == {"1xx": 0, "2xx": 1, "3xx": 0, "4xx": 1, "5xx": 1}
+    assert (stats["judged"], stats["blocked"], stats["block_rate"]) == (2, 1, 0.5)
+    assert stats["latency_ms"] == {"avg": 200.0, "max": 300}
+    assert store.block_rate("shop", "example.com", min_samples=3) is None
+    assert store.block_rate("shop", "example.com", min_samples=2) == 0.5
+
+
+def test_old_buckets_leave_the_window(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(block_stats_module.time, "monotonic", lambda: now[0])
+    store = BlockStatsStore(bucket_seconds=10, num_buckets=3, max_keys=10)
+
+    store.record("shop", "example.com", 403, blocked=True)
+    now[0] = 25.0
+    store.record("shop", "example.com", 200, blocked=False)
+    assert store.block_rate("shop", "example.com") == 0.5
+
+    now[0] = 31.0  # The first bucket's slot is now recycled.
+    store.record("shop", "example.com", 200, blocked=False)
+    assert store.block_rate("shop", "example.com") == 0.0
+    assert store.snapshot()[0]["requests"] == 2
+
+
+def test_keeps_at_most_max_keys():
+    store = BlockStatsStore(bucket_seconds=10, num_buckets=3, max_keys=2)
+    for domain in ("a.com", "b.com", "a.com", "c.com"):
+        store.record("shop", domain, 200)
+
+    assert sorted(s["domain"] for s in store.snapshot()) == ["a.com", "c.com"]
+
+
+def test_workers_publish_totals_merged_by_readers(tmp_path, monkeypatch):
+    path = str(tmp_path / "block_stats.db")
+    first, second = (
+        BlockStatsStore(bucket_seconds=10, num_buckets=6, max_keys=10) for _ in range(2)
+    )
+    first.record("shop", "example.com", 403, blocked=True, latency_ms=300)
+    second.record("shop", "example.com", 200, blocked=False, latency_ms=100)
+    second.record("news", "example.org", 200)
+
+    SharedBlockStats(path, interval=10, worker="w0").publish(first)
+    SharedBlockStats(path, interval=10, worker="w1").publish(second)
+    reader = SharedBlockStats(path, interval=10)
+
+    [stats] = reader.snapshot(bot_name="shop")
+    assert stats["requests"] == 2
+    assert (stats["judged"], stats["blocked"], stats["block_rate"]) == (2, 1, 0.5)
+    assert stats["latency_ms"] == {"avg": 200.0, "max": 300}
+    assert len(reader.snapshot()) == 2
+
+    # Rows of a worker that stopped publishing go stale.
+    later = time.time() + 31
+    monkeypatch.setattr(shared_module.time, "time", lambda: later)
+    assert reader.snapshot() == []
+
+
+def test_response_domain():
+    assert (
+        response_domain("https://Shop.Example.com:8443/item?id=1") == "shop.example.com"
+    )
+    assert response_domain(None) == ""
@@ -0,0 +1,56 @@
+import pytest
+
+from agents_core.base_agent import BaseAgent
+from agents_core.dynamic_agent_factory import DynamicAgentFactory
+
+
+@pytest.fixture(autouse=True)
+def reset_factory():
+    DynamicAgentFactory.reset()
+    yield
+    DynamicAgentFactory.reset()
+
+
+def test_default_registrations_are_indexed_by_alias():
+    factory = DynamicAgentFactory(llm=None)
+
+    assert {"joke_generator", "ip_detector"} <= set(factory.agent_registrations)
+
+
+def test_singleton_agents_are_reused_per_llm():
+    DynamicAgentFactory.register(
+        "shared", "agents_core.base_agent.BaseAgent", reuse="singleton"
+    )
+    llm_a, llm_b = object(), object()
+
+    first = DynamicAgentFactory(llm_a).create_agent("shared")
+
+    assert DynamicAgentFactory(llm_a).create_agent("shared") is first
+    assert DynamicAgentFactory(llm_b).create_agent("shared") is not first
+
+
+def test_transient_agents_are_built_per_call():
+    DynamicAgentFactory.register(
+        "fresh", "agents_core.base_agent.BaseAgent", config={"key": "value"}
+    )
+    factory = DynamicAgentFactory(llm=None)
+
+    first, second = factory.create_agent("fresh"), factory.create_agent("fresh")
+
+    assert isinstance(first, BaseAgent)
+    assert first is not second
+    assert first.config == {"key": "value"}
+
+
+def test_registrations_can_come_from_a_file(tmp_path, monkeypatch):
+    path = tmp_path / "agents.toml"
+    path.write_text(
+        '[agents.custom]\nclass_path = "agents_core.base_agent.BaseAgent"\n'
+    )
+    monkeypatch.setenv("AGENT_REGISTRATIONS_PATH", str(path))
+
+    factory = DynamicAgentFactory(llm=None)
+
+    assert factory.create_agent("custom").name == "custom"
+    with pytest.raises(ValueError):
+        factory.create_agent("joke_generator")
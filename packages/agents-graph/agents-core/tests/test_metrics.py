@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from agents_core import metrics as metrics_module
+from agents_core.metrics import MetricsRegistry, current_labels, instrument_node
+
+
+def test_renders_prometheus_text_format():
+    registry = MetricsRegistry(enabled=True)
+    requests = registry.counter("requests_total", "Requests.", ("bot",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    registry.register_collector("queue", lambda: [("queued", {"ctx": 'a"b'}, 3)])
+    registry.register_collector("sent", lambda: [("sent_total", {}, 7)], "counter")
+
+    requests.inc(bot="shop")
+    requests.inc(2, bot="shop")
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{bot="shop"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 5.5",
+        "latency_seconds_count 2",
+        "# TYPE queued gauge",
+        'queued{ctx="a\\"b"} 3',
+        "# TYPE sent_total counter",
+        "sent_total 7",
+    ]
+
+
+def test_instrument_node_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(metrics_module.metrics, "enabled", False)
+
+    async def node(state):
+        return {}
+
+    assert instrument_node("scraping", "node")(node) is node
+
+
+def test_instrument_node_records_duration_errors_and_labels(monkeypatch):
+    monkeypatch.setattr(metrics_module.metrics, "enabled", True)
+    seen = {}
+
+    @instrument_node("scraping", "detector", "ip_detector")
+    async def node(state):
+        seen.update(current_labels.get())
+        if state.get("fail"):
+            raise ValueError("boom")
+        return {}
+
+    asyncio.run(node({"bot_name": "shop"}))
+    with pytest.raises(ValueError):
+        asyncio.run(node({"bot_name": "shop", "fail": True}))
+
+    labels = {
+        "orchestrator": "scraping",
+        "node": "detector",
+        "agent": "ip_detector",
+        "bot": "shop",
+    }
+    assert seen == labels
+    assert current_labels.get() == {}
+    counts = [
+        value
+        for name, sample_labels, value in metrics_module.node_latency.samples()
+        if name.endswith("_count") and sample_labels == labels
+    ]
+    assert counts == [2]
+    assert (
+        "workflow_node_errors_total",
+        labels,
+        1,
+    ) in metrics_module.node_errors.samples()
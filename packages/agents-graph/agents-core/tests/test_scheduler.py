@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from agents_core.scheduler import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    JobScheduler,
+    SchedulerFullError,
+)
+
+
+def test_jobs_run_in_priority_order_and_report_results():
+    order = []
+    finished = []
+
+    def make_job(name):
+        async def job():
+            order.append(name)
+            return {"name": name}
+
+        return job
+
+    async def on_done(job):
+        finished.append(job.status)
+
+    async def scenario():
+        scheduler = JobScheduler(workers=1)
+        low = scheduler.submit("scraping", make_job("low"), priority=5)
+        high = scheduler.submit(
+            "scraping", make_job("high"), priority=0, on_done=on_done
+        )
+        await scheduler.join()
+        return scheduler, low, high
+
+    scheduler, low, high = asyncio.run(scenario())
+
+    assert order == ["high", "low"]
+    assert (high.status, high.result) == (COMPLETED, {"name": "high"})
+    assert scheduler.get(low.id) is low
+    assert finished == [COMPLETED]
+
+
+def test_context_limit_does_not_hold_other_contexts_back():
+    running = {"slow": 0, "fast": 0}
+    peak = {"slow": 0, "fast": 0}
+
+    def make_job(context, delay):
+        async def job():
+            running[context] += 1
+            peak[context] = max(peak[context], running[context])
+            await asyncio.sleep(delay)
+            running[context] -= 1
+
+        return job
+
+    async def scenario():
+        scheduler = JobScheduler(workers=4, context_limits={"slow": 1})
+        for _ in range(3):
+            scheduler.submit("slow", make_job("slow", 0.02))
+        for _ in range(3):
+            scheduler.submit("fast", make_job("fast", 0.01))
+        await asyncio.sleep(0.005)
+        stats = scheduler.stats()
+        await scheduler.join()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert peak == {"slow": 1, "fast": 3}
+    assert stats["contexts"]["slow"] == {"queued": 2, "running": 1, "limit": 1}
+
+
+def test_failures_are_recorded_and_queue_is_bounded():
+    async def boom():
+        raise ValueError("boom")
+
+    async def scenario():
+        scheduler = JobScheduler(workers=1, max_queued=1)
+        job = scheduler.submit("scraping", boom)
+        with pytest.raises(SchedulerFullError):
+            scheduler.submit("scraping", boom)
+        await scheduler.join()
+        return scheduler, job
+
+    scheduler, job = asyncio.run(scenario())
+
+    assert (job.status, job.error) == (FAILED, "boom")
+    assert scheduler.failed == 1
+
+
+def test_cancelled_jobs_are_reported_and_workers_keep_going():
+    finished = []
+
+    async def on_done(job):
+        finished.append((job.id, job.status))
+
+    async def scenario():
+        scheduler = JobScheduler(workers=1)
+        blocker = asyncio.Event()
+
+        async def slow():
+            await blocker.wait()
+
+        async def fast():
+            return "done"
+
+        running = scheduler.submit("scraping", slow, on_done=on_done)
+        queued = scheduler.submit("scraping", slow, on_done=on_done)
+        last = scheduler.submit("scraping", fast, on_done=on_done)
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel(queued.id)
+        assert scheduler.cancel(running.id)
+        await scheduler.join()
+        await asyncio.sleep(0)
+        assert not scheduler.cancel(last.id)
+        return running, queued, last
+
+    running, queued, last = asyncio.run(scenario())
+
+    assert (running.status, queued.status, last.status) == (
+        CANCELLED,
+        CANCELLED,
+        COMPLETED,
+    )
+    assert sorted(finished) == sorted(
+        [(running.id, CANCELLED), (queued.id, CANCELLED), (last.id, COMPLETED)]
+    )
+
+
+def test_slow_callbacks_do_not_hold_workers():
+    async def scenario():
+        scheduler = JobScheduler(workers=1)
+        client = asyncio.Event()
+        reported = []
+
+        async def slow_client(job):
+            await client.wait()
+            reported.append(job.id)
+
+        async def job():
+            return None
+
+        first = scheduler.submit("scraping", job, on_done=slow_client)
+        second = scheduler.submit("scraping", job)
+        # The only worker runs the second job while the first is reported.
+        await asyncio.wait_for(scheduler._idle.wait(), 1)
+        assert second.status == COMPLETED
+        assert reported == []
+        client.set()
+        await scheduler.join()
+        assert reported == [first.id]
+
+    asyncio.run(scenario())
+
+
+def test_only_finished_jobs_count_against_retention():
+    async def job():
+        return None
+
+    async def scenario():
+        scheduler = JobScheduler(workers=1, max_retained=2)
+        done = [scheduler.submit("scraping", job) for _ in range(3)]
+        await scheduler.join()
+        pending = scheduler.submit("scraping", job)
+
+        assert scheduler.get(done[0].id) is None
+        assert [scheduler.get(job.id) for job in done[1:]] == done[1:]
+        assert scheduler.get(pending.id) is pending
+
+    asyncio.run(scenario())
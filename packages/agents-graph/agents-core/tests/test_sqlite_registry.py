@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from agents_core.registry_protocol import AgentRecord
+from agents_core.sqlite_registry import SQLiteAgentRegistry
+
+
+def _records(count, start=0):
+    return [
+        AgentRecord(f"id-{i}", f"agent-{i}", "base", float(i))
+        for i in range(start, start + count)
+    ]
+
+
+def test_agents_survive_a_restart(tmp_path):
+    path = str(tmp_path / "agents.db")
+    registry = SQLiteAgentRegistry(path)
+    registry.save_agents(_records(3))
+    registry.close()
+
+    reloaded = SQLiteAgentRegistry(path)
+
+    assert reloaded.find_agent("id-1") == AgentRecord("id-1", "agent-1", "base", 1.0)
+    assert [r.id for r in reloaded.find_agents(["id-2", "missing", "id-0"])] == [
+        "id-2",
+        "id-0",
+    ]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_cursor_pagination_walks_every_agent_once(tmp_path):
+    registry = SQLiteAgentRegistry(str(tmp_path / "agents.db"))
+    registry.save_agents(_records(5))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = registry.list_agents(cursor, limit=2)
+        seen += [r.id for r in page]
+        # Agents created meanwhile show up on later pages.
+        if len(seen) == 2:
+            registry.save_agents(_records(1, start=5))
+        if cursor is None:
+            break
+
+    assert seen == [f"id-{i}" for i in range(6)]
+
+
+def test_batch_is_all_or_nothing(tmp_path):
+    registry = SQLiteAgentRegistry(str(tmp_path / "agents.db"))
+    registry.save_agents(_records(1))
+
+    with pytest.raises(ValueError):
+        registry.save_agents(_records(2))
+
+    assert registry.list_agents()[0] == _records(1)
+    with pytest.raises(ValueError):
+        registry.list_agents("not-a-cursor")
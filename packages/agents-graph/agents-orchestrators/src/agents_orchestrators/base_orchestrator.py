@@ -1,5 +1,5 @@
 from agents_core.model_config import ModelConfig
-from langchain_openai import ChatOpenAI
+from agents_orchestrators.llm_registry import llm_registry
 
 
 class BaseOrchestrator:
@@ -7,9 +7,8 @@ class BaseOrchestrator:
         self.llm = self._instantiate_llm(model_config)
 
     def _instantiate_llm(self, model_config: ModelConfig):
-        if model_config.provider == "openai":
-            return ChatOpenAI(
-                model=model_config.model_name, temperature=model_config.temperature
-            )
-        else:
-            raise ValueError(f"Unsupported model provider: {model_config.provider}")
+        # Clients are shared process-wide per model configuration.
+        return llm_registry.get(model_config)
+
+    def warm_up(self) -> None:
+        """Build what the first payload would otherwise pay for."""
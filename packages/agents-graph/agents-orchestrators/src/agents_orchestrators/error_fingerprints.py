@@ -0,0 +1,138 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+# Volatile parts of a traceback, replaced in order before hashing.
+_NORMALIZERS: Tuple[Tuple[re.Pattern, str], ...] = (
+    (re.compile(r"\b[a-z][a-z0-9+.-]*://\S+", re.IGNORECASE), "<url>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE), "<addr>"),
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+            re.IGNORECASE,
+        ),
+        "<uuid>",
+    ),
+    (re.compile(r"\bline \d+"), "line <n>"),
+    (re.compile(r"[ \t]+"), " "),
+)
+
+
+def normalize_traceback(text: str) -> str:
+    """
+    Reduce an error message or traceback to its stable shape.
+
+    URLs, memory addresses, UUIDs and line numbers are replaced by
+    placeholders, so repeats of the same failure normalize identically. Other
+    numbers, such as status or error codes, are kept: they tell errors apart.
+    """
+    for pattern, placeholder in _NORMALIZERS:
+        text = pattern.sub(placeholder, text)
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def fingerprint_error(text: str) -> str:
+    """Return the stable fingerprint of an error message or traceback."""
+    normalized = normalize_traceback(text)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ErrorOccurrence:
+    """Occurrences of one error fingerprint reported by a bot.
+
+    Attributes:
+        fingerprint (str): Stable hash of the normalized traceback.
+        summary (str): Last line of the normalized traceback, e.g. the exception.
+        count (int): Total number of occurrences.
+        first_seen (float): Unix time of the first occurrence.
+        last_seen (float): Unix time of the latest occurrence.
+        window_started (float): Unix time of the occurrence that opened the
+            current deduplication window.
+    """
+
+    fingerprint: str
+    summary: str
+    count: int
+    first_seen: float
+    last_seen: float
+    window_started: float
+
+
+class ErrorFingerprintRegistry:
+    """
+    Tracks error fingerprints per bot to deduplicate repeated failures.
+
+    The first occurrence of a fingerprint in a `window_seconds` window is
+    reported as new; repeats within the window only update the counters. Each
+    bot keeps at most `max_fingerprints` entries, and at most `max_bots` bots
+    are tracked, least recently seen first out.
+    """
+
+    def __init__(
+        self,
+        window_seconds: Optional[float] = None,
+        max_fingerprints: Optional[int] = None,
+        max_bots: Optional[int] = None,
+    ):
+        self.window_seconds = window_seconds or float(
+            os.getenv("ERROR_DEDUP_WINDOW_SECONDS", "300")
+        )
+        self.max_fingerprints = max_fingerprints or int(
+            os.getenv("ERROR_DEDUP_MAX_FINGERPRINTS", "1000")
+        )
+        self.max_bots = max_bots or int(os.getenv("ERROR_DEDUP_MAX_BOTS", "1000"))
+        self._bots: OrderedDict[str, OrderedDict[str, ErrorOccurrence]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, bot_name: str, error: str) -> Tuple[ErrorOccurrence, bool]:
+        """
+        Count an error reported by a bot.
+
+        Returns the updated occurrence and whether it is the first one of its
+        deduplication window, i.e. whether it should be processed.
+        """
+        fingerprint = fingerprint_error(error)
+        now = time.time()
+        with self._lock:
+            occurrences = self._bots.get(bot_name)
+            if occurrences is None:
+                occurrences = self._bots[bot_name] = OrderedDict()
+                while len(self._bots) > self.max_bots:
+                    self._bots.popitem(last=False)
+            else:
+                self._bots.move_to_end(bot_name)
+            occurrence = occurrences.get(fingerprint)
+            if occurrence is None:
+                lines = normalize_traceback(error).splitlines()
+                occurrence = ErrorOccurrence(
+                    fingerprint=fingerprint,
+                    summary=lines[-1] if lines else "",
+                    count=0,
+                    first_seen=now,
+                    last_seen=now,
+                    window_started=now,
+                )
+                occurrences[fingerprint] = occurrence
+                is_new = True
+            else:
+                is_new = now - occurrence.window_started >= self.window_seconds
+                if is_new:
+                    occurrence.window_started = now
+                occurrences.move_to_end(fingerprint)
+            occurrence.count += 1
+            occurrence.last_seen = now
+            while len(occurrences) > self.max_fingerprints:
+                occurrences.popitem(last=False)
+            return occurrence, is_new
+
+    def summary(self, bot_name: str) -> List[dict]:
+        """Return the error fingerprints of a bot, most frequent first."""
+        with self._lock:
+            occurrences = [asdict(o) for o in self._bots.get(bot_name, {}).values()]
+        return sorted(occurrences, key=lambda o: o["count"], reverse=True)
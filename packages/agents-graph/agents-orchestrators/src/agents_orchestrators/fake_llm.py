@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agents_core.model_config import ModelConfig
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+DISTRIBUTIONS = ("none", "constant", "uniform", "exponential", "lognormal")
+
+
+class FakeRateLimitError(Exception):
+    """Simulated provider rate limit (HTTP 429)."""
+
+    status_code = 429
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Latency and failure model of the fake provider.
+
+    Attributes:
+        distribution (str): One of 'none', 'constant', 'uniform', 'exponential'
+            or 'lognormal'.
+        mean_ms (float): Mean latency of a call, in milliseconds.
+        spread_ms (float): Half-width for 'uniform', standard deviation for
+            'lognormal'; ignored otherwise.
+        tail_probability (float): Probability that a call hits a latency spike.
+        tail_multiplier (float): Factor applied to the latency of a spike.
+        error_rate (float): Probability that a call fails with a 429.
+    """
+
+    distribution: str = "none"
+    mean_ms: float = 0
+    spread_ms: float = 0
+    tail_probability: float = 0
+    tail_multiplier: float = 10
+    error_rate: float = 0
+
+    def __post_init__(self):
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Invalid latency distribution: {self.distribution}. "
+                f"Must be one of {list(DISTRIBUTIONS)}"
+            )
+
+    @classmethod
+    def from_config(cls, model_config: ModelConfig) -> "LatencyModel":
+        """Build the latency model from `latency_*` / `error_rate` options."""
+        return cls(
+            distribution=model_config.option("latency", "none"),
+            mean_ms=float(model_config.option("latency_mean_ms", 0)),
+            spread_ms=float(model_config.option("latency_spread_ms", 0)),
+            tail_probability=float(model_config.option("latency_tail_probability", 0)),
+            tail_multiplier=float(model_config.option("latency_tail_multiplier", 10)),
+            error_rate=float(model_config.option("error_rate", 0)),
+        )
+
+    def sample(self, rng: random.Random) -> Tuple[float, bool]:
+        """Return the delay in seconds and whether the call is rate limited."""
+        delay_ms = 0.0
+        if self.distribution == "constant":
+            delay_ms = self.mean_ms
+        elif self.distribution == "uniform":
+            delay_ms = rng.uniform(
+                self.mean_ms - self.spread_ms, self.mean_ms + self.spread_ms
+            )
+        elif self.distribution == "exponential" and self.mean_ms:
+            delay_ms = rng.expovariate(1 / self.mean_ms)
+        elif self.distribution == "lognormal" and self.mean_ms:
+            # Parameters of the underlying normal matching the requested mean/stddev.
+            variance = math.log(1 + (self.spread_ms / self.mean_ms) ** 2)
+            mu = math.log(self.mean_ms) - variance / 2
+            delay_ms = rng.lognormvariate(mu, math.sqrt(variance))
+
+        if self.tail_probability and rng.random() < self.tail_probability:
+            delay_ms *= self.tail_multiplier
+        rate_limited = bool(self.error_rate) and rng.random() < self.error_rate
+        return max(0.0, delay_ms) / 1000, rate_limited
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Local, deterministic stand-in for a chat model provider.
+
+    Without a script it answers with a stable digest of the prompt; with
+    `responses` it cycles through them in order. Calls are delayed and
+    occasionally failed with `FakeRateLimitError` according to `latency`,
+    driven by a seeded RNG so that runs are reproducible.
+    """
+
+    model_name: str = "fake"
+    responses: Sequence[str] = ()
+    latency: LatencyModel = LatencyModel()
+    seed: int = 0
+
+    _rng: random.Random = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "responses": tuple(self.responses)}
+
+    @classmethod
+    def from_config(cls, model_config: ModelConfig, **kwargs) -> "FakeChatModel":
+        """Build the fake model from a `ModelConfig` with provider 'fake'."""
+        return cls(
+            model_name=model_config.model_name,
+            responses=tuple(model_config.option("responses", ())),
+            latency=LatencyModel.from_config(model_config),
+            seed=int(model_config.option("seed", 0)),
+            **kwargs,
+        )
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, **kwargs)
+
+    def _next_call(self, messages: List[BaseMessage]) -> Tuple[float, bool, str]:
+        with self._lock:
+            delay, rate_limited = self.latency.sample(self._rng)
+            call = self._calls
+            self._calls += 1
+        if self.responses:
+            content = self.responses[call % len(self.responses)]
+        else:
+            prompt = "\n".join(str(message.content) for message in messages)
+            digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+            content = f"[{self.model_name}] response {digest}"
+        return delay, rate_limited, content
+
+    def _result(self, rate_limited: bool, content: str) -> ChatResult:
+        if rate_limited:
+            raise FakeRateLimitError("Simulated 429: rate limit exceeded.")
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=content))]
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay, rate_limited, content = self._next_call(messages)
+        if delay:
+            time.sleep(delay)
+        return self._result(rate_limited, content)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay, rate_limited, content = self._next_call(messages)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._result(rate_limited, content)
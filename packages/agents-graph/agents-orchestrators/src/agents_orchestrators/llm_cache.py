@@ -0,0 +1,287 @@
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+
+from langchain_core._api import suppress_langchain_beta_warning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from agents_core.executor import run_sync
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+# langchain-core 0.3, as locked, revives core types by default and has no
+# `allowed_objects`; later versions warn unless it is passed.
+_LOADS_KWARGS = (
+    {"allowed_objects": "core"}
+    if "allowed_objects" in inspect.signature(loads).parameters
+    else {}
+)
+
+
+def _optional_env(name: str) -> Optional[str]:
+    return os.getenv(name) or None
+
+
+def _mark_cached(value: RETURN_VAL_TYPE) -> RETURN_VAL_TYPE:
+    # Flag the replayed generations so callbacks can tell cache hits apart;
+    # copies, so the cached entry itself stays untouched.
+    return [
+        generation.model_copy(
+            update={
+                "generation_info": {
+                    **(generation.generation_info or {}),
+                    "cached": True,
+                }
+            }
+        )
+        for generation in value
+    ]
+
+
+@dataclass
+class LLMCacheConfig:
+    """Configuration of the LLM response cache.
+
+    Attributes:
+        enabled (bool): Whether LLM responses are cached at all. Read from
+            `LLM_CACHE_ENABLED` (default 'true').
+        max_size (int): Maximum number of entries kept in memory. Read from
+            `LLM_CACHE_MAX_SIZE` (default 1024).
+        ttl_seconds (float): Lifetime of a cached response, in both tiers. Read
+            from `LLM_CACHE_TTL_SECONDS` (default 3600).
+        sqlite_path (Optional[str]): Path of the persistent SQLite tier. Read from
+            `LLM_CACHE_SQLITE_PATH`; the tier is disabled when unset.
+    """
+
+    enabled: bool = field(
+        default_factory=lambda: os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    )
+    max_size: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_MAX_SIZE", "1024"))
+    )
+    ttl_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+    )
+    sqlite_path: Optional[str] = field(
+        default_factory=lambda: _optional_env("LLM_CACHE_SQLITE_PATH")
+    )
+
+    def __post_init__(self):
+        """Validates the configuration after initialization.
+
+        Raises:
+            ValueError: If the size or TTL is not positive.
+        """
+        if self.max_size <= 0:
+            raise ValueError(f"Invalid cache max size: {self.max_size}")
+        if self.ttl_seconds <= 0:
+            raise ValueError(f"Invalid cache TTL: {self.ttl_seconds}")
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Two-tier LangChain cache for LLM responses.
+
+    LangChain keys every lookup on the rendered prompt and an `llm_string` that
+    serializes the provider class, model, temperature and invocation kwargs such
+    as bound tools. Both are folded into a digest that indexes an in-memory
+    LRU+TTL tier and, optionally, a SQLite tier that survives restarts.
+    """
+
+    def __init__(self, config: Optional[LLMCacheConfig] = None):
+        self.config = config or LLMCacheConfig()
+        self._entries: OrderedDict[str, Tuple[float, RETURN_VAL_TYPE]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.config.sqlite_path:
+            self._db = self._open_db(self.config.sqlite_path)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def _open_db(self, path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        db.commit()
+        log.info("LLM cache persistent tier opened at %s", path)
+        return db
+
+    # --- Memory tier ---
+    def _memory_get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+    def _memory_put(self, key: str, value: RETURN_VAL_TYPE, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # --- Persistent tier ---
+    def _disk_get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        with suppress_langchain_beta_warning():
+            value = loads(row[1], **_LOADS_KWARGS)
+        self._memory_put(key, value, row[0])
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def _disk_put(self, key: str, value: RETURN_VAL_TYPE, expires_at: float) -> None:
+        if self._db is None:
+            return
+        serialized = dumps(list(value))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, serialized),
+            )
+            self._db.commit()
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    # --- BaseCache interface ---
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        value = self._memory_get(key)
+        if value is None:
+            value = self._disk_get(key)
+        if value is None:
+            self._miss()
+            return None
+        return _mark_cached(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        expires_at = time.time() + self.config.ttl_seconds
+        self._memory_put(key, return_val, expires_at)
+        self._disk_put(key, return_val, expires_at)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        value = self._memory_get(key)
+        if value is None and self._db is not None:
+            value = await run_sync(self._disk_get, key)
+        if value is None:
+            self._miss()
+            return None
+        return _mark_cached(value)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        key = self._key(prompt, llm_string)
+        expires_at = time.time() + self.config.ttl_seconds
+        self._memory_put(key, return_val, expires_at)
+        if self._db is not None:
+            await run_sync(self._disk_put, key, return_val, expires_at)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await run_sync(self.clear)
+
+    def reopen(self) -> None:
+        """
+        Give a forked child its own SQLite connection and lock: neither may be
+        shared with the parent.
+        """
+        self._lock = threading.Lock()
+        if self._db is not None:
+            # The inherited connection is kept, not closed: closing it would
+            # release the parent's locks on the database.
+            self._inherited_db = self._db
+            self._db = self._open_db(self.config.sqlite_path)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size, for cache sizing."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.config.max_size,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Return the process-wide LLM response cache, or None when caching is disabled.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                config = LLMCacheConfig()
+                if not config.enabled:
+                    return None
+                _llm_cache = LLMResponseCache(config)
+    return _llm_cache
+
+
+def peek_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the LLM response cache if this process created it, without creating it."""
+    return _llm_cache
+
+
+def _reopen_in_child() -> None:
+    # The cache may be created before the workers are forked, e.g. by a warm-up.
+    global _llm_cache_lock
+    _llm_cache_lock = threading.Lock()
+    if _llm_cache is not None:
+        _llm_cache.reopen()
+
+
+os.register_at_fork(after_in_child=_reopen_in_child)
@@ -0,0 +1,578 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from agents_core.deadline import remaining_budget
+from agents_core.metrics import metrics
+from agents_core.model_config import ModelConfig
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+limiter_wait = metrics.histogram(
+    "llm_limiter_queue_wait_seconds",
+    "Time LLM calls waited for the provider limiter.",
+    ("model",),
+)
+limiter_throttled = metrics.counter(
+    "llm_limiter_throttled_total",
+    "LLM calls rejected by the provider with a rate limit (429).",
+    ("model",),
+)
+
+# Weight of a new latency sample in the moving average it is compared against.
+LATENCY_SMOOTHING = 0.1
+# Concurrency factor applied when calls get slower than the average allows.
+LATENCY_BACKOFF = 0.9
+# Seconds before a call rejected with a rate limit (429) is put back in line,
+# doubled on every further rejection.
+RATE_LIMIT_BACKOFF = 0.5
+# Seconds between two checks of the buckets by threads waiting in line.
+BLOCKING_POLL_SECONDS = 0.05
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+def estimate_tokens(messages: List[BaseMessage]) -> int:
+    """Rough prompt size, at about four characters per token."""
+    return sum(len(str(message.content)) for message in messages) // 4 + 1
+
+
+def _used_tokens(result: ChatResult) -> Optional[int]:
+    total = 0
+    for generation in result.generations:
+        usage = getattr(generation.message, "usage_metadata", None)
+        if usage:
+            total += usage.get("total_tokens", 0)
+    if not total:
+        usage = (result.llm_output or {}).get("token_usage") or {}
+        total = usage.get("total_tokens", 0)
+    return total or None
+
+
+class TokenBucket:
+    """
+    Refills `per_minute` tokens a minute, up to a minute's worth.
+
+    Tokens taken on an estimate can be settled afterwards, leaving the bucket
+    in debt when the estimate was too low.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available, 0 if they are now."""
+        self._refill(now)
+        # Larger requests only wait for a full bucket.
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+
+class _BlockingWaiter:
+    """A thread waiting in line, admitted like the futures of async callers."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def set_result(self, result: None) -> None:
+        self._event.set()
+
+    def wait(self, timeout: float) -> bool:
+        return self._event.wait(timeout)
+
+
+class AdaptiveLimiter:
+    """
+    Limits the calls made to a provider model, shared by every client of it.
+
+    Calls are admitted in arrival order when a concurrency slot is free and the
+    request and token buckets allow it; the others wait in line instead of
+    failing. Token use is estimated from the prompt on admission and settled
+    with the usage the provider reports. Async callers and threads making
+    blocking calls wait in the same line.
+
+    The concurrency limit adapts AIMD-style: it grows by one per window of
+    calls while the limit is in use and latency holds, is cut by
+    `LATENCY_BACKOFF` once per window when a call takes over
+    `latency_tolerance` times the average latency, and halved on every rate
+    limit (429) the provider answers with. Calls rejected with a rate limit
+    are put back in line, up to `max_retries` times.
+
+    Args:
+        name (str): The model, as labelled in metrics.
+        requests_per_minute (float): Request budget; unlimited when 0.
+        tokens_per_minute (float): Token budget; unlimited when 0.
+        concurrency (int): Initial concurrency limit.
+        max_concurrency (int): Upper bound of the concurrency limit.
+        latency_tolerance (float): Latency, relative to the average, above
+            which concurrency is reduced.
+        min_concurrency (int): Lower bound of the concurrency limit.
+        max_retries (int): Times a call rejected with a rate limit is retried.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        concurrency: int = 8,
+        max_concurrency: int = 64,
+        latency_tolerance: float = 2.0,
+        min_concurrency: int = 1,
+        max_retries: int = 2,
+    ):
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError(
+                f"Invalid concurrency bounds: {min_concurrency}..{max_concurrency}"
+            )
+        self.name = name
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(concurrency, min_concurrency), max_concurrency))
+        self.latency_tolerance = latency_tolerance
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.throttled = 0
+        self._average_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[Tuple[Union[asyncio.Future, _BlockingWaiter], int]] = (
+            deque()
+        )
+        # Calls in flight made by threads, which outlive event loops.
+        self._blocking_in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, model_config: ModelConfig) -> "AdaptiveLimiter":
+        """
+        Build the limiter of a model from the `requests_per_minute`,
+        `tokens_per_minute`, `concurrency`, `max_concurrency`,
+        `latency_tolerance` and `max_retries` options, or the
+        `LLM_REQUESTS_PER_MINUTE`, `LLM_TOKENS_PER_MINUTE`, `LLM_CONCURRENCY`
+        (8), `LLM_MAX_CONCURRENCY` (64), `LLM_LATENCY_TOLERANCE` (2) and
+        `LLM_MAX_RETRIES` (2) environment variables.
+        """
+
+        def setting(option: str, env: str, default: str) -> float:
+            return float(model_config.option(option, os.getenv(env, default)))
+
+        return cls(
+            model_config.model_name,
+            requests_per_minute=setting(
+                "requests_per_minute", "LLM_REQUESTS_PER_MINUTE", "0"
+            ),
+            tokens_per_minute=setting(
+                "tokens_per_minute", "LLM_TOKENS_PER_MINUTE", "0"
+            ),
+            concurrency=int(setting("concurrency", "LLM_CONCURRENCY", "8")),
+            max_concurrency=int(
+                setting("max_concurrency", "LLM_MAX_CONCURRENCY", "64")
+            ),
+            latency_tolerance=setting(
+                "latency_tolerance", "LLM_LATENCY_TOLERANCE", "2"
+            ),
+            max_retries=int(setting("max_retries", "LLM_MAX_RETRIES", "2")),
+        )
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter, _ in list(self._waiters) if not waiter.done())
+
+    @staticmethod
+    def retry_delay(attempt: int) -> float:
+        """Seconds to wait before putting a rate-limited call back in line."""
+        return RATE_LIMIT_BACKOFF * 2**attempt
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """Wait for the caller's turn; every acquire must be released."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with self._lock:
+            if loop is not self._loop:
+                # Waiters and in-flight calls never span event loops; threads
+                # keep their place.
+                self._loop = loop
+                self._loop_thread = threading.get_ident()
+                self._waiters = deque(
+                    waiter
+                    for waiter in self._waiters
+                    if isinstance(waiter[0], _BlockingWaiter)
+                )
+                self._timer = None
+                self.in_flight = self._blocking_in_flight
+            future = None
+            if self._waiters or not self._admit(estimated_tokens):
+                future = loop.create_future()
+                self._waiters.append((future, estimated_tokens))
+                # The line may only hold callers that already gave up.
+                self._dispatch()
+        if future is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if future.done() and not future.cancelled():
+                        # Admitted just as the caller gave up: hand the slot on.
+                        self.in_flight -= 1
+                    self._dispatch()
+                raise
+        if metrics.enabled:
+            limiter_wait.observe(time.perf_counter() - started, model=self.name)
+
+    def acquire_blocking(self, estimated_tokens: int = 0) -> None:
+        """
+        Wait for the calling thread's turn; every acquire must be released with
+        `release_blocking`.
+        """
+        started = time.perf_counter()
+        waiter = _BlockingWaiter()
+        with self._lock:
+            if self._waiters or not self._admit(estimated_tokens):
+                self._waiters.append((waiter, estimated_tokens))
+                self._dispatch()
+            else:
+                waiter.set_result(None)
+        # Only an event loop can schedule a wake-up for the buckets to refill.
+        while not waiter.wait(BLOCKING_POLL_SECONDS):
+            with self._lock:
+                self._dispatch()
+        with self._lock:
+            self._blocking_in_flight += 1
+        if metrics.enabled:
+            limiter_wait.observe(time.perf_counter() - started, model=self.name)
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        error: Optional[Exception] = None,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Free the caller's slot and adapt the limit to how the call went: its
+        `latency` when it succeeded, its `error` when it failed. Cancelled
+        calls pass neither and only free their slot.
+        """
+        with self._lock:
+            self._release(latency, error, estimated_tokens, used_tokens)
+
+    def release_blocking(
+        self,
+        latency: Optional[float] = None,
+        error: Optional[Exception] = None,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+    ) -> None:
+        """Free a slot taken with `acquire_blocking`, like `release`."""
+        with self._lock:
+            self._blocking_in_flight -= 1
+            self._release(latency, error, estimated_tokens, used_tokens)
+
+    def _release(
+        self,
+        latency: Optional[float],
+        error: Optional[Exception],
+        estimated_tokens: int,
+        used_tokens: Optional[int],
+    ) -> None:
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        if self.tokens is not None and used_tokens is not None:
+            self.tokens.take(used_tokens - estimated_tokens)
+
+        now = time.monotonic()
+        if error is not None and _is_rate_limit(error):
+            self.throttled += 1
+            if metrics.enabled:
+                limiter_throttled.inc(model=self.name)
+            self._decrease(0.5, now)
+        elif latency is not None:
+            average = self._average_latency
+            if average is not None and latency > self.latency_tolerance * average:
+                # One decrease per window of calls, not one per slow call.
+                if now - self._last_decrease > average:
+                    self._decrease(LATENCY_BACKOFF, now)
+            elif saturated:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._average_latency = (
+                latency
+                if average is None
+                else average + LATENCY_SMOOTHING * (latency - average)
+            )
+        self._dispatch()
+
+    def _decrease(self, factor: float, now: float) -> None:
+        self.limit = max(self.min_concurrency, self.limit * factor)
+        self._last_decrease = now
+
+    def _admit(self, estimated_tokens: int) -> bool:
+        if self.in_flight >= int(self.limit):
+            return False
+        now = time.monotonic()
+        delays = [0.0]
+        if self.requests is not None:
+            delays.append(self.requests.delay(1, now))
+        if self.tokens is not None:
+            delays.append(self.tokens.delay(estimated_tokens, now))
+        delay = max(delays)
+        if delay > 0:
+            self._wake_in(delay)
+            return False
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(estimated_tokens)
+        self.in_flight += 1
+        return True
+
+    def _dispatch(self) -> None:
+        # First come, first served: a waiter never overtakes the one before.
+        while self._waiters:
+            waiter, estimated_tokens = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if not self._admit(estimated_tokens):
+                return
+            self._waiters.popleft()
+            if isinstance(waiter, _BlockingWaiter) or self._in_loop_thread():
+                waiter.set_result(None)
+            else:
+                self._loop.call_soon_threadsafe(self._wake, waiter)
+
+    def _wake(self, future: asyncio.Future) -> None:
+        # Admitted by a thread; the caller may have given up in the meantime.
+        with self._lock:
+            if future.cancelled():
+                self.in_flight -= 1
+                self._dispatch()
+            else:
+                future.set_result(None)
+
+    def _in_loop_thread(self) -> bool:
+        return threading.get_ident() == self._loop_thread
+
+    def _wake_in(self, delay: float) -> None:
+        if self._timer is None and self._loop is not None and self._in_loop_thread():
+            self._timer = self._loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "throttled": self.throttled,
+            }
+
+
+async def _within_deadline(
+    stream: AsyncIterator[ChatGenerationChunk],
+) -> AsyncIterator[ChatGenerationChunk]:
+    # Each chunk is awaited under its own timeout: a timeout must not span the
+    # consumer's code between two chunks.
+    while True:
+        try:
+            async with asyncio.timeout(remaining_budget()):
+                chunk = await anext(stream)
+        except StopAsyncIteration:
+            return
+        yield chunk
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Wraps the chat model of a provider so that its calls go through an
+    `AdaptiveLimiter`.
+
+    The wrapper holds the cache and the callbacks, the provider model only
+    makes the calls, which are retried by the limiter when rate limited; turn
+    the provider client's own retries off. Responses are cached under the
+    provider model's key, and LangChain looks them up before calling the
+    provider, so cache hits never wait for the limiter.
+
+    Calls made for a request with a deadline, waiting in line and retries
+    included, are cancelled with `TimeoutError` once it runs out.
+
+    Args:
+        llm (BaseChatModel): The provider model.
+        limiter (AdaptiveLimiter): The limiter of the provider model.
+    """
+
+    llm: BaseChatModel
+    limiter: AdaptiveLimiter
+
+    @property
+    def _llm_type(self) -> str:
+        return self.llm._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.llm._identifying_params
+
+    def _get_llm_string(self, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        return self.llm._get_llm_string(stop=stop, **kwargs)
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any):
+        return self.llm._get_ls_params(stop=stop, **kwargs)
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        return self.llm._combine_llm_outputs(llm_outputs)
+
+    def get_name(self, suffix: Optional[str] = None, *, name: Optional[str] = None):
+        return self.llm.get_name(suffix, name=name)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        # The provider formats the tools; the calls still go through the wrapper.
+        return self.bind(**self.llm.bind_tools(tools, **kwargs).kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimated = estimate_tokens(messages)
+        for attempt in range(self.limiter.max_retries + 1):
+            self.limiter.acquire_blocking(estimated)
+            started = time.perf_counter()
+            try:
+                result = self.llm._generate(messages, stop, run_manager, **kwargs)
+            except Exception as e:
+                self.limiter.release_blocking(error=e)
+                if not _is_rate_limit(e) or attempt == self.limiter.max_retries:
+                    raise
+                time.sleep(self.limiter.retry_delay(attempt))
+                continue
+            self.limiter.release_blocking(
+                time.perf_counter() - started, None, estimated, _used_tokens(result)
+            )
+            return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async with asyncio.timeout(remaining_budget()):
+            return await self._limited_agenerate(messages, stop, run_manager, **kwargs)
+
+    async def _limited_agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        estimated = estimate_tokens(messages)
+        for attempt in range(self.limiter.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            started = time.perf_counter()
+            try:
+                result = await self.llm._agenerate(
+                    messages, stop, run_manager, **kwargs
+                )
+            except asyncio.CancelledError:
+                # Cancelled calls say nothing about the provider.
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release(error=e)
+                if not _is_rate_limit(e) or attempt == self.limiter.max_retries:
+                    raise
+                await asyncio.sleep(self.limiter.retry_delay(attempt))
+                continue
+            self.limiter.release(
+                time.perf_counter() - started, None, estimated, _used_tokens(result)
+            )
+            return result
+
+
+class RateLimitedStreamingChatModel(RateLimitedChatModel):
+    """
+    `RateLimitedChatModel` of a provider model that streams tokens. A stream
+    is only retried when rate limited before its first chunk.
+    """
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = estimate_tokens(messages)
+        for attempt in range(self.limiter.max_retries + 1):
+            async with asyncio.timeout(remaining_budget()):
+                await self.limiter.acquire(estimated)
+            started = time.perf_counter()
+            used = None
+            streamed = False
+            stream = self.llm._astream(messages, stop, run_manager, **kwargs)
+            try:
+                async for chunk in _within_deadline(stream):
+                    streamed = True
+                    usage = getattr(chunk.message, "usage_metadata", None)
+                    if usage:
+                        used = (used or 0) + usage.get("total_tokens", 0)
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release(error=e)
+                if (
+                    streamed
+                    or not _is_rate_limit(e)
+                    or attempt == self.limiter.max_retries
+                ):
+                    raise
+                async with asyncio.timeout(remaining_budget()):
+                    await asyncio.sleep(self.limiter.retry_delay(attempt))
+                continue
+            self.limiter.release(time.perf_counter() - started, None, estimated, used)
+            return
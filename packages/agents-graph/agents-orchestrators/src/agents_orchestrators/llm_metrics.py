@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from agents_core.metrics import current_labels, metrics
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+LABELS = ("orchestrator", "node", "agent", "bot", "model")
+
+llm_latency = metrics.histogram(
+    "llm_request_duration_seconds",
+    "Duration of LLM calls, cache hits included.",
+    LABELS,
+)
+llm_tokens = metrics.counter(
+    "llm_tokens_total", "Tokens used by LLM calls.", LABELS + ("type",)
+)
+llm_cost = metrics.counter(
+    "llm_cost_usd_total", "Estimated cost of LLM calls, in USD.", LABELS
+)
+llm_errors = metrics.counter("llm_errors_total", "LLM calls that failed.", LABELS)
+llm_cache_hits = metrics.counter(
+    "llm_cache_hits_total", "LLM calls answered from the response cache.", LABELS
+)
+
+
+def _token_prices() -> Dict[str, Dict[str, float]]:
+    # {"gpt-4o-mini": {"input": 0.15, "output": 0.6}}, in USD per million tokens.
+    return json.loads(os.getenv("LLM_TOKEN_PRICES", "{}"))
+
+
+def _is_cache_hit(response: LLMResult) -> bool:
+    # The response cache flags the generations it replays.
+    return any(
+        (g.generation_info or {}).get("cached")
+        for generations in response.generations
+        for g in generations
+    )
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Records the latency, token usage, estimated cost, cache hits and errors of
+    LLM calls.
+
+    Calls are labelled with the workflow node that made them (see
+    `agents_core.metrics.instrument_node`) and the model. Costs use the
+    per-million-token prices of `LLM_TOKEN_PRICES`, a JSON object keyed by
+    model; models without a price are not costed.
+    """
+
+    # Run in the caller's context, where the node labels are set.
+    run_inline = True
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.prices = _token_prices().get(model_name)
+        self._runs: Dict[UUID, Tuple[float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID) -> None:
+        labels = {**current_labels.get(), "model": self.model_name}
+        with self._lock:
+            self._runs[run_id] = (time.perf_counter(), labels)
+
+    def _finish(self, run_id: UUID) -> Optional[Dict[str, str]]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        started, labels = run
+        llm_latency.observe(time.perf_counter() - started, **labels)
+        return labels
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._start(run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._start(run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        labels = self._finish(run_id)
+        if labels is None:
+            return
+        if _is_cache_hit(response):
+            # Cached answers use no tokens.
+            llm_cache_hits.inc(**labels)
+            return
+        input_tokens, output_tokens = _token_usage(response)
+        if input_tokens:
+            llm_tokens.inc(input_tokens, type="input", **labels)
+        if output_tokens:
+            llm_tokens.inc(output_tokens, type="output", **labels)
+        if self.prices and (input_tokens or output_tokens):
+            cost = (
+                input_tokens * self.prices.get("input", 0)
+                + output_tokens * self.prices.get("output", 0)
+            ) / 1_000_000
+            llm_cost.inc(cost, **labels)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        labels = self._finish(run_id)
+        if labels is not None:
+            llm_errors.inc(**labels)
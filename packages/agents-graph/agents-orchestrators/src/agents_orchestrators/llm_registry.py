@@ -0,0 +1,125 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+import httpx
+import openai
+from agents_core.metrics import metrics
+from agents_core.model_config import ModelConfig
+from agents_orchestrators.fake_llm import FakeChatModel
+from agents_orchestrators.llm_cache import get_llm_cache
+from agents_orchestrators.llm_limiter import (
+    AdaptiveLimiter,
+    RateLimitedChatModel,
+    RateLimitedStreamingChatModel,
+)
+from agents_orchestrators.llm_metrics import LLMMetricsCallbackHandler
+from langchain_openai import ChatOpenAI
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of LLM clients keyed by `ModelConfig.key`.
+
+    Every orchestrator asking for the same model configuration gets the same
+    client, and all clients of a provider share one pair of HTTP connection
+    pools with keep-alive, instead of each orchestrator opening its own.
+
+    Calls to the provider go through one `AdaptiveLimiter` per provider model,
+    which configurations differing only in temperature or options share since
+    providers enforce their quotas per model.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple, object] = {}
+        self.limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+        self._http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_config: ModelConfig):
+        """Return the shared LLM client for a model configuration."""
+        key = model_config.key
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._create(model_config)
+                    self._clients[key] = client
+                    log.info("Created LLM client for %s", model_config)
+        return client
+
+    def _create(self, model_config: ModelConfig):
+        # LLM calls are only instrumented when metrics are enabled.
+        callbacks = (
+            [LLMMetricsCallbackHandler(model_config.model_name)]
+            if metrics.enabled
+            else None
+        )
+        if model_config.provider == "openai":
+            http_client, http_async_client = self._openai_http_clients()
+            # Rate limits are retried by the limiter, which slows down first.
+            llm = ChatOpenAI(
+                model=model_config.model_name,
+                temperature=model_config.temperature,
+                max_retries=0,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            wrapper = RateLimitedStreamingChatModel
+        elif model_config.provider == "fake":
+            llm = FakeChatModel.from_config(model_config)
+            wrapper = RateLimitedChatModel
+        else:
+            raise ValueError(f"Unsupported model provider: {model_config.provider}")
+        # Responses are cached on (provider, model, temperature, tools, prompt).
+        return wrapper(
+            llm=llm,
+            limiter=self._limiter(model_config),
+            cache=get_llm_cache(),
+            callbacks=callbacks,
+        )
+
+    def _limiter(self, model_config: ModelConfig) -> AdaptiveLimiter:
+        key = (model_config.provider, model_config.model_name)
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveLimiter.from_config(model_config)
+            self.limiters[key] = limiter
+        return limiter
+
+    def _openai_http_clients(self) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        clients = self._http_clients.get("openai")
+        if clients is None:
+            limits = _http_limits()
+            clients = (
+                openai.DefaultHttpxClient(limits=limits),
+                openai.DefaultAsyncHttpxClient(limits=limits),
+            )
+            self._http_clients["openai"] = clients
+        return clients
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pools."""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            self._clients.clear()
+            self.limiters.clear()
+        for http_client, http_async_client in http_clients:
+            http_client.close()
+            await http_async_client.aclose()
+
+
+llm_registry = LLMClientRegistry()
@@ -1,6 +1,9 @@
-import asyncio
+from typing import List, Optional
 from agents_workflows.scraping_error_workflow import ScrapingErrorWorkflow
+from agents_workflows.scraping_workflow import StreamCallback
 from agents_orchestrators.base_orchestrator import BaseOrchestrator
+from agents_orchestrators.error_fingerprints import ErrorFingerprintRegistry
+from agents_core.deadline import Deadline
 from agents_core.model_config import ModelConfig
 from logger.log import get_logger_from_env
 from application.dtos.agent_dto import ScrapingErrorPayloadDTO
@@ -12,19 +15,51 @@ log = get_logger_from_env(__file__)
 class ScrapingErrorOrchestrator(BaseOrchestrator):
     def __init__(self, model_config: ModelConfig):
         super().__init__(model_config)
+        self.fingerprints = ErrorFingerprintRegistry()
 
-    async def process_payload(self, payload: dict) -> dict:
+    async def process_payload(
+        self,
+        payload: ScrapingErrorPayloadDTO,
+        on_update: Optional[StreamCallback] = None,
+        stream_tokens: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> dict:
         """
-        A stub orchestrator for scraping usage.
+        Runs the scraping error workflow for a payload and returns its report.
+        The workflow has no intermediate results, so nothing is streamed, and
+        makes no LLM calls for the `deadline` to bound.
+
+        Errors are fingerprinted first: only the first occurrence of a
+        fingerprint in the deduplication window runs the workflow, repeats just
+        update its counters.
         """
-        payload_dto = ScrapingErrorPayloadDTO.from_dict(payload)
+        occurrence, is_new = self.fingerprints.record(payload.bot_name, payload.error)
+        if not is_new:
+            log.debug(
+                "Duplicate error %s from bot '%s' (seen %d times).",
+                occurrence.fingerprint,
+                payload.bot_name,
+                occurrence.count,
+            )
+            return {
+                "status": "duplicate",
+                "usage": "scraping",
+                "fingerprint": occurrence.fingerprint,
+                "count": occurrence.count,
+            }
 
-        workflow = ScrapingErrorWorkflow(self.llm, payload_dto)
+        workflow = ScrapingErrorWorkflow(self.llm, payload)
         result = await workflow.run()
-        log.info(f"Processed payload: {result}")
-
-        await asyncio.sleep(0.5)  # Simulate processing delay.
+        log.info("Processed error payload from bot '%s'", result["bot_name"])
+        log.debug("Processed payload: %s", result)
         return {
-            "status": "scheduled",
+            "status": "completed",
             "usage": "scraping",
+            "bot_name": result["bot_name"],
+            "fingerprint": occurrence.fingerprint,
+            "count": occurrence.count,
         }
+
+    def error_summary(self, bot_name: str) -> List[dict]:
+        """Return the error fingerprints reported by a bot, most frequent first."""
+        return self.fingerprints.summary(bot_name)
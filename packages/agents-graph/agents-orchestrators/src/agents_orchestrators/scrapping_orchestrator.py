@@ -1,7 +1,9 @@
-import asyncio
-from agents_workflows.scraping_workflow import ScrapingWorkflow
+from typing import Optional
+
+from agents_workflows.scraping_workflow import ScrapingWorkflow, StreamCallback
 from agents_orchestrators.base_orchestrator import BaseOrchestrator
-from agents_core.model_config import ModelConfig
+from agents_core.block_stats import block_stats, response_domain
+from agents_core.deadline import Deadline
 from logger.log import get_logger_from_env
 from application.dtos.agent_dto import ScrapingPayloadDTO
 
@@ -10,20 +12,49 @@ log = get_logger_from_env(__file__)
 
 
 class ScrapingOrchestrator(BaseOrchestrator):
-    def __init__(self, model_config: ModelConfig):
-        super().__init__(model_config)
+    def warm_up(self) -> None:
+        # The workflow graph is built once and shared by every payload.
+        ScrapingWorkflow.compile(self.llm)
 
-    async def process_payload(self, payload: dict) -> dict:
+    async def process_payload(
+        self,
+        payload: ScrapingPayloadDTO,
+        on_update: Optional[StreamCallback] = None,
+        stream_tokens: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> dict:
         """
-        A stub orchestrator for scraping usage.
+        Runs the scraping workflow for a payload and returns its report.
+
+        `on_update` receives the partial results while the workflow runs. Nodes
+        cut short by the `deadline` are listed in `timed_out` and the report's
+        status is 'partial'.
         """
-        payload_dto = ScrapingPayloadDTO.from_dict(payload)
-        workflow = ScrapingWorkflow(self.llm, payload_dto)
-        result = await workflow.run()
-        log.info(f"Processed payload: {result}")
-
-        await asyncio.sleep(0.5)  # Simulate processing delay.
-        return {
-            "status": "scheduled",
+        workflow = ScrapingWorkflow(self.llm, payload)
+        result = await workflow.run(on_update, stream_tokens, deadline)
+        log.info("Processed payload from bot '%s'", result["bot_name"])
+        log.debug("Processed payload: %s", result)
+        self._record_stats(payload, result)
+        report = {
+            "status": "partial" if result["timed_out"] else "completed",
             "usage": "scraping",
+            "bot_name": result["bot_name"],
+            "ip_blocked": result["ip_blocked"],
+            "message": result["message"],
         }
+        if result["timed_out"]:
+            report["timed_out"] = result["timed_out"]
+        return report
+
+    @staticmethod
+    def _record_stats(payload: ScrapingPayloadDTO, result: dict) -> None:
+        # Verdicts derived from the statistics themselves are not counted back.
+        blocked = None if result.get("ip_prior") else result.get("ip_blocked")
+        latency = payload.response.latency
+        block_stats.record(
+            payload.bot_name,
+            response_domain(payload.response.url),
+            payload.response.status,
+            blocked=blocked,
+            latency_ms=latency * 1000 if latency is not None else None,
+        )
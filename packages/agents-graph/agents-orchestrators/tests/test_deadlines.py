@@ -0,0 +1,102 @@
+import asyncio
+
+from agents_core.deadline import Deadline, current_deadline
+from agents_core.model_config import ModelConfig
+from agents_orchestrators.fake_llm import FakeChatModel
+from agents_orchestrators.llm_limiter import AdaptiveLimiter, RateLimitedChatModel
+from agents_orchestrators.scrapping_orchestrator import ScrapingOrchestrator
+from application.dtos.agent_dto import ScrapingPayloadDTO
+
+
+def _payload():
+    return ScrapingPayloadDTO.from_dict(
+        {
+            "request": {"url": "https://example.com", "headers": {}, "method": "GET"},
+            "response": {
+                "url": "https://example.com",
+                "status": 403,
+                "headers": {},
+                "body": "",
+            },
+            "bot_name": "deadline-bot",
+        }
+    )
+
+
+def _hang_llm_calls(monkeypatch) -> asyncio.Event:
+    """Make fake LLM calls wait until the returned event, which is never set."""
+    called = asyncio.Event()
+
+    async def hang(self, messages, stop=None, run_manager=None, **kwargs):
+        called.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(FakeChatModel, "_agenerate", hang)
+    return called
+
+
+def _orchestrator(model_name: str) -> ScrapingOrchestrator:
+    return ScrapingOrchestrator(
+        ModelConfig("fake", model_name, options={"responses": ["a joke"]})
+    )
+
+
+def test_deadline_returns_partial_report(monkeypatch):
+    called = _hang_llm_calls(monkeypatch)
+    orchestrator = _orchestrator("deadline")
+
+    async def scenario():
+        # The LLM call never returns: only the deadline ends the run.
+        return await asyncio.wait_for(
+            orchestrator.process_payload(_payload(), deadline=Deadline.after(0.5)),
+            10,
+        )
+
+    report = asyncio.run(scenario())
+
+    assert called.is_set()
+    assert report["status"] == "partial"
+    assert report["timed_out"] == ["joke_generator"]
+    assert "Initial Joke: TIMED OUT" in report["message"]
+    # The IP verdict finished in time and is kept.
+    assert report["ip_blocked"] is True
+    assert "IP Detector: BLOCKED" in report["message"]
+
+
+def test_llm_calls_are_bounded_by_the_current_deadline(monkeypatch):
+    _hang_llm_calls(monkeypatch)
+    model = RateLimitedChatModel(
+        llm=FakeChatModel(model_name="bounded"), limiter=AdaptiveLimiter("bounded")
+    )
+
+    async def scenario():
+        current_deadline.set(Deadline.after(0.05))
+        # Not bounded by anything else, so the call itself reads the deadline.
+        call = asyncio.create_task(model.ainvoke("hello"))
+        done, _ = await asyncio.wait({call}, timeout=10)
+        assert call in done
+        return call.exception()
+
+    assert isinstance(asyncio.run(scenario()), TimeoutError)
+
+
+def test_node_timeout_applies_without_deadline(monkeypatch):
+    monkeypatch.setenv("NODE_TIMEOUTS", '{"joke_generator": 0.05}')
+    _hang_llm_calls(monkeypatch)
+    orchestrator = _orchestrator("node-timeout")
+
+    report = asyncio.run(asyncio.wait_for(orchestrator.process_payload(_payload()), 10))
+
+    assert report["status"] == "partial"
+    assert report["timed_out"] == ["joke_generator"]
+
+
+def test_report_is_complete_within_the_deadline():
+    orchestrator = _orchestrator("deadline-met")
+
+    report = asyncio.run(
+        orchestrator.process_payload(_payload(), deadline=Deadline.after(5))
+    )
+
+    assert report["status"] == "completed"
+    assert "timed_out" not in report
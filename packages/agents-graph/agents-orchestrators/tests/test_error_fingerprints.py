@@ -0,0 +1,84 @@
+from agents_orchestrators import error_fingerprints
+from agents_orchestrators.error_fingerprints import (
+    ErrorFingerprintRegistry,
+    fingerprint_error,
+    normalize_traceback,
+)
+
+TRACEBACK = """Spider 'shop' encountered an error: list index out of range
+Traceback:
+Traceback (most recent call last):
+  File "/app/spiders/shop.py", line {line}, in parse
+    price = response.css(".price")[0]
+  <Response 200 https://shop.example.com/item/{item}> at 0x{addr}
+IndexError: list index out of range"""
+
+
+def test_volatile_parts_do_not_change_the_fingerprint():
+    first = TRACEBACK.format(line=42, item=1, addr="7f3a2c")
+    second = TRACEBACK.format(line=57, item=981, addr="7f99e0")
+
+    assert fingerprint_error(first) == fingerprint_error(second)
+    assert fingerprint_error(first) != fingerprint_error("KeyError: 'price'")
+    normalized = normalize_traceback(first)
+    assert "line <n>" in normalized
+    assert "<url>" in normalized and "<addr>" in normalized
+
+
+def test_status_and_error_codes_tell_errors_apart():
+    assert fingerprint_error("HTTP 403 Forbidden") != fingerprint_error(
+        "HTTP 500 Forbidden"
+    )
+    assert fingerprint_error("KeyError: 'price_1'") != fingerprint_error(
+        "KeyError: 'price_2'"
+    )
+
+
+def test_repeats_within_the_window_only_update_counters(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(error_fingerprints.time, "time", lambda: now[0])
+    registry = ErrorFingerprintRegistry(window_seconds=60)
+
+    _, is_new = registry.record("shop", TRACEBACK.format(line=1, item=1, addr="a"))
+    assert is_new
+    now[0] = 1030.0
+    occurrence, is_new = registry.record(
+        "shop", TRACEBACK.format(line=2, item=2, addr="b")
+    )
+    assert not is_new
+    assert (occurrence.count, occurrence.first_seen, occurrence.last_seen) == (
+        2,
+        1000.0,
+        1030.0,
+    )
+    assert occurrence.summary == "IndexError: list index out of range"
+
+    now[0] = 1061.0
+    _, is_new = registry.record("shop", TRACEBACK.format(line=3, item=3, addr="c"))
+    assert is_new
+    assert registry.summary("shop")[0]["count"] == 3
+    assert registry.summary("other") == []
+
+
+def test_keeps_at_most_max_fingerprints_per_bot():
+    registry = ErrorFingerprintRegistry(max_fingerprints=2)
+    for error in ("KeyError: 'a'", "ValueError: b", "TypeError: c"):
+        registry.record("shop", error)
+
+    assert [o["summary"] for o in registry.summary("shop")] == [
+        "ValueError: b",
+        "TypeError: c",
+    ]
+
+
+def test_keeps_at_most_max_bots():
+    registry = ErrorFingerprintRegistry(max_bots=2)
+    registry.record("shop", "KeyError: 'a'")
+    registry.record("news", "KeyError: 'a'")
+    registry.record("shop", "KeyError: 'b'")
+    registry.record("blog", "KeyError: 'a'")
+
+    # "news" was the least recently seen bot.
+    assert registry.summary("news") == []
+    assert len(registry.summary("shop")) == 2
+    assert len(registry.summary("blog")) == 1
@@ -0,0 +1,73 @@
+import asyncio
+import random
+
+import pytest
+
+from agents_core.model_config import ModelConfig
+from agents_orchestrators.fake_llm import (
+    FakeChatModel,
+    FakeRateLimitError,
+    LatencyModel,
+)
+from agents_orchestrators.llm_registry import llm_registry
+
+
+def test_responses_are_deterministic_per_prompt():
+    llm = FakeChatModel()
+
+    assert llm.invoke("hello").content == llm.invoke("hello").content
+    assert llm.invoke("hello").content != llm.invoke("world").content
+
+
+def test_scripted_responses_cycle_in_order():
+    llm = FakeChatModel.from_config(
+        ModelConfig("fake", "scripted", options={"responses": ["a", "b"]})
+    )
+
+    assert [llm.invoke("x").content for _ in range(3)] == ["a", "b", "a"]
+
+
+def test_registry_shares_clients_for_nested_options():
+    first = ModelConfig(
+        "fake", "nested", options={"responses": ["a"], "extra": {"b": [1], "a": 2}}
+    )
+    second = ModelConfig(
+        "fake", "nested", options={"extra": {"a": 2, "b": [1]}, "responses": ["a"]}
+    )
+
+    assert llm_registry.get(first) is llm_registry.get(second)
+
+
+def test_bind_tools_and_async_batch():
+    def analyze_status(s: int) -> str:
+        """Analyze a status code."""
+        return str(s)
+
+    llm = FakeChatModel(responses=["not blocked: ok"]).bind_tools([analyze_status])
+    results = asyncio.run(llm.abatch(["one", "two"]))
+
+    assert [result.content for result in results] == ["not blocked: ok"] * 2
+
+
+def test_rate_limit_errors_are_simulated():
+    llm = FakeChatModel(latency=LatencyModel(error_rate=1))
+
+    with pytest.raises(FakeRateLimitError):
+        llm.invoke("hello")
+
+
+def test_latency_model_is_reproducible_and_applies_spikes():
+    model = LatencyModel(
+        distribution="lognormal", mean_ms=100, spread_ms=20, tail_probability=1
+    )
+
+    first = [model.sample(random.Random(7)) for _ in range(3)]
+    second = [model.sample(random.Random(7)) for _ in range(3)]
+
+    assert first == second
+    assert all(delay > 0.3 for delay, _ in first)
+
+
+def test_invalid_distribution():
+    with pytest.raises(ValueError):
+        LatencyModel(distribution="pareto")
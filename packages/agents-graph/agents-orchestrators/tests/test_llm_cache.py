@@ -0,0 +1,59 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from agents_orchestrators.llm_cache import LLMCacheConfig, LLMResponseCache
+
+
+def generations(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def make_cache(**overrides) -> LLMResponseCache:
+    config = LLMCacheConfig(
+        **{"max_size": 2, "ttl_seconds": 60, "sqlite_path": None, **overrides}
+    )
+    return LLMResponseCache(config)
+
+
+def test_lookup_is_keyed_on_prompt_and_llm_string():
+    cache = make_cache()
+    cache.update("prompt", "gpt-3.5-turbo", generations("cached"))
+
+    assert cache.lookup("prompt", "gpt-3.5-turbo")[0].text == "cached"
+    assert cache.lookup("prompt", "gpt-3.5-turbo tools=[x]") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache()
+    cache.update("a", "llm", generations("a"))
+    cache.update("b", "llm", generations("b"))
+    cache.lookup("a", "llm")
+    cache.update("c", "llm", generations("c"))
+
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("a", "llm") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_not_returned(monkeypatch):
+    cache = make_cache()
+    cache.update("prompt", "llm", generations("stale"))
+    monkeypatch.setattr("time.time", lambda: 10**12)
+
+    assert cache.lookup("prompt", "llm") is None
+
+
+def test_sqlite_tier_survives_restarts(tmp_path):
+    path = str(tmp_path / "llm-cache.sqlite3")
+    make_cache(sqlite_path=path).update("prompt", "llm", generations("persisted"))
+
+    restarted = make_cache(sqlite_path=path)
+    value = asyncio.run(restarted.alookup("prompt", "llm"))
+
+    assert value[0].text == "persisted"
+    assert value[0].generation_info == {"cached": True}
+    assert restarted.stats()["disk_hits"] == 1
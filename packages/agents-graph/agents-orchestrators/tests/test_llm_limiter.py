@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents_core.model_config import ModelConfig
+from langchain_core.caches import InMemoryCache
+
+from agents_orchestrators import llm_limiter
+from agents_orchestrators.fake_llm import FakeChatModel, FakeRateLimitError
+from agents_orchestrators.llm_limiter import AdaptiveLimiter, RateLimitedChatModel
+from agents_orchestrators.llm_registry import LLMClientRegistry
+
+
+class FlakyChatModel(FakeChatModel):
+    """Answers with a rate limit `failures` times first."""
+
+    failures: int = 1
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise FakeRateLimitError("429")
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_waiting_calls_are_admitted_in_arrival_order():
+    limiter = AdaptiveLimiter("fifo", concurrency=1)
+    admitted = []
+
+    async def call(i):
+        await limiter.acquire()
+        admitted.append(i)
+        await asyncio.sleep(0.01)
+        limiter.release()
+
+    async def main():
+        await asyncio.gather(*(call(i) for i in range(5)))
+
+    asyncio.run(main())
+    assert admitted == [0, 1, 2, 3, 4]
+
+
+def test_requests_wait_for_the_bucket_instead_of_failing():
+    limiter = AdaptiveLimiter("rpm", requests_per_minute=600)
+    limiter.requests.tokens = 0
+
+    async def main():
+        started = time.monotonic()
+        await limiter.acquire()
+        limiter.release()
+        return time.monotonic() - started
+
+    # 600 requests a minute refill one every 0.1s.
+    assert 0.05 < asyncio.run(main()) < 0.5
+
+
+def test_rate_limits_halve_concurrency():
+    limiter = AdaptiveLimiter("aimd-429", concurrency=8)
+
+    async def main():
+        await limiter.acquire()
+        limiter.release(error=FakeRateLimitError("429"))
+
+    asyncio.run(main())
+    assert limiter.limit == 4
+    assert limiter.throttled == 1
+
+
+def test_concurrency_follows_latency():
+    limiter = AdaptiveLimiter("aimd-latency", concurrency=4, max_concurrency=16)
+
+    async def main():
+        # Additive increase while every slot is in use.
+        for _ in range(4):
+            await limiter.acquire()
+        limiter.release(latency=0.001)
+        assert limiter.limit == 4.25
+
+        # A call far slower than the average backs off.
+        await asyncio.sleep(0.002)
+        limiter.release(latency=1.0)
+        assert limiter.limit == 4.25 * 0.9
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiters_give_their_turn_away():
+    limiter = AdaptiveLimiter("cancel", concurrency=1)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+
+    asyncio.run(main())
+
+
+def test_cache_hits_bypass_the_limiter():
+    limiter = AdaptiveLimiter("cached", requests_per_minute=60)
+    llm = RateLimitedChatModel(
+        llm=FakeChatModel(responses=("a joke",)),
+        limiter=limiter,
+        cache=InMemoryCache(),
+    )
+
+    async def main():
+        await llm.ainvoke("tell me a joke")
+        after_first_call = limiter.requests.tokens
+        await llm.ainvoke("tell me a joke")
+        return after_first_call
+
+    after_first_call = asyncio.run(main())
+    assert after_first_call < 60
+    # The cached answer took no request from the bucket (it only refilled).
+    assert limiter.requests.tokens >= after_first_call
+    assert limiter.in_flight == 0
+
+
+def test_rate_limited_calls_are_retried_by_the_limiter(monkeypatch):
+    monkeypatch.setattr(llm_limiter, "RATE_LIMIT_BACKOFF", 0)
+    limiter = AdaptiveLimiter("retry", concurrency=8)
+    llm = RateLimitedChatModel(
+        llm=FlakyChatModel(responses=("a joke",)), limiter=limiter
+    )
+
+    response = asyncio.run(llm.ainvoke("tell me a joke"))
+
+    assert response.content == "a joke"
+    assert limiter.throttled == 1
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_rate_limits_are_raised_once_retries_run_out(monkeypatch):
+    monkeypatch.setattr(llm_limiter, "RATE_LIMIT_BACKOFF", 0)
+    limiter = AdaptiveLimiter("give-up", max_retries=1)
+    llm = RateLimitedChatModel(
+        llm=FlakyChatModel(responses=("a joke",), failures=2), limiter=limiter
+    )
+
+    with pytest.raises(FakeRateLimitError):
+        asyncio.run(llm.ainvoke("tell me a joke"))
+    assert limiter.throttled == 2
+    assert limiter.in_flight == 0
+
+
+def test_blocking_calls_go_through_the_limiter(monkeypatch):
+    monkeypatch.setattr(llm_limiter, "RATE_LIMIT_BACKOFF", 0)
+    limiter = AdaptiveLimiter("blocking", requests_per_minute=60)
+    llm = RateLimitedChatModel(
+        llm=FlakyChatModel(responses=("a joke",)), limiter=limiter
+    )
+
+    assert llm.invoke("tell me a joke").content == "a joke"
+    # Two requests, the rate-limited one and its retry.
+    assert limiter.requests.tokens < 59
+    assert limiter.throttled == 1
+    assert limiter.in_flight == 0
+
+
+def test_threads_wait_in_line_with_async_callers():
+    limiter = AdaptiveLimiter("mixed", concurrency=1)
+    admitted = []
+
+    def blocking_call():
+        limiter.acquire_blocking()
+        admitted.append("thread")
+        limiter.release_blocking()
+
+    async def main():
+        await limiter.acquire()
+        thread = threading.Thread(target=blocking_call)
+        thread.start()
+        while not limiter.queued:
+            await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.wait_for(waiter, 1)
+        admitted.append("task")
+        limiter.release()
+        thread.join(1)
+
+    asyncio.run(main())
+    assert admitted == ["thread", "task"]
+    assert limiter.in_flight == 0
+
+
+def test_limiter_settings_come_from_model_options(monkeypatch):
+    monkeypatch.setenv("LLM_LATENCY_TOLERANCE", "5")
+    limiter = AdaptiveLimiter.from_config(
+        ModelConfig("fake", "tolerant", options={"latency_tolerance": 3})
+    )
+    assert limiter.latency_tolerance == 3
+    assert limiter.max_retries == 2
+
+
+def test_provider_retries_are_left_to_the_limiter(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = LLMClientRegistry().get(ModelConfig("openai", "gpt-4o-mini"))
+    assert client.llm.max_retries == 0
+    assert client.limiter.name == "gpt-4o-mini"
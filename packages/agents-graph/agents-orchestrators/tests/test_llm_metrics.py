@@ -0,0 +1,59 @@
+import uuid
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from agents_core.metrics import current_labels
+from agents_orchestrators import llm_metrics
+from agents_orchestrators.llm_metrics import LLMMetricsCallbackHandler
+
+
+def _result(usage, generation_info=None):
+    message = AIMessage(content="joke", usage_metadata=usage)
+    generation = ChatGeneration(message=message, generation_info=generation_info)
+    return LLMResult(generations=[[generation]])
+
+
+def _value(counter, **labels):
+    return sum(
+        value
+        for _, sample_labels, value in counter.samples()
+        if labels.items() <= sample_labels.items()
+    )
+
+
+def test_records_tokens_and_cost_with_node_labels(monkeypatch):
+    monkeypatch.setenv(
+        "LLM_TOKEN_PRICES", '{"priced-model": {"input": 1000000, "output": 2000000}}'
+    )
+    handler = LLMMetricsCallbackHandler("priced-model")
+    usage = {"input_tokens": 3, "output_tokens": 2, "total_tokens": 5}
+
+    token = current_labels.set({"node": "joke_generator", "bot": "shop"})
+    try:
+        run_id = uuid.uuid4()
+        handler.on_chat_model_start({}, [[]], run_id=run_id)
+        handler.on_llm_end(_result(usage), run_id=run_id)
+    finally:
+        current_labels.reset(token)
+
+    labels = {"node": "joke_generator", "bot": "shop", "model": "priced-model"}
+    assert _value(llm_metrics.llm_tokens, type="input", **labels) == 3
+    assert _value(llm_metrics.llm_tokens, type="output", **labels) == 2
+    assert _value(llm_metrics.llm_cost, **labels) == 7
+
+
+def test_cache_hits_use_no_tokens():
+    handler = LLMMetricsCallbackHandler("cached-model")
+    run_id = uuid.uuid4()
+    handler.on_chat_model_start({}, [[]], run_id=run_id)
+    handler.on_llm_end(
+        _result(
+            {"input_tokens": 3, "output_tokens": 2, "total_tokens": 5},
+            generation_info={"cached": True},
+        ),
+        run_id=run_id,
+    )
+
+    assert _value(llm_metrics.llm_cache_hits, model="cached-model") == 1
+    assert _value(llm_metrics.llm_tokens, model="cached-model") == 0
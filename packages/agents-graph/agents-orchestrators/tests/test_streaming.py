@@ -0,0 +1,52 @@
+import asyncio
+
+from agents_core.model_config import ModelConfig
+from agents_orchestrators.scrapping_orchestrator import ScrapingOrchestrator
+from application.dtos.agent_dto import ScrapingPayloadDTO
+
+
+def _payload():
+    return ScrapingPayloadDTO.from_dict(
+        {
+            "request": {"url": "https://example.com", "headers": {}, "method": "GET"},
+            "response": {
+                "url": "https://example.com",
+                "status": 403,
+                "headers": {},
+                "body": "",
+            },
+            "bot_name": "streaming-bot",
+        }
+    )
+
+
+def test_partial_results_are_streamed_before_the_report():
+    orchestrator = ScrapingOrchestrator(
+        ModelConfig("fake", "streaming", options={"responses": ["a joke!"]})
+    )
+    events = []
+
+    async def on_update(event):
+        events.append(event)
+
+    report = asyncio.run(orchestrator.process_payload(_payload(), on_update))
+
+    partials = {e["node"]: e["data"] for e in events if e["type"] == "partial"}
+    assert {"ip_detector", "joke_generator", "aggregator"} <= set(partials)
+    assert partials["ip_detector"]["ip_blocked"] == report["ip_blocked"]
+    assert partials["aggregator"]["combined_output"] == report["message"]
+
+
+def test_tokens_are_streamed_when_enabled():
+    orchestrator = ScrapingOrchestrator(
+        ModelConfig("fake", "streaming-tokens", options={"responses": ["a joke!"]})
+    )
+    events = []
+
+    async def on_update(event):
+        events.append(event)
+
+    asyncio.run(orchestrator.process_payload(_payload(), on_update, stream_tokens=True))
+
+    tokens = [e for e in events if e["type"] == "token"]
+    assert {"node": "joke_generator", "content": "a joke!", "type": "token"} in tokens
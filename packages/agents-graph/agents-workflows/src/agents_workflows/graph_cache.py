@@ -0,0 +1,54 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class CompiledGraphCache:
+    """
+    Process-wide cache of compiled LangGraph workflows.
+
+    Building a `StateGraph` and compiling it is pure setup work that only depends
+    on the workflow type and the agents wired into it, so it is done once per key
+    and shared by every payload handled afterwards.
+    """
+
+    def __init__(self):
+        self._graphs: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Hashable, llm, builder: Callable[[], Any]):
+        """
+        Return the compiled graph stored under `key`, building it on first use.
+
+        The LLM instance is kept alongside the graph so that a key derived from
+        `id(llm)` can never be reused by a different object.
+        """
+        entry = self._graphs.get(key)
+        if entry is not None:
+            return entry[1]
+        with self._lock:
+            entry = self._graphs.get(key)
+            if entry is None:
+                entry = (llm, builder())
+                self._graphs[key] = entry
+        return entry[1]
+
+    def clear(self) -> None:
+        """Drop every compiled graph."""
+        with self._lock:
+            self._graphs.clear()
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+
+compiled_graphs = CompiledGraphCache()
+
+
+def graph_cache_key(workflow_cls: type, llm, agent_configuration: Tuple) -> Tuple:
+    """Build the cache key for a workflow type bound to a given LLM and agent set."""
+    return (
+        workflow_cls.__module__,
+        workflow_cls.__qualname__,
+        id(llm),
+        agent_configuration,
+    )
@@ -1,7 +1,6 @@
-import asyncio
 from typing_extensions import TypedDict
 from logger.log import get_logger_from_env
-from application.dtos.agent_dto import ScrapingPayloadDTO
+from application.dtos.agent_dto import ScrapingErrorPayloadDTO
 from agents_core.dynamic_agent_factory import DynamicAgentFactory
 
 log = get_logger_from_env(__file__)
@@ -12,7 +11,7 @@ class State(TypedDict):
 
 
 class ScrapingErrorWorkflow:
-    def __init__(self, llm, payload: ScrapingPayloadDTO):
+    def __init__(self, llm, payload: ScrapingErrorPayloadDTO):
         self.llm = llm
         self.payload = payload
         self.agent_factory = DynamicAgentFactory(llm)
@@ -21,8 +20,6 @@ class ScrapingErrorWorkflow:
         """
         Runs the scraping workflow.
         """
-        await asyncio.sleep(0.5)
-
         return {
             "usage": "scraping",
             "bot_name": self.payload.bot_name,
@@ -1,73 +1,141 @@
-import asyncio
+import json
+import operator
+import os
+from typing import Annotated, Awaitable, Callable, Dict, List, Optional, Union
 from typing_extensions import TypedDict
 from logger.log import get_logger_from_env
 from langgraph.graph import StateGraph, START, END
 from application.dtos.agent_dto import ScrapingPayloadDTO
+from agents_core.block_stats import response_domain
+from agents_core.deadline import Deadline, bounded_node
 from agents_core.dynamic_agent_factory import DynamicAgentFactory
+from agents_core.metrics import instrument_node
+from agents_workflows.graph_cache import compiled_graphs, graph_cache_key
 
 log = get_logger_from_env(__file__)
 
+# Receives the events of a streamed run: {"type": "partial", "node", "data"} once
+# a node finished, and {"type": "token", "node", "content"} per LLM token.
+StreamCallback = Callable[[dict], Awaitable[None]]
+
+
+def _node_timeouts() -> Dict[str, Optional[float]]:
+    # NODE_TIMEOUT bounds every node (0 for none); NODE_TIMEOUTS overrides it
+    # per node, e.g. {"joke_generator": 10}.
+    default = float(os.getenv("NODE_TIMEOUT", "20")) or None
+    overrides = json.loads(os.getenv("NODE_TIMEOUTS", "{}"))
+    return {
+        node: float(overrides.get(node, default or 0)) or None
+        for node in ScrapingWorkflow.AGENT_ALIASES
+    }
+
 
 class State(TypedDict):
     topic: str
+    status: int
+    headers: dict
+    body: Union[str, bytes]
+    body_encoding: Optional[str]
+    bot_name: str
+    domain: str
     joke: str
     improved_joke: str
     final_joke: str
     ip_blocked: bool
     ip_reason: str
+    ip_prior: bool
     combined_output: str
+    deadline: Deadline
+    # Nodes cancelled at their timeout or the deadline; parallel branches add up.
+    timed_out: Annotated[List[str], operator.add]
 
 
 class ScrapingWorkflow:
+    # Agents wired into the graph; part of the compiled-graph cache key.
+    AGENT_ALIASES = ("ip_detector", "joke_generator", "joke_improver", "joke_polisher")
+
     def __init__(self, llm, payload: ScrapingPayloadDTO):
         self.llm = llm
         self.payload = payload
-        self.agent_factory = DynamicAgentFactory(llm)
+        self.chain = self.compile(llm)
 
-    async def run(self):
+    @classmethod
+    def compile(cls, llm):
         """
-        Runs the scraping workflow.
+        Return the compiled graph for this workflow, building it only on first use.
         """
-        await asyncio.sleep(0.5)
+        agent_factory = DynamicAgentFactory(llm)
+        key = graph_cache_key(
+            cls, llm, agent_factory.registration_key(cls.AGENT_ALIASES)
+        )
+        return compiled_graphs.get_or_build(
+            key, llm, lambda: cls._build_graph(agent_factory)
+        )
+
+    @classmethod
+    def _build_graph(cls, agent_factory: DynamicAgentFactory):
         workflow = StateGraph(State)
 
         # Dynamically create agents.
-        ip_detector = self.agent_factory.create_agent("ip_detector")
-        gen_agent = self.agent_factory.create_agent("joke_generator")
-        improve_agent = self.agent_factory.create_agent("joke_improver")
-        polish_agent = self.agent_factory.create_agent("joke_polisher")
-
-        # Register workflow nodes.
-        workflow.add_node(
-            "joke_generator", lambda state: gen_agent.run(topic=state["topic"])
-        )
-        workflow.add_node(
-            "joke_improver", lambda state: improve_agent.run(joke=state["joke"])
-        )
-        workflow.add_node(
-            "joke_polisher",
-            lambda state: polish_agent.run(improved_joke=state["improved_joke"]),
-        )
-        # IP detector node; its result will be stored under "ip_detector".
-        workflow.add_node(
-            "ip_detector",
-            lambda state: ip_detector.run(
-                status=self.payload.response.status,
-                headers=self.payload.response.headers,
-            ),
-        )
+        ip_detector = agent_factory.create_agent("ip_detector")
+        gen_agent = agent_factory.create_agent("joke_generator")
+        improve_agent = agent_factory.create_agent("joke_improver")
+        polish_agent = agent_factory.create_agent("joke_polisher")
+
+        # Register workflow nodes; every node awaits the agent's async contract,
+        # is bounded by its timeout and the deadline, and is timed when metrics
+        # are enabled.
+        timeouts = _node_timeouts()
+
+        @instrument_node("scraping", "joke_generator", "joke_generator")
+        @bounded_node("joke_generator", timeouts["joke_generator"])
+        async def joke_generator(state: dict) -> dict:
+            return await gen_agent.arun(topic=state["topic"])
+
+        @instrument_node("scraping", "joke_improver", "joke_improver")
+        @bounded_node("joke_improver", timeouts["joke_improver"])
+        async def joke_improver(state: dict) -> dict:
+            return await improve_agent.arun(joke=state["joke"])
 
-        # Aggregator node.
+        @instrument_node("scraping", "joke_polisher", "joke_polisher")
+        @bounded_node("joke_polisher", timeouts["joke_polisher"])
+        async def joke_polisher(state: dict) -> dict:
+            return await polish_agent.arun(improved_joke=state["improved_joke"])
+
+        # IP detector node; the payload metadata is bound through the state.
+        @instrument_node("scraping", "ip_detector", "ip_detector")
+        @bounded_node("ip_detector", timeouts["ip_detector"])
+        async def detect_ip_block(state: dict) -> dict:
+            return await ip_detector.arun(
+                status=state["status"],
+                headers=state["headers"],
+                body=state.get("body"),
+                body_encoding=state.get("body_encoding"),
+                bot_name=state.get("bot_name"),
+                domain=state.get("domain"),
+            )
+
+        workflow.add_node("joke_generator", joke_generator)
+        workflow.add_node("joke_improver", joke_improver)
+        workflow.add_node("joke_polisher", joke_polisher)
+        workflow.add_node("ip_detector", detect_ip_block)
+
+        # Aggregator node; it runs whatever the other nodes did in time, and
+        # marks the ones that timed out.
         def format_topic(state: dict) -> str:
             topic = state.get("topic", "N/A")
             return f"Topic: {topic}"
 
         def format_joke(state: dict) -> str:
+            if "joke_generator" in state.get("timed_out", ()):
+                return "Initial Joke: TIMED OUT"
             if state.get("joke"):
                 return f"Initial Joke: {state['joke']}"
             return "Initial Joke: N/A"
 
         def format_ip_info(state: dict) -> str:
+            if "ip_detector" in state.get("timed_out", ()):
+                return "IP Detector: TIMED OUT"
             status_line = "BLOCKED" if state.get("ip_blocked") else "Not Blocked"
             reason = state.get("ip_reason", "No block indicators detected")
             return f"IP Detector: {status_line} ({reason})"
@@ -85,7 +153,7 @@ class ScrapingWorkflow:
         workflow.add_edge(START, "joke_generator")
         workflow.add_conditional_edges(
             "joke_generator",
-            self.check_punchline,
+            cls.check_punchline,
             {"Fail": "joke_improver", "Pass": END},
         )
         workflow.add_edge("joke_improver", "joke_polisher")
@@ -94,37 +162,96 @@ class ScrapingWorkflow:
         workflow.add_edge("aggregator", END)
         workflow.add_edge("joke_polisher", END)
 
-        chain = workflow.compile()
-        log.debug("Workflow graph:")
-        chain.get_graph().print_ascii()
+        log.debug("Compiled scraping workflow graph.")
+        return workflow.compile()
+
+    def draw_graph(self) -> str:
+        """
+        Render the compiled workflow graph as ASCII, on demand.
+        """
+        return self.chain.get_graph().draw_ascii()
 
-        state = chain.invoke({"topic": "cats"})
+    async def run(
+        self,
+        on_update: Optional[StreamCallback] = None,
+        stream_tokens: bool = False,
+        deadline: Optional[Deadline] = None,
+    ):
+        """
+        Runs the scraping workflow.
 
-        log.debug("Initial joke:")
-        log.debug(state["joke"])
-        log.debug("\n--- --- ---\n")
+        Nodes still running at the `deadline` are cancelled; the report is then
+        built from the nodes that finished, and lists the others in `timed_out`.
 
+        With `on_update`, the graph is streamed and every node's output is
+        passed to it as soon as the node finished, so early verdicts such as
+        the IP detector's do not wait for the slowest branch; `stream_tokens`
+        also forwards the LLM tokens as they are generated.
+        """
+        inputs = {
+            "topic": "cats",
+            "status": self.payload.response.status,
+            "headers": self.payload.response.headers,
+            "body": self.payload.response.body,
+            "body_encoding": self.payload.response.body_encoding,
+            "bot_name": self.payload.bot_name,
+            "domain": response_domain(self.payload.response.url),
+            "deadline": deadline,
+        }
+        if on_update is None:
+            state = await self.chain.ainvoke(inputs)
+        else:
+            state = await self._stream(inputs, on_update, stream_tokens)
+
+        # Arguments are only rendered when debug logging is enabled.
+        log.debug("Initial joke: %s", state.get("joke"))
         if "improved_joke" in state:
-            log.debug("Improved joke:")
-            log.debug(state["improved_joke"])
-            log.debug("\n--- --- ---\n")
-            log.debug("Final joke:")
-            log.debug(state["final_joke"])
+            log.debug("Improved joke: %s", state["improved_joke"])
+            log.debug("Final joke: %s", state["final_joke"])
         else:
             log.debug("Joke failed quality gate - no punchline detected!")
-
-        log.debug("\n---")
-        log.debug("State")
-        log.debug(state)
-        log.debug("\n---")
+        log.debug("State: %s", state)
 
         return {
             "usage": "scraping",
             "bot_name": self.payload.bot_name,
             "processed_data": self.payload,
             "message": state["combined_output"],
+            "ip_blocked": state.get("ip_blocked"),
+            "ip_prior": state.get("ip_prior", False),
+            "timed_out": state.get("timed_out", []),
         }
 
-    def check_punchline(self, state: State):
+    async def _stream(
+        self, inputs: dict, on_update: StreamCallback, stream_tokens: bool
+    ) -> dict:
+        # Only `timed_out` has a reducer, so the final state is the inputs with
+        # every node update applied in order.
+        state = dict(inputs)
+        modes = ["updates", "messages"] if stream_tokens else ["updates"]
+        async for mode, chunk in self.chain.astream(inputs, stream_mode=modes):
+            if mode == "updates":
+                for node, update in chunk.items():
+                    if not update:
+                        continue
+                    timed_out = state.get("timed_out", []) + update.get("timed_out", [])
+                    state.update(update, timed_out=timed_out)
+                    await on_update({"type": "partial", "node": node, "data": update})
+            else:
+                message, metadata = chunk
+                if message.content:
+                    await on_update(
+                        {
+                            "type": "token",
+                            "node": metadata.get("langgraph_node"),
+                            "content": message.content,
+                        }
+                    )
+        return state
+
+    @staticmethod
+    def check_punchline(state: State):
         """Gate function to check if the joke has a punchline."""
-        return "Fail" if ("?" in state["joke"] or "!" in state["joke"]) else "Pass"
+        # A joke that timed out is not improved.
+        joke = state.get("joke", "")
+        return "Fail" if ("?" in joke or "!" in joke) else "Pass"
@@ -0,0 +1,35 @@
+from agents_workflows.graph_cache import CompiledGraphCache, graph_cache_key
+
+
+class DummyWorkflow:
+    pass
+
+
+def test_builds_once_per_key():
+    cache = CompiledGraphCache()
+    llm = object()
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return object()
+
+    key = graph_cache_key(DummyWorkflow, llm, (("alias", "pkg.Class", ()),))
+    first = cache.get_or_build(key, llm, builder)
+    second = cache.get_or_build(key, llm, builder)
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_key_depends_on_llm_and_agent_configuration():
+    llm_a, llm_b = object(), object()
+    config = (("alias", "pkg.Class", ()),)
+    other_config = (("alias", "pkg.Class", (("prompt_template", "'x'"),)),)
+
+    assert graph_cache_key(DummyWorkflow, llm_a, config) != graph_cache_key(
+        DummyWorkflow, llm_b, config
+    )
+    assert graph_cache_key(DummyWorkflow, llm_a, config) != graph_cache_key(
+        DummyWorkflow, llm_a, other_config
+    )
@@ -0,0 +1,215 @@
+import base64
+import binascii
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+STATUS = "status"
+HEADER = "header"
+HEADER_VALUE = "header_value"
+BODY = "body"
+
+
+@dataclass(frozen=True)
+class SignatureRule:
+    """
+    A declarative block signature.
+
+    Attributes:
+        name (str): Identifier of the rule, e.g. the vendor it detects.
+        kind (str): What the rule inspects: 'status', 'header', 'header_value' or 'body'.
+        pattern (str): Status code, header name or body marker to look for.
+        value (Optional[str]): Header value substring, for 'header_value' rules.
+        reason (str): Explanation template; `{status}`, `{pattern}` and `{value}`
+            are substituted when the rule matches.
+    """
+
+    name: str
+    kind: str
+    pattern: str
+    value: Optional[str] = None
+    reason: str = "Signature '{pattern}' indicates an IP block."
+
+
+DEFAULT_RULES: Tuple[SignatureRule, ...] = (
+    # Status codes.
+    SignatureRule(
+        "rate-limit",
+        STATUS,
+        "429",
+        reason="HTTP status {status} indicates possible IP block.",
+    ),
+    SignatureRule(
+        "forbidden",
+        STATUS,
+        "403",
+        reason="HTTP status {status} indicates possible IP block.",
+    ),
+    # Proxy and CDN headers.
+    SignatureRule(
+        "proxy",
+        HEADER,
+        "X-Blocked-Reason",
+        reason="Header {pattern} indicates an IP block.",
+    ),
+    SignatureRule(
+        "proxy",
+        HEADER,
+        "X-IP-Blocked",
+        reason="Header {pattern} indicates an IP block.",
+    ),
+    SignatureRule(
+        "cloudflare",
+        HEADER_VALUE,
+        "cf-mitigated",
+        "challenge",
+        reason="Header {pattern}: {value} indicates a Cloudflare challenge.",
+    ),
+    # Challenge pages.
+    SignatureRule("cloudflare", BODY, "Attention Required! | Cloudflare"),
+    SignatureRule("cloudflare", BODY, "cf-browser-verification"),
+    SignatureRule("cloudflare", BODY, "challenge-platform"),
+    SignatureRule("cloudflare", BODY, "cf_chl_opt"),
+    SignatureRule("cloudflare", BODY, "Checking your browser before accessing"),
+    SignatureRule("akamai", BODY, "errors.edgesuite.net"),
+    SignatureRule("akamai", BODY, "You don't have permission to access"),
+    SignatureRule("datadome", BODY, "captcha-delivery.com"),
+    SignatureRule("datadome", BODY, "dd={'rt':'c'"),
+    SignatureRule("perimeterx", BODY, "px-captcha"),
+    SignatureRule("perimeterx", BODY, "_pxCaptcha"),
+    SignatureRule("generic", BODY, "unusual traffic from your computer network"),
+    SignatureRule("generic", BODY, "Please verify you are a human"),
+)
+
+# Statuses considered healthy when no block signature matched.
+DEFAULT_CLEAR_STATUSES: FrozenSet[int] = frozenset(
+    [*range(200, 300), *range(300, 400), 404, 410]
+)
+
+
+@dataclass(frozen=True)
+class SignatureMatch:
+    rule: SignatureRule
+    reason: str
+
+
+class SignatureMatcher:
+    """
+    Block signatures compiled for constant-time status and header lookups and a
+    single pass over the response body.
+
+    Body markers are folded into one case-insensitive alternation, so the scan
+    over the decoded snippet runs inside the regex engine instead of looping over
+    markers in Python. Each marker is its own group, and a match is mapped back
+    to its rule by the group that matched, never by the matched text: case
+    folding can match text that does not lower-case to the marker.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[SignatureRule] = DEFAULT_RULES,
+        clear_statuses: Iterable[int] = DEFAULT_CLEAR_STATUSES,
+    ):
+        self.clear_statuses = frozenset(clear_statuses)
+        self._status_rules: Dict[int, SignatureRule] = {}
+        self._header_rules: Dict[str, SignatureRule] = {}
+        self._header_value_rules: Dict[str, List[SignatureRule]] = {}
+        body_rules: Dict[str, SignatureRule] = {}
+
+        for rule in rules:
+            if rule.kind == STATUS:
+                self._status_rules[int(rule.pattern)] = rule
+            elif rule.kind == HEADER:
+                self._header_rules[rule.pattern.lower()] = rule
+            elif rule.kind == HEADER_VALUE:
+                self._header_value_rules.setdefault(rule.pattern.lower(), []).append(
+                    rule
+                )
+            elif rule.kind == BODY:
+                body_rules[rule.pattern.lower()] = rule
+            else:
+                raise ValueError(f"Unsupported signature kind: {rule.kind}")
+
+        # Longest markers first; the rule of group `i` is `_body_rules[i - 1]`.
+        markers = sorted(body_rules, key=len, reverse=True)
+        self._body_rules: List[SignatureRule] = [body_rules[m] for m in markers]
+        self._body_pattern = None
+        if markers:
+            self._body_pattern = re.compile(
+                "|".join(f"({re.escape(marker)})" for marker in markers),
+                re.IGNORECASE,
+            )
+
+    @classmethod
+    def from_config(cls, rules: Iterable[dict]) -> "SignatureMatcher":
+        """Compile a matcher from rule dicts, e.g. taken from an agent's config."""
+        return cls([SignatureRule(**rule) for rule in rules])
+
+    def match(
+        self, status: int, headers: dict, body: Optional[str] = None
+    ) -> Optional[SignatureMatch]:
+        """Return the first block signature found in the response, if any."""
+        rule = self._status_rules.get(status)
+        if rule is not None:
+            return self._matched(rule, status)
+
+        for name, values in headers.items():
+            key = name.lower()
+            rule = self._header_rules.get(key)
+            if rule is not None:
+                return self._matched(rule, status)
+            for rule in self._header_value_rules.get(key, ()):
+                if rule.value.lower() in _header_text(values).lower():
+                    return self._matched(rule, status)
+
+        return self.match_body(status, body)
+
+    def match_body(self, status: int, body: Optional[str]) -> Optional[SignatureMatch]:
+        """Return the first body marker found in the decoded body, if any."""
+        if body and self._body_pattern is not None:
+            found = self._body_pattern.search(body)
+            if found:
+                return self._matched(self._body_rules[found.lastindex - 1], status)
+        return None
+
+    def is_clear(self, status: int) -> bool:
+        """Whether a status without block signatures can be trusted as unblocked."""
+        return status in self.clear_statuses
+
+    @staticmethod
+    def _matched(rule: SignatureRule, status: int) -> SignatureMatch:
+        reason = rule.reason.format(
+            status=status, pattern=rule.pattern, value=rule.value
+        )
+        return SignatureMatch(rule=rule, reason=reason)
+
+
+def _header_text(values) -> str:
+    if isinstance(values, (list, tuple)):
+        return " ".join(str(value) for value in values)
+    return str(values)
+
+
+def decode_body_snippet(
+    body: Optional[Union[str, bytes]], encoding: Optional[str] = None
+) -> Optional[str]:
+    """
+    Decode the body snippet sent by the scrapy integration: raw bytes over
+    msgpack, Base64 text over JSON when the client flags it with `encoding`.
+
+    Text without an encoding is the body itself, even if it happens to be valid
+    Base64; so is flagged text that does not decode.
+    """
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    if encoding != "base64":
+        return body
+    try:
+        return base64.b64decode(body, validate=True).decode("utf-8", errors="replace")
+    except (binascii.Error, ValueError):
+        return body
+
+
+default_matcher = SignatureMatcher()
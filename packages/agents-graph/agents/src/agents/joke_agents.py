@@ -2,30 +2,48 @@ from agents_core.base_agent import BaseAgent
 
 
 class JokeGeneratorAgent(BaseAgent):
-    def run(self, topic: str) -> dict:
+    def _build_prompt(self, topic: str) -> str:
         prompt_template = self.config.get(
             "prompt_template", "Write a short joke about {topic}"
         )
-        prompt = prompt_template.format(topic=topic)
-        response = self.llm.invoke(prompt)
+        return prompt_template.format(topic=topic)
+
+    def run(self, topic: str) -> dict:
+        response = self.llm.invoke(self._build_prompt(topic))
+        return {"joke": response.content}
+
+    async def arun(self, topic: str) -> dict:
+        response = await self.llm.ainvoke(self._build_prompt(topic))
         return {"joke": response.content}
 
 
 class JokeImproverAgent(BaseAgent):
-    def run(self, joke: str) -> dict:
+    def _build_prompt(self, joke: str) -> str:
         prompt_template = self.config.get(
             "prompt_template", "Make this joke funnier by adding wordplay: {joke}"
         )
-        prompt = prompt_template.format(joke=joke)
-        response = self.llm.invoke(prompt)
+        return prompt_template.format(joke=joke)
+
+    def run(self, joke: str) -> dict:
+        response = self.llm.invoke(self._build_prompt(joke))
+        return {"improved_joke": response.content}
+
+    async def arun(self, joke: str) -> dict:
+        response = await self.llm.ainvoke(self._build_prompt(joke))
         return {"improved_joke": response.content}
 
 
 class JokePolisherAgent(BaseAgent):
-    def run(self, improved_joke: str) -> dict:
+    def _build_prompt(self, improved_joke: str) -> str:
         prompt_template = self.config.get(
             "prompt_template", "Add a surprising twist to this joke: {improved_joke}"
         )
-        prompt = prompt_template.format(improved_joke=improved_joke)
-        response = self.llm.invoke(prompt)
+        return prompt_template.format(improved_joke=improved_joke)
+
+    def run(self, improved_joke: str) -> dict:
+        response = self.llm.invoke(self._build_prompt(improved_joke))
+        return {"final_joke": response.content}
+
+    async def arun(self, improved_joke: str) -> dict:
+        response = await self.llm.ainvoke(self._build_prompt(improved_joke))
         return {"final_joke": response.content}
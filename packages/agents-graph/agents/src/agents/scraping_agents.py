@@ -1,51 +1,179 @@
+from typing import List, Optional, Union
+
 from agents_core.base_agent import BaseAgent
+from agents_core.batching import MicroBatcher
+from agents_core.block_stats import block_stats
+from agents.block_signatures import (
+    SignatureMatcher,
+    decode_body_snippet,
+    default_matcher,
+)
+
+PROXY_BLOCK_HEADERS = ["X-Blocked-Reason", "X-IP-Blocked"]
+
+
+def analyze_status(s: int) -> str:
+    """Analyze an HTTP status code for IP block indicators."""
+    if s in (403, 429):
+        return f"Status code {s} strongly suggests an IP block."
+    return f"Status code {s} appears normal."
+
+
+def analyze_headers(h: dict) -> str:
+    """Analyze response headers for IP block indicators."""
+    for key in PROXY_BLOCK_HEADERS:
+        if key in h:
+            return f"Header {key} indicates an IP block."
+    return "No blocking indicators found in headers."
 
 
 class IPBlockDetectorAgent(BaseAgent):
     """
     Detects if the request is ip_blocked due to IP or proxy issues using both
     deterministic checks and low-cost LLM-augmented analysis via bound tools.
+
+    The deterministic checks are a compiled signature rule set (status codes,
+    headers and challenge-page body markers); the LLM is only consulted when no
+    signature matched and the status is not a known healthy one. Custom rules can
+    be supplied through the `signatures` entry of the agent config.
+
+    Ambiguous responses are micro-batched into a single `abatch` call, tuned via
+    the `batch_max_size` and `batch_max_wait_ms` config entries.
+
+    Before escalating to the LLM, the recent block rate of the bot on the
+    response domain is used as a cheap prior: once at least
+    `prior_min_samples` verdicts were recorded (default 20), a rate at or above
+    `prior_block_threshold` (default 0.9) is reported as blocked and one at or
+    below `prior_clear_threshold` (default 0.05) as not blocked. Such verdicts
+    are flagged with `ip_prior` so they are not counted back into the rate.
     """
 
-    def run(self, status: int, headers: dict) -> dict:
-        # --- Deterministic checks ---
-        if status in (403, 429):
+    def __init__(self, name: str, llm, config: dict):
+        super().__init__(name, llm, config)
+        self._bound_llm = None
+        self._batcher: Optional[MicroBatcher] = None
+        self.matcher = (
+            SignatureMatcher.from_config(config["signatures"])
+            if config.get("signatures")
+            else default_matcher
+        )
+
+    def run(
+        self,
+        status: int,
+        headers: dict,
+        body: Optional[Union[str, bytes]] = None,
+        bot_name: Optional[str] = None,
+        domain: Optional[str] = None,
+        body_encoding: Optional[str] = None,
+    ) -> dict:
+        verdict = self._deterministic_verdict(status, headers, body, body_encoding)
+        if verdict is None:
+            verdict = self._prior_verdict(bot_name, domain)
+        if verdict is not None:
+            return verdict
+
+        response = self._llm_with_tools().invoke(self._build_prompt(status, headers))
+        return self._parse_response(response, status)
+
+    async def arun(
+        self,
+        status: int,
+        headers: dict,
+        body: Optional[Union[str, bytes]] = None,
+        bot_name: Optional[str] = None,
+        domain: Optional[str] = None,
+        body_encoding: Optional[str] = None,
+    ) -> dict:
+        verdict = self._deterministic_verdict(status, headers, body, body_encoding)
+        if verdict is None:
+            verdict = self._prior_verdict(bot_name, domain)
+        if verdict is not None:
+            return verdict
+
+        # Ambiguous responses from every bot share micro-batched LLM calls.
+        response = await self._get_batcher().submit(self._build_prompt(status, headers))
+        return self._parse_response(response, status)
+
+    # --- Deterministic checks ---
+    def _deterministic_verdict(
+        self,
+        status: int,
+        headers: dict,
+        body: Optional[Union[str, bytes]] = None,
+        body_encoding: Optional[str] = None,
+    ) -> Optional[dict]:
+        match = self.matcher.match(status, headers)
+        if match is None and body:
+            # The body is only decoded when status and headers are inconclusive.
+            match = self.matcher.match_body(
+                status, decode_body_snippet(body, body_encoding)
+            )
+        if match is not None:
+            return {"ip_blocked": True, "ip_reason": match.reason}
+        if self.matcher.is_clear(status):
+            return {
+                "ip_blocked": False,
+                "ip_reason": f"Status code {status} appears normal.",
+            }
+        return None
+
+    def _prior_verdict(
+        self, bot_name: Optional[str], domain: Optional[str]
+    ) -> Optional[dict]:
+        if bot_name is None or domain is None:
+            return None
+        rate = block_stats.block_rate(
+            bot_name, domain, int(self.config.get("prior_min_samples", 20))
+        )
+        if rate is None:
+            return None
+        if rate >= float(self.config.get("prior_block_threshold", 0.9)):
             return {
                 "ip_blocked": True,
-                "ip_reason": f"HTTP status {status} indicates possible IP block.",
+                "ip_reason": f"{rate:.0%} of recent responses from {domain} were blocked.",
+                "ip_prior": True,
             }
+        if rate <= float(self.config.get("prior_clear_threshold", 0.05)):
+            return {
+                "ip_blocked": False,
+                "ip_reason": f"Only {rate:.0%} of recent responses from {domain} were blocked.",
+                "ip_prior": True,
+            }
+        return None
+
+    # --- Low-cost LLM analysis via bound tools ---
+    def _llm_with_tools(self):
+        # Tool schemas are converted once and the binding reused across calls.
+        if self._bound_llm is None:
+            self._bound_llm = self.llm.bind_tools([analyze_status, analyze_headers])
+        return self._bound_llm
 
-        proxy_block_headers = ["X-Blocked-Reason", "X-IP-Blocked"]
-        for header in proxy_block_headers:
-            if header in headers:
-                return {
-                    "ip_blocked": True,
-                    "ip_reason": f"Header {header} indicates an IP block.",
-                }
-
-        # --- Low-cost LLM analysis via bound tools ---
-        def analyze_status(s: int) -> str:
-            if s in (403, 429):
-                return f"Status code {s} strongly suggests an IP block."
-            return f"Status code {s} appears normal."
-
-        def analyze_headers(h: dict) -> str:
-            for key in proxy_block_headers:
-                if key in h:
-                    return f"Header {key} indicates an IP block."
-            return "No blocking indicators found in headers."
-
-        llm_with_tools = self.llm.bind_tools([analyze_status, analyze_headers])
-        prompt = (
+    def _get_batcher(self) -> MicroBatcher:
+        if self._batcher is None:
+            self._batcher = MicroBatcher(
+                self._analyze_batch,
+                max_batch_size=int(self.config.get("batch_max_size", 16)),
+                max_wait=float(self.config.get("batch_max_wait_ms", 10)) / 1000,
+            )
+        return self._batcher
+
+    async def _analyze_batch(self, prompts: List[str]) -> List:
+        return await self._llm_with_tools().abatch(prompts, return_exceptions=True)
+
+    def _build_prompt(self, status: int, headers: dict) -> str:
+        return (
             "Based on the following metadata, determine if there is an IP block and explain your reasoning.\n"
             f"Status: {status}\n"
             f"Headers: {headers}\n"
             "Answer in the format: 'blocked: <reason>' or 'not blocked: <explanation>'."
         )
-        response = llm_with_tools.invoke(prompt)
+
+    def _parse_response(self, response, status: int) -> dict:
         # Ensure a fallback is provided if the response is empty.
         if response and response.content:
-            if "blocked" in response.content.lower():
+            content = response.content.strip().lower()
+            if "blocked" in content and not content.startswith("not blocked"):
                 return {"ip_blocked": True, "ip_reason": response.content.strip()}
             else:
                 return {"ip_blocked": False, "ip_reason": response.content.strip()}
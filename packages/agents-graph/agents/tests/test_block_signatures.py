@@ -0,0 +1,94 @@
+import asyncio
+import base64
+
+from agents import scraping_agents
+from agents.block_signatures import SignatureMatcher, decode_body_snippet
+from agents.scraping_agents import IPBlockDetectorAgent
+from agents_core.block_stats import BlockStatsStore
+
+
+class ExplodingLLM:
+    def bind_tools(self, tools):
+        raise AssertionError("LLM must not be consulted")
+
+
+def encode(text: str) -> str:
+    return base64.b64encode(text.encode()).decode()
+
+
+def test_status_and_header_rules():
+    matcher = SignatureMatcher()
+
+    assert matcher.match(429, {}).rule.name == "rate-limit"
+    assert matcher.match(200, {"x-ip-blocked": ["1"]}).rule.name == "proxy"
+    assert matcher.match(200, {"cf-mitigated": ["challenge"]}).rule.name == "cloudflare"
+    assert matcher.match(200, {"Content-Type": ["text/html"]}) is None
+
+
+def test_body_markers_are_matched_case_insensitively():
+    matcher = SignatureMatcher()
+    body = decode_body_snippet(
+        encode("<html>Attention Required! | CLOUDFLARE</html>"), "base64"
+    )
+
+    match = matcher.match(503, {}, body)
+
+    assert match.rule.name == "cloudflare"
+    assert "Attention Required" in match.reason
+
+
+def test_case_folded_matches_map_to_their_rule():
+    matcher = SignatureMatcher()
+
+    # LONG S matches 's' case-insensitively, but does not lower-case to it.
+    match = matcher.match(503, {}, "errors.edge\u017fuite.net")
+    assert match.rule.name == "akamai"
+    match = matcher.match(
+        503, {}, "Chec\u212aing your browser before acce\u017f\u017fing"
+    )
+    assert match.rule.name == "cloudflare"
+
+
+def test_body_is_only_base64_decoded_when_flagged():
+    # "px-captcha" would not be found in the decoded bytes of this valid Base64.
+    assert decode_body_snippet("cGFzcw==") == "cGFzcw=="
+    assert decode_body_snippet("cGFzcw==", "base64") == "pass"
+    assert decode_body_snippet(b"<html/>") == "<html/>"
+
+
+def test_rules_can_be_supplied_as_config():
+    matcher = SignatureMatcher.from_config(
+        [{"name": "custom", "kind": "body", "pattern": "go away robot"}]
+    )
+
+    assert matcher.match(200, {}, "please GO AWAY ROBOT").rule.name == "custom"
+    assert matcher.match(429, {}) is None
+
+
+def test_detector_skips_the_llm_for_known_responses():
+    agent = IPBlockDetectorAgent("ip_detector", ExplodingLLM(), {})
+
+    blocked = asyncio.run(
+        agent.arun(
+            status=200, headers={}, body=encode("px-captcha"), body_encoding="base64"
+        )
+    )
+    clear = asyncio.run(agent.arun(status=200, headers={}, body=b"<html/>"))
+
+    assert blocked["ip_blocked"] is True
+    assert clear["ip_blocked"] is False
+
+
+def test_detector_uses_recent_block_rate_as_prior(monkeypatch):
+    store = BlockStatsStore(bucket_seconds=10, num_buckets=6)
+    monkeypatch.setattr(scraping_agents, "block_stats", store)
+    agent = IPBlockDetectorAgent(
+        "ip_detector", ExplodingLLM(), config={"prior_min_samples": 3}
+    )
+    for _ in range(3):
+        store.record("shop", "example.com", 403, blocked=True)
+
+    verdict = agent.run(503, {}, bot_name="shop", domain="example.com")
+
+    assert verdict["ip_blocked"] is True
+    assert verdict["ip_prior"] is True
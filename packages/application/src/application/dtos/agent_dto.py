@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Discriminator, PositiveInt, Tag, TypeAdapter
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 from application.value_objects.agent_id import AgentID
 
 
@@ -18,50 +19,118 @@ class CreateAgentDTO(BaseModel):
     name: str
 
 
-@dataclass
+class CreateAgentsDTO(BaseModel):
+    """DTO for creating agents in bulk."""
+
+    agents: List[CreateAgentDTO]
+
+
+@dataclass(frozen=True)
+class ListAgentsDTO:
+    """Query for a page of agents, or for the agents with the given ids."""
+
+    ids: Optional[List[str]] = None
+    cursor: Optional[str] = None
+    limit: int = 100
+
+
+@dataclass(frozen=True)
+class AgentPageDTO:
+    """A page of agents and the cursor of the next page, if any."""
+
+    items: List[AgentDTO]
+    next_cursor: Optional[str] = None
+
+
+# Payload DTOs are slotted pydantic dataclasses: they are validated straight
+# from the wire frame, with no intermediate dict, and carry no per-instance
+# __dict__. The response body is kept as received (Base64 text over JSON, flagged
+# by `body_encoding`, raw bytes over msgpack) and only decoded by the agents
+# that read it.
+@pydantic_dataclass(slots=True)
 class RequestDTO:
     url: str
     headers: Dict[str, Any]
     method: str
 
 
-@dataclass
+@pydantic_dataclass(slots=True)
 class ResponseDTO:
     url: str
     status: int
-    body: str
     headers: Dict[str, Any]
+    body: Optional[Union[str, bytes]] = None
+    # Set by the client when `body` is encoded text rather than the body itself.
+    body_encoding: Optional[Literal["base64"]] = None
+    # Download latency in seconds, as measured by the crawler.
+    latency: Optional[float] = None
 
 
-@dataclass
+@pydantic_dataclass(slots=True)
 class ScrapingPayloadDTO:
-    usage_context: str
     request: RequestDTO
     response: ResponseDTO
-    bot_name: str
+    usage_context: Literal["scraping"] = "scraping"
+    bot_name: str = ""
+    correlation_id: Optional[Union[str, int]] = None
+    # Scheduling priority; lower values run first.
+    priority: int = 0
+    # Time budget requested by the client, in milliseconds from ingest; it can
+    # only shorten the server's own.
+    deadline_ms: Optional[PositiveInt] = None
 
     @classmethod
     def from_dict(cls, payload: dict) -> "ScrapingPayloadDTO":
-        request_data = payload.get("request", {})
-        response_data = payload.get("response", {})
-        return cls(
-            usage_context=payload.get("usage_context", "scraping"),
-            request=RequestDTO(**request_data),
-            response=ResponseDTO(**response_data),
-            bot_name=payload.get("bot_name", ""),
-        )
+        return cls.__pydantic_validator__.validate_python(payload)
 
 
-@dataclass
+@pydantic_dataclass(slots=True)
 class ScrapingErrorPayloadDTO:
-    usage_context: str
-    error: str
-    bot_name: str
+    usage_context: Literal["scraping-error"] = "scraping-error"
+    error: str = ""
+    bot_name: str = ""
+    correlation_id: Optional[Union[str, int]] = None
+    priority: int = 0
+    deadline_ms: Optional[PositiveInt] = None
 
     @classmethod
     def from_dict(cls, payload: dict) -> "ScrapingErrorPayloadDTO":
-        return cls(
-            usage_context=payload.get("usage_context", "scraping-error"),
-            error=payload.get("error", ""),
-            bot_name=payload.get("bot_name", ""),
-        )
+        return cls.__pydantic_validator__.validate_python(payload)
+
+
+def _usage_context(value: Any) -> str:
+    if isinstance(value, dict):
+        return value.get("usage_context", "scraping")
+    return getattr(value, "usage_context", "scraping")
+
+
+# Bot payloads are told apart by their usage context, "scraping" when missing.
+BotPayloadDTO = Annotated[
+    Union[
+        Annotated[ScrapingPayloadDTO, Tag("scraping")],
+        Annotated[ScrapingErrorPayloadDTO, Tag("scraping-error")],
+    ],
+    Discriminator(_usage_context),
+]
+
+bot_payload_adapter: TypeAdapter[BotPayloadDTO] = TypeAdapter(BotPayloadDTO)
+
+# A frame carries a single payload or a batch of them.
+bot_payload_frame_adapter: TypeAdapter[Union[BotPayloadDTO, List[BotPayloadDTO]]] = (
+    TypeAdapter(Union[BotPayloadDTO, List[BotPayloadDTO]])
+)
+
+
+def parse_bot_payload(data: Union[str, bytes, dict]) -> BotPayloadDTO:
+    """
+    Validate a bot payload into its DTO.
+
+    JSON text or bytes are parsed and validated in a single pass; dicts, e.g.
+    decoded from msgpack, are validated as they are.
+
+    Raises:
+        pydantic.ValidationError: If the payload does not match any DTO.
+    """
+    if isinstance(data, dict):
+        return bot_payload_adapter.validate_python(data)
+    return bot_payload_adapter.validate_json(data)
@@ -1,7 +1,14 @@
+import json
+import os
+from typing import List, Optional, Union
 from logger.log import get_logger_from_env
 from agents_orchestrators.scrapping_orchestrator import ScrapingOrchestrator
 from agents_orchestrators.scrapping_error_orchestrator import ScrapingErrorOrchestrator
+from agents_core.deadline import Deadline
 from agents_core.model_config import ModelConfig
+from agents_core.scheduler import JobCallback, job_scheduler
+from agents_workflows.scraping_workflow import StreamCallback
+from application.dtos.agent_dto import BotPayloadDTO, parse_bot_payload
 
 log = get_logger_from_env(__file__)
 
@@ -11,26 +18,109 @@ class OrchestratorUseCase:
         # The router decides which orchestrator should handle the payload.
         self.model_config = self._get_model_config()
         self.router = OrchestratorRouter(self.model_config)
+        self.scheduler = job_scheduler
+        # Time budget of a payload from ingest to report, in seconds.
+        self.request_timeout = float(os.getenv("REQUEST_TIMEOUT", "30"))
 
     def _get_model_config(self):
-        return ModelConfig(provider="openai", model_name="gpt-3.5-turbo")
+        # LLM_PROVIDER=fake runs the service offline against the local stand-in;
+        # LLM_OPTIONS carries provider-specific settings as a JSON object.
+        return ModelConfig(
+            provider=os.getenv("LLM_PROVIDER", "openai"),
+            model_name=os.getenv("LLM_MODEL_NAME", "gpt-3.5-turbo"),
+            temperature=float(os.getenv("LLM_TEMPERATURE", "0")),
+            options=json.loads(os.getenv("LLM_OPTIONS", "{}")),
+        )
 
-    async def process_bot_payload(self, bot_name: str, payload: dict) -> dict:
+    def submit_bot_payload(
+        self,
+        bot_name: str,
+        payload: Union[dict, BotPayloadDTO],
+        on_done: Optional[JobCallback] = None,
+        on_update: Optional[StreamCallback] = None,
+        stream_tokens: bool = False,
+    ) -> dict:
         """
-        Processes the payload from a given bot.
-        Recognizes the usage context and delegates the payload to the appropriate orchestrator.
+        Schedules the payload from a given bot and returns an acknowledgement
+        carrying the job id right away.
+
+        The report becomes the job's result, retrievable by job id, and
+        `on_done` is awaited with the finished job, e.g. to push the report.
+        `on_update` receives the partial results of the running job, tagged
+        with its id; `stream_tokens` adds the LLM tokens.
+
+        The payload's deadline starts now, so time spent queued counts against it.
+
+        Raises:
+            SchedulerFullError: If the job queue is at capacity.
+        """
+        payload = self._prepare(bot_name, payload)
+        deadline = self._deadline(payload)
+
+        async def publish(event: dict) -> None:
+            # `job` is bound below, before the job can start.
+            await on_update({**event, "job_id": job.id})
+
+        job = self.scheduler.submit(
+            payload.usage_context,
+            lambda: self._process(
+                payload, deadline, publish if on_update else None, stream_tokens
+            ),
+            priority=payload.priority,
+            on_done=on_done,
+        )
+        return {
+            "status": job.status,
+            "usage": payload.usage_context,
+            "job_id": job.id,
+        }
+
+    def cancel_job(self, job_id: str) -> bool:
         """
-        payload["bot_name"] = bot_name  # Attach bot name to payload.
-        # log.info(f"Processing payload from bot '{bot_name}': {payload}")
+        Cancels a queued or running job, e.g. once its client disconnected;
+        its `on_done` callback still receives it. Returns whether it was cancelled.
+        """
+        return self.scheduler.cancel(job_id)
+
+    @staticmethod
+    def _prepare(bot_name: str, payload: Union[dict, BotPayloadDTO]) -> BotPayloadDTO:
+        if isinstance(payload, dict):
+            payload = parse_bot_payload(payload)
+        payload.bot_name = bot_name  # Attach bot name to payload.
+        return payload
 
-        # Determine the usage context (defaulting to "scraping" for now).
-        usage_context = payload.get("usage_context", "scraping")
+    def _deadline(self, payload: BotPayloadDTO) -> Deadline:
+        # Clients may ask for a tighter budget than the server's, not a looser one.
+        budget = self.request_timeout
+        if payload.deadline_ms is not None:
+            budget = min(budget, payload.deadline_ms / 1000)
+        return Deadline.after(budget)
 
+    async def _process(
+        self,
+        payload: BotPayloadDTO,
+        deadline: Optional[Deadline] = None,
+        on_update: Optional[StreamCallback] = None,
+        stream_tokens: bool = False,
+    ) -> dict:
         # Get the appropriate orchestrator.
-        orchestrator = self.router.get_orchestrator(usage_context)
-        result = await orchestrator.process_payload(payload)
-        log.info(f"Processed payload: {result}")
-        return result
+        orchestrator = self.router.get_orchestrator(payload.usage_context)
+        return await orchestrator.process_payload(
+            payload, on_update, stream_tokens, deadline
+        )
+
+    def get_error_summary(self, bot_name: str) -> List[dict]:
+        """
+        Returns the deduplicated errors reported by a bot, most frequent first.
+        """
+        return self.router.get_orchestrator("scraping-error").error_summary(bot_name)
+
+    def warm_up(self) -> None:
+        """
+        Build the orchestrators, their LLM clients and workflow graphs now, so
+        the first payload does not pay for them.
+        """
+        self.router.warm_up()
 
 
 class OrchestratorRouter:
@@ -38,20 +128,37 @@ class OrchestratorRouter:
     Decides which orchestrator instance should handle a given payload based on its usage context.
     """
 
+    orchestrator_classes = {
+        "scraping": ScrapingOrchestrator,
+        "scraping-error": ScrapingErrorOrchestrator,
+    }
+
     def __init__(self, model_config: ModelConfig):
-        # Pre-instantiate orchestrator variants or use lazy instantiation.
-        self.orchestrators = {
-            "scraping": ScrapingOrchestrator(model_config),
-            "scraping-error": ScrapingErrorOrchestrator(model_config),
-        }
+        # Orchestrators are instantiated lazily, the first time their usage
+        # context is routed.
+        self.model_config = model_config
+        self.orchestrators = {}
 
     def get_orchestrator(self, usage_context: str):
         # Return the orchestrator that matches the usage context, defaulting to "generic".
-        log.debug(f"Routing payload to orchestrator for usage context: {usage_context}")
+        log.debug(
+            "Routing payload to orchestrator for usage context: %s", usage_context
+        )
         orchestrator = self.orchestrators.get(usage_context)
         if orchestrator is None:
-            log.warning(f"No orchestrator found for usage context '{usage_context}'.")
-            raise ValueError(
-                f"No orchestrator found for usage context '{usage_context}'."
-            )
+            orchestrator_class = self.orchestrator_classes.get(usage_context)
+            if orchestrator_class is None:
+                log.warning(
+                    "No orchestrator found for usage context '%s'.", usage_context
+                )
+                raise ValueError(
+                    f"No orchestrator found for usage context '{usage_context}'."
+                )
+            orchestrator = orchestrator_class(self.model_config)
+            self.orchestrators[usage_context] = orchestrator
         return orchestrator
+
+    def warm_up(self) -> None:
+        """Instantiate every orchestrator and build its workflow ahead of traffic."""
+        for usage_context in self.orchestrator_classes:
+            self.get_orchestrator(usage_context).warm_up()
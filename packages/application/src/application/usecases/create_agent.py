@@ -1,6 +1,9 @@
+import time
+from typing import List
+
 from application.dtos.agent_dto import CreateAgentDTO, AgentDTO
 from application.value_objects.agent_id import AgentID
-from agents_core.registry_protocol import AgentRegistryProtocol
+from agents_core.registry_protocol import AgentRecord, AgentRegistryProtocol
 from application.usecases.protocols import UseCaseProtocol
 
 
@@ -12,8 +15,18 @@ class CreateAgentUseCase(UseCaseProtocol[CreateAgentDTO, AgentDTO]):
 
     def execute(self, dto: CreateAgentDTO) -> AgentDTO:
         """Creates and registers an agent, returning a DTO."""
-        agent_class = self.registry.get_agent("base")  # Defaulting to BaseAgent
-        agent = agent_class(dto.name)  # Instantiate agent
-        agent_id = AgentID.generate()  # Generate a new AgentID
+        return self.execute_many([dto])[0]
+
+    def execute_many(self, dtos: List[CreateAgentDTO]) -> List[AgentDTO]:
+        """Creates and registers agents in one go, returning their DTOs."""
+        # Defaulting to BaseAgent; agents are stored as records and only
+        # instantiated from their class when run.
+        kind = "base"
+        self.registry.get_agent(kind)
+        now = time.time()
+        records = [
+            AgentRecord(AgentID.generate().value, dto.name, kind, now) for dto in dtos
+        ]
+        self.registry.save_agents(records)
 
-        return AgentDTO(id=agent_id, name=agent.name)
+        return [AgentDTO(id=AgentID(r.id), name=r.name) for r in records]
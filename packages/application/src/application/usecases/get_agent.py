@@ -11,6 +11,14 @@ class GetAgentUseCase(UseCaseProtocol[str, AgentDTO]):
         self.registry = registry
 
     def execute(self, agent_id: str) -> AgentDTO:
-        """Retrieve an agent by ID."""
-        agent = self.registry.get_agent(agent_id)
-        return AgentDTO(id=AgentID(agent_id), name=agent.name)
+        """
+        Retrieve an agent by ID.
+
+        Raises:
+            KeyError: If no agent has this ID.
+            ValueError: If the ID is not a valid AgentID.
+        """
+        agent = self.registry.find_agent(AgentID(agent_id).value)
+        if agent is None:
+            raise KeyError(agent_id)
+        return AgentDTO(id=AgentID(agent.id), name=agent.name)
@@ -0,0 +1,27 @@
+from application.dtos.agent_dto import AgentDTO, AgentPageDTO, ListAgentsDTO
+from application.value_objects.agent_id import AgentID
+from agents_core.registry_protocol import AgentRegistryProtocol
+from application.usecases.protocols import UseCaseProtocol
+
+
+class ListAgentsUseCase(UseCaseProtocol[ListAgentsDTO, AgentPageDTO]):
+    """Handles listing agents, page by page or by IDs."""
+
+    def __init__(self, registry: AgentRegistryProtocol):
+        self.registry = registry
+
+    def execute(self, query: ListAgentsDTO) -> AgentPageDTO:
+        """
+        Return the agents with the requested IDs, or the page after the cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        if query.ids is not None:
+            agents, next_cursor = self.registry.find_agents(query.ids), None
+        else:
+            agents, next_cursor = self.registry.list_agents(query.cursor, query.limit)
+        return AgentPageDTO(
+            items=[AgentDTO(id=AgentID(a.id), name=a.name) for a in agents],
+            next_cursor=next_cursor,
+        )
@@ -0,0 +1,73 @@
+import pytest
+from pydantic import ValidationError
+
+from application.dtos.agent_dto import (
+    ScrapingErrorPayloadDTO,
+    ScrapingPayloadDTO,
+    bot_payload_frame_adapter,
+    parse_bot_payload,
+)
+
+RAW_PAYLOAD = (
+    b'{"request": {"url": "https://example.com", "headers": {}, "method": "GET"},'
+    b' "response": {"url": "https://example.com", "status": "403",'
+    b' "headers": {"Server": ["cloudflare"]}, "body": "PGh0bWw+"},'
+    b' "correlation_id": "c-1"}'
+)
+
+
+def test_parses_wire_bytes_into_slotted_dtos():
+    payload = parse_bot_payload(RAW_PAYLOAD)
+
+    assert isinstance(payload, ScrapingPayloadDTO)
+    assert payload.response.status == 403
+    assert payload.response.body == "PGh0bWw+"  # Decoded only by the agents.
+    assert payload.correlation_id == "c-1"
+    assert not hasattr(payload, "__dict__")
+    assert not hasattr(payload.response, "__dict__")
+
+
+def test_routes_on_usage_context():
+    payload = parse_bot_payload({"usage_context": "scraping-error", "error": "boom"})
+
+    assert isinstance(payload, ScrapingErrorPayloadDTO)
+    assert payload.error == "boom"
+
+
+def test_keeps_raw_body_bytes():
+    payload = ScrapingPayloadDTO.from_dict(
+        {
+            "request": {"url": "u", "headers": {}, "method": "GET"},
+            "response": {"url": "u", "status": 200, "headers": {}, "body": b"\x00"},
+        }
+    )
+
+    assert payload.response.body == b"\x00"
+
+
+def test_frames_carry_single_payloads_or_batches():
+    error = b'{"usage_context": "scraping-error", "error": "boom"}'
+
+    single = bot_payload_frame_adapter.validate_json(RAW_PAYLOAD)
+    batch = bot_payload_frame_adapter.validate_json(
+        b"[" + RAW_PAYLOAD + b"," + error + b"]"
+    )
+
+    assert isinstance(single, ScrapingPayloadDTO)
+    assert [type(payload) for payload in batch] == [
+        ScrapingPayloadDTO,
+        ScrapingErrorPayloadDTO,
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'{"usage_context": "unknown"}',
+        b'{"response": {"url": "u", "status": "teapot", "headers": {}}}',
+        b"not json",
+    ],
+)
+def test_rejects_invalid_payloads(data):
+    with pytest.raises(ValidationError):
+        parse_bot_payload(data)
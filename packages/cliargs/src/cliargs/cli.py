@@ -27,6 +27,15 @@ def new_args_parser(description: str) -> argparse.ArgumentParser:
             Set the logging level. Acceptable values are "DEBUG", "INFO",
             "WARNING", "ERROR", and "CRITICAL". Defaults to "INFO".
 
+        --ws-workers:
+            Number of WebSocket worker processes. Defaults to None, in which
+            case the configuration (`WS_WORKERS`) decides.
+
+        --drain-timeout:
+            Seconds the WebSocket workers may spend finishing in-flight jobs on
+            shutdown. Defaults to None, in which case the configuration
+            (`DRAIN_TIMEOUT`) decides.
+
         --version:
             Display the application's version and exit. The version is
             hardcoded as "0.1.0".
@@ -53,6 +62,18 @@ def new_args_parser(description: str) -> argparse.ArgumentParser:
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Set the logging level. Defaults to INFO.",
     )
+    parser.add_argument(
+        "--ws-workers",
+        type=int,
+        default=None,
+        help="Number of WebSocket worker processes. Defaults to WS_WORKERS or 1.",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=None,
+        help="Seconds to let in-flight jobs finish on shutdown. Defaults to DRAIN_TIMEOUT or 30.",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -11,6 +11,15 @@ class Config:
             the environment variable 'LOG_LEVEL' (default is 'INFO') and converted to uppercase.
         verbose (bool): If True, enables verbose output. Defaults to False.
         debug (bool): If True, activates debug mode with detailed logging. Defaults to False.
+        ws_workers (int): Number of WebSocket worker processes. It is obtained from the
+            environment variable 'WS_WORKERS' (default is 1). With more than one worker,
+            connections are routed to workers by bot name.
+        ws_worker_base_port (int): First local port of the WebSocket workers; worker `i`
+            listens on `ws_worker_base_port + i`. It is obtained from the environment
+            variable 'WS_WORKER_BASE_PORT' (default is 8101).
+        drain_timeout (float): Seconds the WebSocket workers may spend finishing in-flight
+            jobs on shutdown. It is obtained from the environment variable 'DRAIN_TIMEOUT'
+            (default is 30).
     """
 
     log_level: str = field(
@@ -18,15 +27,27 @@ class Config:
     )
     verbose: bool = field(default=False)
     debug: bool = field(default=False)
+    ws_workers: int = field(default_factory=lambda: int(os.getenv("WS_WORKERS", "1")))
+    ws_worker_base_port: int = field(
+        default_factory=lambda: int(os.getenv("WS_WORKER_BASE_PORT", "8101"))
+    )
+    drain_timeout: float = field(
+        default_factory=lambda: float(os.getenv("DRAIN_TIMEOUT", "30"))
+    )
 
     def __post_init__(self):
         """Validates the configuration after initialization.
 
         Raises:
-            ValueError: If the log_level is not one of the valid options.
+            ValueError: If the log_level is not one of the valid options, or the number
+                of WebSocket workers is not positive, or the drain timeout is negative.
         """
         valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if self.log_level not in valid_levels:
             raise ValueError(
                 f"Invalid log level: {self.log_level}. Must be one of {valid_levels}"
             )
+        if self.ws_workers < 1:
+            raise ValueError(f"Invalid number of WebSocket workers: {self.ws_workers}")
+        if self.drain_timeout < 0:
+            raise ValueError(f"Invalid drain timeout: {self.drain_timeout}")
@@ -22,3 +22,24 @@ def test_invalid_log_level():
     with pytest.raises(ValueError) as excinfo:
         Config(log_level="INVALID")
     assert "Invalid log level: INVALID" in str(excinfo.value)
+
+
+def test_ws_workers_from_env(monkeypatch):
+    monkeypatch.setenv("WS_WORKERS", "4")
+    assert Config().ws_workers == 4
+
+
+def test_invalid_ws_workers():
+    with pytest.raises(ValueError) as excinfo:
+        Config(ws_workers=0)
+    assert "Invalid number of WebSocket workers: 0" in str(excinfo.value)
+
+
+def test_drain_timeout_from_env(monkeypatch):
+    monkeypatch.setenv("DRAIN_TIMEOUT", "2.5")
+    assert Config().drain_timeout == 2.5
+
+
+def test_invalid_drain_timeout():
+    with pytest.raises(ValueError):
+        Config(drain_timeout=-1)
@@ -1,33 +1,204 @@
 """Logging module."""
 
+import atexit
+import copy
 import logging
 import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
 
 from pythonjsonlogger import json
 
+LOG_FORMAT = "%(levelname)s %(filename)s %(message)s"
+
+_lock = threading.Lock()
+_queue_handler: Optional["_DeferredQueueHandler"] = None
+_stream_handler: Optional["_StderrHandler"] = None
+_listener: Optional[QueueListener] = None
+_listening = False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Hands records over to the writer thread.
+
+    Only the message is rendered in the calling thread, since its arguments
+    may change once the call returns; JSON formatting and the stream write
+    happen in the writer thread. Records are only created, and their arguments
+    only rendered, for enabled levels.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Render the traceback now; the frames it references are released.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to the current `sys.stderr`, which may be swapped after setup."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket rate limit per call site of a logger.
+
+    Each message template (the unformatted `msg`) may be logged `rate` times
+    per second, with bursts of up to `burst`. Records above the limit are
+    dropped and counted; the next record let through reports how many were
+    suppressed. Records at `exempt_level` or above are never dropped.
+
+    At most `max_buckets` templates are tracked, least recently logged first
+    out, so messages rendered before logging cannot grow it without bound.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        exempt_level: int = logging.WARNING,
+        max_buckets: int = 1024,
+    ):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self.exempt_level = exempt_level
+        self.max_buckets = max_buckets
+        # Template -> (tokens, last refill, suppressed count)
+        self._buckets: OrderedDict[Tuple[str, int], Tuple[float, float, int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        key = (str(record.msg), record.levelno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                self._buckets[key] = (tokens - 1, now, 0)
+            else:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        if not allowed:
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+def _start_listener() -> "_DeferredQueueHandler":
+    """Start the writer thread once per process and return the queue handler."""
+    global _queue_handler, _stream_handler, _listener, _listening
+    with _lock:
+        if _listener is None:
+            _stream_handler = _StderrHandler()
+            _stream_handler.setFormatter(json.JsonFormatter(LOG_FORMAT))
+            _queue_handler = _DeferredQueueHandler(queue.Queue())
+            _listener = QueueListener(_queue_handler.queue, _stream_handler)
+            _listener.start()
+            _listening = True
+            atexit.register(shutdown_logging)
+        return _queue_handler
+
+
+def _restart_listener_in_child() -> None:
+    # The writer thread does not survive a fork: give the child its own.
+    global _lock, _listener, _listening
+    _lock = threading.Lock()
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.Queue()
+    _listener = QueueListener(_queue_handler.queue, _stream_handler)
+    _listener.start()
+    _listening = True
+    if "multiprocessing" in sys.modules:
+        # Forked `multiprocessing` children skip `atexit`, but run finalizers.
+        from multiprocessing.util import Finalize
+
+        Finalize(None, shutdown_logging, exitpriority=-100)
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def flush_logging() -> None:
+    """Wait until every queued record has been written."""
+    if _queue_handler is not None:
+        _queue_handler.queue.join()
+
+
+def shutdown_logging() -> None:
+    """Write the queued records and stop the writer thread."""
+    global _listening
+    with _lock:
+        if _listening:
+            _listener.stop()
+            try:
+                _stream_handler.flush()
+            except ValueError:
+                # The stream was already closed by the interpreter or a test runner.
+                pass
+            _listening = False
+
 
 def setup_logging(
     module_name: str,
     propagate: bool = False,
     log_level: str = os.getenv("LOG_LEVEL", "INFO").upper(),
+    rate_limit: Optional[float] = None,
+    rate_burst: Optional[int] = None,
 ) -> logging.Logger:
     """
     Set up logging using JSON format.
 
+    Records are queued and written by a background thread, so logging never
+    blocks the event loop on formatting or I/O. Calling it again for the same
+    module only updates the logger's settings, no handler is added twice.
+
     Args:
         module_name (str): The module name.
         propagate (bool): Whether to propagate the logging to the parent logger.
         log_level (str): The log level.
+        rate_limit (Optional[float]): Messages per second allowed per message
+            template below WARNING; unlimited when None or 0.
+        rate_burst (Optional[int]): Burst allowed above `rate_limit`.
 
     Returns:
         The logger.
     """
-    log_handler = logging.StreamHandler()
-    formatter = json.JsonFormatter("%(levelname)s %(filename)s %(message)s")
-    log_handler.setFormatter(formatter)
+    log_handler = _start_listener()
 
     logger = logging.getLogger(module_name)
-    logger.addHandler(log_handler)
+    if log_handler not in logger.handlers:
+        logger.addHandler(log_handler)
+    for existing in [f for f in logger.filters if isinstance(f, RateLimitFilter)]:
+        logger.removeFilter(existing)
+    if rate_limit:
+        logger.addFilter(RateLimitFilter(rate_limit, rate_burst))
     logger.propagate = propagate
     logger.setLevel(logging.getLevelName(log_level))
     return logger
@@ -35,7 +206,8 @@ def setup_logging(
 
 def get_logger_from_env(module_name: str) -> logging.Logger:
     """
-    Get a logger using the `LOG_LEVEL` environment variable.
+    Get a logger using the `LOG_LEVEL`, `LOG_RATE_LIMIT` and `LOG_RATE_BURST`
+    environment variables.
 
     Args:
         module_name (str): The module name.
@@ -44,4 +216,11 @@ def get_logger_from_env(module_name: str) -> logging.Logger:
         The logger.
     """
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    return setup_logging(module_name, log_level=log_level)
+    rate_limit = float(os.getenv("LOG_RATE_LIMIT", "0"))
+    rate_burst = int(os.getenv("LOG_RATE_BURST", "0")) or None
+    return setup_logging(
+        module_name,
+        log_level=log_level,
+        rate_limit=rate_limit,
+        rate_burst=rate_burst,
+    )
@@ -1,33 +1,109 @@
+import io
+import json
 import logging
+import threading
 import unittest
 from unittest.mock import patch
 
-from logger.log import setup_logging
+from logger.log import RateLimitFilter, flush_logging, setup_logging
 
 
 class TestLogging(unittest.TestCase):
-    @patch("logging.StreamHandler")
-    @patch("pythonjsonlogger.json.JsonFormatter")
-    @patch("logging.getLogger")
-    def test_setup_logging(
-        self, mock_get_logger, mock_json_formatter, mock_stream_handler
-    ):
-        # Mock the dependencies
-        mock_logger = mock_get_logger.return_value
-        mock_handler = mock_stream_handler.return_value
-
-        # Call the function
-        logger = setup_logging("my_module", propagate=True, log_level="DEBUG")
-
-        # Assertions
-        mock_get_logger.assert_called_with("my_module")
-        mock_stream_handler.assert_called_once()
-        mock_json_formatter.assert_called_with("%(levelname)s %(filename)s %(message)s")
-        mock_handler.setFormatter.assert_called_with(mock_json_formatter.return_value)
-        mock_logger.addHandler.assert_called_with(mock_handler)
-        mock_logger.setLevel.assert_called_with(logging.DEBUG)
-        self.assertEqual(logger, mock_logger)
-        self.assertEqual(logger.propagate, True)
+    def setUp(self):
+        self.logger = setup_logging("my_module", propagate=True, log_level="DEBUG")
+        self.stream = io.StringIO()
+        stderr = patch("sys.stderr", self.stream)
+        stderr.start()
+        self.addCleanup(stderr.stop)
+
+    def records(self):
+        flush_logging()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_setup_logging(self):
+        self.assertEqual(self.logger, logging.getLogger("my_module"))
+        self.assertEqual(self.logger.propagate, True)
+        self.assertEqual(self.logger.level, logging.DEBUG)
+
+    def test_setup_logging_is_idempotent(self):
+        setup_logging("my_module", log_level="DEBUG")
+        logger = setup_logging("my_module", log_level="DEBUG")
+
+        self.assertEqual(len(logger.handlers), 1)
+        logger.info("once")
+        self.assertEqual(
+            self.records(),
+            [{"levelname": "INFO", "filename": "log_test.py", "message": "once"}],
+        )
+
+    def test_arguments_are_rendered_only_for_enabled_levels(self):
+        class Payload:
+            rendered = 0
+
+            def __str__(self):
+                Payload.rendered += 1
+                return "payload"
+
+        logger = setup_logging("my_module", log_level="INFO")
+        logger.debug("Received %s", Payload())
+        logger.info("Processed %s", Payload())
+
+        self.assertEqual(Payload.rendered, 1)
+        self.assertEqual(self.records()[0]["message"], "Processed payload")
+
+    def test_records_are_written_by_the_writer_thread(self):
+        writers = []
+
+        class ThreadRecordingStream(io.StringIO):
+            def write(self, text):
+                writers.append(threading.current_thread())
+                return super().write(text)
+
+        with patch("sys.stderr", ThreadRecordingStream()):
+            self.logger.info("queued")
+            # Returns once the writer thread has handled every queued record.
+            flush_logging()
+
+        self.assertTrue(writers)
+        self.assertNotIn(threading.current_thread(), writers)
+
+    def test_exceptions_keep_their_traceback(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed")
+
+        record = self.records()[0]
+        self.assertEqual(record["message"], "failed")
+        self.assertIn("ValueError: boom", record["exc_info"])
+
+    def test_rate_limit_suppresses_repeated_messages(self):
+        logger = setup_logging("my_module", log_level="INFO", rate_limit=0.001)
+        for i in range(5):
+            logger.info("Processed %s", i)
+        logger.warning("never dropped")
+        logger.warning("never dropped")
+
+        messages = [r["message"] for r in self.records()]
+        self.assertEqual(messages, ["Processed 0", "never dropped", "never dropped"])
+
+    def test_rate_limit_reports_suppressed_count(self):
+        limit = RateLimitFilter(rate=1000, burst=1)
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None)
+        self.assertTrue(limit.filter(record))
+        self.assertFalse(limit.filter(record))
+        limit._buckets[("m", logging.INFO)] = (1, 0, 3)
+        self.assertTrue(limit.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+    def test_rate_limit_tracks_a_bounded_number_of_templates(self):
+        limit = RateLimitFilter(rate=1, max_buckets=2)
+        for msg in ("a", "b", "a", "c"):
+            record = logging.LogRecord("x", logging.INFO, __file__, 1, msg, None, None)
+            limit.filter(record)
+        self.assertEqual(
+            list(limit._buckets), [("a", logging.INFO), ("c", logging.INFO)]
+        )
 
 
 if __name__ == "__main__":
@@ -2,6 +2,11 @@ from fastapi import FastAPI
 from logger.log import get_logger_from_env
 from presenters.rest.controllers.agent_controller import router as agent_router
 from presenters.rest.controllers.auth_controller import router as auth_router
+from presenters.rest.controllers.metrics_controller import (
+    register_collectors,
+    router as metrics_router,
+)
+from presenters.rest.controllers.stats_controller import router as stats_router
 
 log = get_logger_from_env(__file__)
 
@@ -14,6 +19,8 @@ app = FastAPI(
 # Register routers
 app.include_router(agent_router)
 app.include_router(auth_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
 
 
 @app.get("/", tags=["Root"])
@@ -25,6 +32,11 @@ def root():
     }
 
 
+@app.on_event("startup")
+def startup_event():
+    register_collectors()
+
+
 @app.on_event("shutdown")
 def shutdown_event():
     log.info("REST API shutting down... Cleaning up resources.")
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
-from application.dtos.agent_dto import CreateAgentDTO, AgentDTO
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from application.dtos.agent_dto import (
+    AgentDTO,
+    AgentPageDTO,
+    CreateAgentDTO,
+    CreateAgentsDTO,
+    ListAgentsDTO,
+)
 from presenters.rest.dependencies import get_agent_service, AgentService
 from security.dependencies import get_current_user
 
 router = APIRouter(prefix="/agents", tags=["Agents"])
 
+# Largest number of agents created, or looked up by id, in one request.
+MAX_BATCH_SIZE = int(os.getenv("AGENTS_BATCH_MAX", "1000"))
+
 
 @router.post("/", response_model=AgentDTO, status_code=201)
 def create_agent(
@@ -25,6 +37,55 @@ def create_agent(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/batch", response_model=List[AgentDTO], status_code=201)
+def create_agents(
+    dto: CreateAgentsDTO,
+    service: AgentService = Depends(get_agent_service),
+    user: dict = Depends(get_current_user),  # 🔒 Require authentication
+):
+    """
+    Creates up to `AGENTS_BATCH_MAX` agents in a single transaction.
+    Only authenticated users with 'admin' or 'agent' roles can create agents.
+    """
+    if user["role"] not in ["admin", "agent"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    if len(dto.agents) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"At most {MAX_BATCH_SIZE} agents per batch"
+        )
+
+    try:
+        return service.create_agents(dto.agents)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=AgentPageDTO)
+def list_agents(
+    ids: Optional[str] = Query(None, description="Comma-separated agent IDs."),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    service: AgentService = Depends(get_agent_service),
+    user: dict = Depends(get_current_user),  # 🔒 Require authentication
+):
+    """
+    Lists agents in creation order, a page at a time; pass the returned
+    `next_cursor` to get the next page. With `ids`, returns the existing
+    agents among them instead.
+    Only authenticated users can list agents.
+    """
+    agent_ids = [i for i in ids.split(",") if i] if ids is not None else None
+    if agent_ids is not None and len(agent_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413, detail=f"At most {MAX_BATCH_SIZE} ids per request"
+        )
+
+    try:
+        return service.list_agents(ListAgentsDTO(agent_ids, cursor, limit))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/{agent_id}", response_model=AgentDTO)
 def get_agent(
     agent_id: str,
@@ -37,5 +98,5 @@ def get_agent(
     """
     try:
         return service.get_agent(agent_id)
-    except KeyError:
+    except (KeyError, ValueError):
         raise HTTPException(status_code=404, detail="Agent not found")
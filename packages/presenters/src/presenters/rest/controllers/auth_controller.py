@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from security.auth import login_user
+from security.dependencies import revoke_current_token
 from application.dtos.auth_dto import LoginDTO
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -15,3 +16,11 @@ def login(request: LoginDTO):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
     return {"access_token": token, "token_type": "bearer"}
+
+
+@router.post("/logout", response_model=dict, status_code=200)
+def logout(_=Depends(revoke_current_token)):
+    """
+    Revoke the caller's JWT token.
+    """
+    return {"detail": "Token revoked"}
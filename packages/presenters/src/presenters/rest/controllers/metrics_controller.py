@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from agents_core.metrics import CONTENT_TYPE, metrics
+from security.token_cache import token_cache
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _token_cache_samples():
+    yield "jwt_cache_entries", {}, token_cache.stats()["entries"]
+
+
+def _token_cache_total_samples():
+    stats = token_cache.stats()
+    yield "jwt_cache_hits_total", {}, stats["hits"]
+    yield "jwt_cache_misses_total", {}, stats["misses"]
+
+
+def register_collectors() -> None:
+    """
+    Report the state of the REST process on its `/metrics`. Jobs, LLM calls and
+    connections live in the WebSocket processes, which serve their own. The JWT
+    cache is reported here only, where the API requests are authenticated.
+    """
+    metrics.register_collector("token_cache", _token_cache_samples)
+    metrics.register_collector(
+        "token_cache_totals", _token_cache_total_samples, "counter"
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Metrics of the REST API process in the Prometheus text format, for
+    scraping; enabled with `METRICS_ENABLED=true`.
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
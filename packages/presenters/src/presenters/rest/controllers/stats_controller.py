@@ -0,0 +1,26 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from agents_core.block_stats import block_stats
+from agents_core.shared_block_stats import shared_block_stats
+from security.dependencies import get_current_user
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@router.get("/blocks", response_model=dict)
+def get_block_stats(
+    bot_name: Optional[str] = None,
+    domain: Optional[str] = None,
+    user: dict = Depends(get_current_user),  # 🔒 Require authentication
+):
+    """
+    Rolling block-rate statistics per bot and response domain: status class
+    counts, block verdicts and download latency over the recent window.
+    Optionally filtered by bot name and domain.
+
+    Merged across the WebSocket workers that handle the payloads, as last
+    published by each of them.
+    """
+    stats = shared_block_stats.snapshot(bot_name=bot_name, domain=domain)
+    return {"window_seconds": block_stats.window_seconds, "stats": stats}
@@ -1,7 +1,17 @@
-from agents_core.registry import AgentRegistry
-from application.dtos.agent_dto import AgentDTO, CreateAgentDTO
+from functools import lru_cache
+from typing import List
+
+from agents_core.registry_protocol import AgentRegistryProtocol
+from agents_core.sqlite_registry import SQLiteAgentRegistry
+from application.dtos.agent_dto import (
+    AgentDTO,
+    AgentPageDTO,
+    CreateAgentDTO,
+    ListAgentsDTO,
+)
 from application.usecases.create_agent import CreateAgentUseCase
 from application.usecases.get_agent import GetAgentUseCase
+from application.usecases.list_agents import ListAgentsUseCase
 from application.usecases.protocols import UseCaseProtocol
 
 
@@ -10,25 +20,42 @@ class AgentService:
 
     def __init__(
         self,
-        create_agent_use_case: UseCaseProtocol[CreateAgentDTO, AgentDTO],
+        create_agent_use_case: CreateAgentUseCase,
         get_agent_use_case: UseCaseProtocol[str, AgentDTO],
+        list_agents_use_case: UseCaseProtocol[ListAgentsDTO, AgentPageDTO],
     ):
         self.create_agent_use_case = create_agent_use_case
         self.get_agent_use_case = get_agent_use_case
+        self.list_agents_use_case = list_agents_use_case
 
     def create_agent(self, dto: CreateAgentDTO) -> AgentDTO:
         """Creates an agent via the use case."""
         return self.create_agent_use_case.execute(dto)
 
+    def create_agents(self, dtos: List[CreateAgentDTO]) -> List[AgentDTO]:
+        """Creates agents in bulk via the use case."""
+        return self.create_agent_use_case.execute_many(dtos)
+
     def get_agent(self, agent_id: str) -> AgentDTO:
         """Retrieves an agent via the use case."""
         return self.get_agent_use_case.execute(agent_id)
 
+    def list_agents(self, query: ListAgentsDTO) -> AgentPageDTO:
+        """Lists agents via the use case."""
+        return self.list_agents_use_case.execute(query)
+
+
+@lru_cache(maxsize=1)
+def get_agent_registry() -> AgentRegistryProtocol:
+    """Provides the agent registry shared by every request."""
+    return SQLiteAgentRegistry()
+
 
 def get_agent_service() -> AgentService:
     """Provides an instance of AgentService with injected dependencies."""
-    registry = AgentRegistry()
+    registry = get_agent_registry()
     return AgentService(
         CreateAgentUseCase(registry),  # Inject CreateAgentUseCase
         GetAgentUseCase(registry),  # Inject GetAgentUseCase
+        ListAgentsUseCase(registry),  # Inject ListAgentsUseCase
     )
@@ -1,11 +1,22 @@
+import asyncio
+
 from fastapi import FastAPI
 from logger.log import get_logger_from_env
+from agents_core.shared_block_stats import shared_block_stats
+from agents_orchestrators.llm_registry import llm_registry
 from presenters.websockets.controllers.auth_ws_controller import (
     router as auth_ws_router,
 )
+from presenters.websockets.controllers.jobs_controller import router as jobs_router
+from presenters.websockets.controllers.metrics_controller import (
+    router as metrics_router,
+)
 from presenters.websockets.controllers.scrapy_ws_controller import (
+    orchestrator_usecase,
     router as scrapy_ws_router,
 )
+from presenters.websockets.drain import drain_controller
+from presenters.websockets.metrics import register_collectors
 
 log = get_logger_from_env(__file__)
 
@@ -14,8 +25,33 @@ app = FastAPI(title="Agents WebSocket API")
 # Register WebSocket routes
 app.include_router(auth_ws_router)
 app.include_router(scrapy_ws_router)
+# Jobs are kept by the worker that handles the scrapy payloads and only served
+# there; the affinity proxy routes a job id to its worker. Each worker serves
+# its own metrics, selected the same way. Block statistics are published to the
+# REST API instead, merged across workers.
+app.include_router(jobs_router)
+app.include_router(metrics_router)
+
+
+@app.on_event("startup")
+async def startup_event():
+    # The server process drains in-flight jobs when asked to (SIGUSR1).
+    drain_controller.install()
+    # LLM clients and their workflow graphs are built in the worker, after
+    # fork, before the first payload.
+    orchestrator_usecase.warm_up()
+    # Jobs, LLM calls and connections are only known to the process holding them.
+    register_collectors()
+    app.state.block_stats_publisher = asyncio.create_task(
+        shared_block_stats.publish_periodically()
+    )
 
 
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
     log.info("WebSocket server shutting down... Cleaning up connections.")
+    app.state.block_stats_publisher.cancel()
+    # The last totals stay readable until they go stale.
+    shared_block_stats.publish()
+    shared_block_stats.close()
+    await llm_registry.aclose()
@@ -0,0 +1,157 @@
+"""
+Wire formats for the WebSocket endpoints.
+
+Clients pick an encoding through WebSocket subprotocol negotiation
+(`Sec-WebSocket-Protocol`): `msgpack` frames are binary and carry raw bytes,
+e.g. the response body, while `json` (the default when nothing is requested)
+uses text frames. orjson and msgpack are dependencies of this package; should
+either be missing, the text path falls back to the standard library, and
+only JSON is offered without msgpack.
+"""
+
+import base64
+import dataclasses
+from abc import ABC, abstractmethod
+import json
+from typing import Any, Iterable, Optional, Tuple, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is missing
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is missing
+    msgpack = None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values the codecs do not support natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode("ascii")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class Codec(ABC):
+    """Encodes and decodes WebSocket messages."""
+
+    name: str
+    binary: bool
+
+    @abstractmethod
+    def encode(self, obj: Any) -> Union[str, bytes]:
+        """Encode a message into the payload of a frame."""
+
+    @abstractmethod
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """Decode the payload of a frame into a message."""
+
+    def validate(self, data: Union[str, bytes], adapter: TypeAdapter) -> Any:
+        """Decode a message and validate it with a pydantic TypeAdapter."""
+        return adapter.validate_python(self.decode(data))
+
+
+class JsonCodec(Codec):
+    """JSON over text frames, using orjson when it is installed."""
+
+    name = "json"
+    binary = False
+
+    def encode(self, obj: Any) -> str:
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default).decode("utf-8")
+        return json.dumps(obj, default=_default, separators=(",", ":"))
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def validate(self, data: Union[str, bytes], adapter: TypeAdapter) -> Any:
+        # pydantic parses and validates JSON in one pass, without building a dict.
+        return adapter.validate_json(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack over binary frames; bytes values travel unencoded."""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True, default=_msgpack_default)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return msgpack.unpackb(data, raw=False)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, bytearray):
+        return bytes(obj)
+    return _default(obj)
+
+
+JSON = JsonCodec()
+CODECS = {JSON.name: JSON}
+if msgpack is not None:
+    CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def negotiate(requested: Iterable[str]) -> Tuple[Codec, Optional[str]]:
+    """
+    Pick the first supported subprotocol in the client's order of preference.
+
+    Returns the codec and the subprotocol to confirm in the handshake, which is
+    None when the client did not request any supported one.
+    """
+    for subprotocol in requested:
+        codec = CODECS.get(subprotocol.strip().lower())
+        if codec is not None:
+            return codec, subprotocol
+    return JSON, None
+
+
+async def accept(websocket: WebSocket) -> Codec:
+    """Accept the connection with the negotiated subprotocol and return its codec."""
+    codec, subprotocol = negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    return codec
+
+
+async def receive(
+    websocket: WebSocket, codec: Codec, adapter: Optional[TypeAdapter] = None
+) -> Any:
+    """
+    Receive and decode the next message, whichever frame type it uses.
+
+    With an `adapter` the message is validated into its target type instead of
+    being returned as plain data.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    data = message.get("bytes")
+    if data is None:
+        data = message.get("text")
+    if adapter is not None:
+        return codec.validate(data, adapter)
+    return codec.decode(data)
+
+
+async def send(websocket: WebSocket, codec: Codec, obj: Any) -> None:
+    """Encode and send a message using the codec's frame type."""
+    encoded = codec.encode(obj)
+    if codec.binary:
+        await websocket.send_bytes(encoded)
+    else:
+        await websocket.send_text(encoded)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from security.dependencies import get_current_user
 from logger.log import get_logger_from_env
+from presenters.websockets import codecs
 from presenters.websockets.websocket_manager import WebSocketManager
 
 
@@ -15,15 +16,14 @@ async def websocket_auth(websocket: WebSocket, user=Depends(get_current_user)):
     """
     WebSocket endpoint requiring authentication.
     """
-    await ws_manager.connect(websocket)
+    codec = await ws_manager.connect(websocket)
     try:
         while True:
-            _ = await websocket.receive_text()
-            # data = await websocket.receive_text()
-            await websocket.send_json(
-                {"message": f"Hello {user['sub']}! You are authenticated."}
+            _ = await codecs.receive(websocket, codec)
+            await ws_manager.send(
+                websocket, {"message": f"Hello {user['sub']}! You are authenticated."}
             )
 
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
-        log.info(f"User {user['sub']} WebSocket disconnected.")
+        log.info("User %s WebSocket disconnected.", user["sub"])
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from agents_core.scheduler import job_scheduler
+from security.dependencies import get_current_user
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/", response_model=dict)
+def get_scheduler_stats(
+    user: dict = Depends(get_current_user),  # 🔒 Require authentication
+):
+    """
+    Job scheduler state of this worker: queued and running jobs per usage
+    context. Behind the affinity proxy, the `worker` query parameter (default
+    0) selects the worker; the endpoint itself ignores it.
+    """
+    return job_scheduler.stats()
+
+
+@router.get("/{job_id}", response_model=dict)
+def get_job(
+    job_id: str,
+    user: dict = Depends(get_current_user),  # 🔒 Require authentication
+):
+    """
+    Retrieves a scheduled job, including its report once it finished, from the
+    worker that owns it.
+    """
+    job = job_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
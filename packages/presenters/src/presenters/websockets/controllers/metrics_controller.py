@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from agents_core.metrics import CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Metrics of the WebSocket worker selected with the `worker` query parameter
+    (default 0), in the Prometheus text format; enabled with
+    `METRICS_ENABLED=true`.
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
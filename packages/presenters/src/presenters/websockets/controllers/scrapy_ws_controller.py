@@ -1,40 +1,129 @@
-import json
+import asyncio
 import logging
+from typing import Literal, Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from application.dtos.agent_dto import BotPayloadDTO, bot_payload_frame_adapter
 from application.usecases.agentic.orchestrator_usecase import OrchestratorUseCase
+from agents_core.scheduler import COMPLETED, Job, SchedulerFullError
+from presenters.websockets import codecs
+from presenters.websockets.drain import DRAINING_CLOSE_CODE, drain_controller
+from presenters.websockets.pipeline import PayloadPipeline
 
 log = logging.getLogger("scrapy_ws_controller")
 router = APIRouter()
 
+DRAINING_DETAIL = "Server is draining; retry later."
+
 # Instantiate the orchestrator use case once.
 orchestrator_usecase = OrchestratorUseCase()
 
 
+def job_report(job: Job) -> dict:
+    """The report pushed to the client once a job finished."""
+    if job.status == COMPLETED:
+        return {**job.result, "job_id": job.id}
+    return {"status": "error", "job_id": job.id, "detail": job.error or job.status}
+
+
+StreamMode = Literal["off", "updates", "tokens"]
+
+
 @router.websocket("/ws/scrapy/{bot_name}")
-async def websocket_scrapy(websocket: WebSocket, bot_name: str):
+async def websocket_scrapy(
+    websocket: WebSocket,
+    bot_name: str,
+    max_in_flight: int = 1,
+    stream: StreamMode = "off",
+):
     """
     Unprotected WebSocket endpoint for receiving scraping payloads.
     The URL includes the bot's name for identification.
-    This endpoint processes the payload via the Orchestrator Use Case and streams back the generated report.
+    This endpoint schedules the payload via the Orchestrator Use Case, acknowledges it
+    right away with its `job_id` and pushes the generated report once the job finished.
+
+    The `max_in_flight` query parameter enables pipelining: up to that many payloads
+    are processed concurrently, and the next frame is only read once one of them
+    finished. Acknowledgements and reports are tagged with the payload's
+    `correlation_id`. A frame may carry a single payload or a list of them. Jobs
+    still queued or running when the bot disconnects are cancelled.
+
+    The `stream` query parameter pushes partial results while a job runs:
+    with `updates`, a `{"type": "partial", "node", "data"}` frame per finished
+    workflow node; with `tokens`, also a `{"type": "token", "node", "content"}`
+    frame per LLM token. The report then comes as a frame of type `final`.
+
+    While the worker drains, new connections are closed with code 1013, payloads are
+    rejected and connected bots receive a `pause` control message.
     """
-    await websocket.accept()
-    log.info(f"Scrapy WebSocket connection accepted for bot: {bot_name}")
-    try:
-        while True:
-            data = await websocket.receive_text()
-            log.debug(f"Received payload from bot '{bot_name}': {data}")
+    codec = await codecs.accept(websocket)
+    if drain_controller.draining:
+        await websocket.close(code=DRAINING_CLOSE_CODE)
+        return
+    log.info(
+        "Scrapy WebSocket connection accepted for bot: %s (%s)", bot_name, codec.name
+    )
+    streaming = stream != "off"
+
+    async def process(payload: BotPayloadDTO) -> Optional[dict]:
+        if drain_controller.draining:
+            return {"status": "rejected", "detail": DRAINING_DETAIL}
+        finished = asyncio.get_running_loop().create_future()
+
+        # Schedule the payload through the Orchestrator Use Case; the report is
+        # pushed when the job finished.
+        async def push_report(job: Job) -> None:
+            log.debug("Generated report for bot '%s': %s", bot_name, job.result)
+            report = job_report(job)
+            if streaming:
+                report["type"] = "final"
+            await pipeline.send_report(report, payload.correlation_id)
+            if not finished.done():
+                finished.set_result(None)
 
-            # Assume the payload is JSON formatted.
-            payload = json.loads(data)
+        async def push_update(event: dict) -> None:
+            await pipeline.send_report(event, payload.correlation_id)
 
-            # Process the payload through the Orchestrator Use Case.
-            report = await orchestrator_usecase.process_bot_payload(bot_name, payload)
-            log.debug(f"Generated report for bot '{bot_name}': {report}")
+        ack = orchestrator_usecase.submit_bot_payload(
+            bot_name,
+            payload,
+            on_done=push_report,
+            on_update=push_update if streaming else None,
+            stream_tokens=stream == "tokens",
+        )
+        await pipeline.send_report(ack, payload.correlation_id)
+        # The payload holds its in-flight slot until its report was pushed.
+        try:
+            await finished
+        except asyncio.CancelledError:
+            # The bot disconnected: nobody waits for the report any more.
+            orchestrator_usecase.cancel_job(ack["job_id"])
+            raise
+        return None
 
-            # Send the final report back to the client.
-            await websocket.send_json(report)
+    pipeline = PayloadPipeline(websocket, process, max_in_flight, codec)
+    drain_controller.pipelines.add(pipeline)
+    try:
+        while True:
+            # Decoded with the negotiated wire format (JSON text or msgpack)
+            # and validated into the payload DTO in the same step.
+            try:
+                frame = await codecs.receive(
+                    websocket, codec, bot_payload_frame_adapter
+                )
+            except ValueError as e:
+                log.warning("Rejected invalid payload from bot '%s': %s", bot_name, e)
+                await pipeline.reject(str(e))
+                continue
+            # Clients may batch several payloads into one frame.
+            for payload in frame if isinstance(frame, list) else [frame]:
+                log.debug("Received payload from bot '%s': %s", bot_name, payload)
+                await pipeline.submit(payload)
     except WebSocketDisconnect:
-        log.info(f"Bot '{bot_name}' WebSocket disconnected.")
+        pipeline.cancel()
+        log.info("Bot '%s' WebSocket disconnected.", bot_name)
+    finally:
+        drain_controller.pipelines.discard(pipeline)
 
 
 @router.websocket("/ws/scrapy/{bot_name}/errors")
@@ -44,18 +133,50 @@ async def websocket_scrapy_errors(websocket: WebSocket, bot_name: str):
     The URL includes the bot's name for identification.
     This endpoint processes the error payload and logs it locally.
     """
-    await websocket.accept()
-    log.info(f"Scrapy Error WebSocket connection accepted for bot: {bot_name}")
+    codec = await codecs.accept(websocket)
+    if drain_controller.draining:
+        await websocket.close(code=DRAINING_CLOSE_CODE)
+        return
+    log.info("Scrapy Error WebSocket connection accepted for bot: %s", bot_name)
     try:
         while True:
-            data = await websocket.receive_text()
-            log.debug(f"Received error payload from bot '{bot_name}': {data}")
-
-            # Assume the payload is JSON formatted.
-            payload = json.loads(data)
-            report = await orchestrator_usecase.process_bot_payload(bot_name, payload)
-            log.debug(f"Generated error report for bot '{bot_name}': {report}")
-            # Log the error message locally.
-            log.error(f"Error from bot '{bot_name}': {payload['error']}")
+            try:
+                frame = await codecs.receive(
+                    websocket, codec, bot_payload_frame_adapter
+                )
+            except ValueError as e:
+                log.warning(
+                    "Rejected invalid error payload from bot '%s': %s", bot_name, e
+                )
+                continue
+            for payload in frame if isinstance(frame, list) else [frame]:
+                log.debug("Received error payload from bot '%s': %s", bot_name, payload)
+                if drain_controller.draining:
+                    log.warning(
+                        "Dropped error payload from bot '%s': draining", bot_name
+                    )
+                    continue
+                try:
+                    ack = orchestrator_usecase.submit_bot_payload(bot_name, payload)
+                except SchedulerFullError as e:
+                    log.warning("Dropped error payload from bot '%s': %s", bot_name, e)
+                    continue
+                log.debug("Scheduled error payload for bot '%s': %s", bot_name, ack)
+                # Log the error message locally.
+                log.error(
+                    "Error from bot '%s': %s", bot_name, getattr(payload, "error", "")
+                )
     except WebSocketDisconnect:
-        log.info(f"Bot '{bot_name}' Error WebSocket disconnected.")
+        log.info("Bot '%s' Error WebSocket disconnected.", bot_name)
+
+
+@router.get("/scrapy/{bot_name}/errors")
+async def get_scrapy_errors(bot_name: str):
+    """
+    Deduplicated errors reported by a bot: one entry per error fingerprint with
+    its occurrence count and first/last-seen timestamps.
+    """
+    return {
+        "bot_name": bot_name,
+        "errors": orchestrator_usecase.get_error_summary(bot_name),
+    }
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import signal
+import time
+from typing import Optional, Set
+
+from agents_core.scheduler import JobScheduler, job_scheduler
+from logger.log import get_logger_from_env
+from presenters.websockets.pipeline import PayloadPipeline
+
+log = get_logger_from_env(__file__)
+
+# Signal asking a WebSocket worker to drain before it exits.
+DRAIN_SIGNAL = signal.SIGUSR1
+
+# Close code for connections refused while draining ("try again later").
+DRAINING_CLOSE_CODE = 1013
+
+
+class DrainController:
+    """
+    Drains a WebSocket worker before shutdown.
+
+    On `DRAIN_SIGNAL` the worker stops accepting payloads, tells connected bots
+    to pause, and waits up to `timeout` seconds (read from `DRAIN_TIMEOUT`,
+    default 30) for queued and running jobs, so their reports are still pushed.
+    Jobs left at the deadline are abandoned. The worker then terminates itself,
+    which lets the server close the remaining connections gracefully.
+    """
+
+    def __init__(
+        self, scheduler: JobScheduler = job_scheduler, timeout: Optional[float] = None
+    ):
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.draining = False
+        self.pipelines: Set[PayloadPipeline] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self) -> None:
+        """Drain on `DRAIN_SIGNAL`; must be called from the server's event loop."""
+        try:
+            asyncio.get_running_loop().add_signal_handler(DRAIN_SIGNAL, self.start)
+        except (ValueError, RuntimeError, NotImplementedError) as e:
+            # Signal handlers are only available in the main thread.
+            log.debug("Drain signal handler not installed: %s", e)
+
+    def start(self) -> None:
+        """Begin draining in the background, then terminate the process."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._drain_and_exit())
+
+    async def _drain_and_exit(self) -> None:
+        await self.drain()
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    async def drain(self) -> int:
+        """Stop intake, pause bots and wait for the jobs; returns the abandoned count."""
+        timeout = self.timeout
+        if timeout is None:
+            timeout = float(os.getenv("DRAIN_TIMEOUT", "30"))
+        self.draining = True
+        started = time.monotonic()
+        log.info(
+            "Draining: %s queued and %s running jobs, %s connections, %.0fs deadline.",
+            self.scheduler.queued,
+            self.scheduler.running,
+            len(self.pipelines),
+            timeout,
+        )
+        await self._pause_bots(timeout)
+
+        try:
+            await asyncio.wait_for(self.scheduler.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        abandoned = self.scheduler.running + self.scheduler.cancel_queued()
+        log.info(
+            "Drain finished in %.2fs; %s jobs abandoned.",
+            time.monotonic() - started,
+            abandoned,
+        )
+        return abandoned
+
+    async def _pause_bots(self, timeout: float) -> None:
+        message = {
+            "type": "control",
+            "action": "pause",
+            "reason": "draining",
+            "retry_after": timeout,
+        }
+        await asyncio.gather(
+            *(pipeline.send_report(message, None) for pipeline in list(self.pipelines)),
+            return_exceptions=True,
+        )
+
+
+drain_controller = DrainController()
@@ -0,0 +1,72 @@
+from agents_core.metrics import metrics
+from agents_core.scheduler import job_scheduler
+from agents_orchestrators.llm_cache import peek_llm_cache
+from agents_orchestrators.llm_registry import llm_registry
+from agents_workflows.graph_cache import compiled_graphs
+from presenters.websockets.controllers.auth_ws_controller import ws_manager
+from presenters.websockets.drain import drain_controller
+
+
+def _connection_samples():
+    pipelines = list(drain_controller.pipelines)
+    yield "ws_connections", {"endpoint": "scrapy"}, len(pipelines)
+    yield "ws_payloads_in_flight", {}, sum(p.in_flight for p in pipelines)
+    stats = ws_manager.stats()
+    labels = {"endpoint": "auth"}
+    yield "ws_connections", labels, stats["connections"]
+    yield "ws_queued_messages", labels, stats["queued_messages"]
+    yield "ws_max_queue_depth", labels, stats["max_queue_depth"]
+
+
+def _delivery_samples():
+    stats = ws_manager.stats()
+    labels = {"endpoint": "auth"}
+    yield "ws_messages_sent_total", labels, stats["messages_sent"]
+    yield "ws_messages_dropped_total", labels, stats["messages_dropped"]
+    yield "ws_evictions_total", labels, stats["evictions"]
+
+
+def _scheduler_samples():
+    stats = job_scheduler.stats()
+    for context, counts in stats["contexts"].items():
+        yield "jobs_queued", {"usage_context": context}, counts["queued"]
+        yield "jobs_running", {"usage_context": context}, counts["running"]
+
+
+def _cache_samples():
+    # The cache is created by the first LLM call; scraping must not open it.
+    # The JWT cache is reported once, by the REST process.
+    cache = peek_llm_cache()
+    if cache is not None:
+        yield "llm_response_cache_entries", {}, cache.stats()["size"]
+    yield "graph_cache_entries", {}, len(compiled_graphs)
+
+
+def _cache_total_samples():
+    cache = peek_llm_cache()
+    if cache is None:
+        return
+    stats = cache.stats()
+    for tier in ("memory", "disk"):
+        yield "llm_response_cache_hits_total", {"tier": tier}, stats[f"{tier}_hits"]
+    yield "llm_response_cache_misses_total", {}, stats["misses"]
+    yield "llm_response_cache_evictions_total", {}, stats["evictions"]
+
+
+def _llm_limiter_samples():
+    for limiter in list(llm_registry.limiters.values()):
+        stats = limiter.stats()
+        labels = {"model": limiter.name}
+        yield "llm_limiter_concurrency_limit", labels, stats["limit"]
+        yield "llm_limiter_in_flight", labels, stats["in_flight"]
+        yield "llm_limiter_queued", labels, stats["queued"]
+
+
+def register_collectors() -> None:
+    """Report the jobs, LLM calls and connections of this WebSocket process."""
+    metrics.register_collector("websockets", _connection_samples)
+    metrics.register_collector("websocket_deliveries", _delivery_samples, "counter")
+    metrics.register_collector("scheduler", _scheduler_samples)
+    metrics.register_collector("caches", _cache_samples)
+    metrics.register_collector("cache_totals", _cache_total_samples, "counter")
+    metrics.register_collector("llm_limiters", _llm_limiter_samples)
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from agents_core.metrics import metrics
+from fastapi import WebSocket, WebSocketDisconnect
+from logger.log import get_logger_from_env
+from presenters.websockets.codecs import JSON, Codec, send
+
+log = get_logger_from_env(__file__)
+
+# Upper bound for the per-connection in-flight limit a client may request.
+MAX_IN_FLIGHT_LIMIT = int(os.getenv("SCRAPY_WS_MAX_IN_FLIGHT", "32"))
+
+CORRELATION_ID_KEY = "correlation_id"
+
+slot_wait = metrics.histogram(
+    "ws_payload_slot_wait_seconds",
+    "Time payloads waited for a free in-flight slot of their connection.",
+)
+
+
+class PayloadPipeline:
+    """
+    Processes the payloads of a single WebSocket connection concurrently.
+
+    Up to `max_in_flight` payloads are handled at the same time; reading the
+    next message blocks once the limit is reached, which back-pressures the
+    client. Reports are sent as soon as they complete, so they may arrive out
+    of order and carry the client-supplied correlation id. A handler that
+    sends its reports itself, through `send_report`, returns None.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        handler: Callable[[Any], Awaitable[Optional[dict]]],
+        max_in_flight: int = 1,
+        codec: Codec = JSON,
+    ):
+        self.websocket = websocket
+        self.codec = codec
+        self.handler = handler
+        self.max_in_flight = max(1, min(max_in_flight, MAX_IN_FLIGHT_LIMIT))
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._send_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, payload: Any) -> None:
+        """Schedule a payload, waiting for a free slot when the pipeline is full."""
+        if isinstance(payload, dict):
+            correlation_id = payload.pop(CORRELATION_ID_KEY, None)
+        else:
+            correlation_id = getattr(payload, CORRELATION_ID_KEY, None)
+        if metrics.enabled:
+            started = time.perf_counter()
+            await self._slots.acquire()
+            slot_wait.observe(time.perf_counter() - started)
+        else:
+            await self._slots.acquire()
+        task = asyncio.create_task(self._process(payload, correlation_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, payload: Any, correlation_id: Optional[Any]) -> None:
+        try:
+            report = await self.handler(payload)
+        except Exception as e:
+            log.error("Failed to process payload %r: %s", correlation_id, e)
+            report = {"status": "error", "detail": str(e)}
+        finally:
+            self._slots.release()
+
+        if report is not None:
+            await self.send_report(report, correlation_id)
+
+    async def reject(self, detail: str) -> None:
+        """Report a message that could not be decoded into a payload."""
+        await self.send_report({"status": "error", "detail": detail}, None)
+
+    async def send_report(self, report: dict, correlation_id: Optional[Any]) -> None:
+        """Send a report on the connection, e.g. pushed after the handler returned."""
+        if correlation_id is not None:
+            report = {**report, CORRELATION_ID_KEY: correlation_id}
+        try:
+            async with self._send_lock:
+                await send(self.websocket, self.codec, report)
+        except (WebSocketDisconnect, RuntimeError):
+            log.debug("Dropped report %r: connection closed.", correlation_id)
+
+    async def join(self) -> None:
+        """Wait until every in-flight payload has been reported."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def cancel(self) -> None:
+        """
+        Cancel in-flight payloads whose reports can no longer be delivered;
+        handlers cancel the work they started.
+        """
+        for task in self._tasks:
+            task.cancel()
@@ -1,23 +1,157 @@
+import asyncio
+import os
+from typing import Dict, Optional, Set, Union
+
 from fastapi import WebSocket
-from typing import List
+from logger.log import get_logger_from_env
+from presenters.websockets import codecs
+from presenters.websockets.codecs import Codec
+
+log = get_logger_from_env(__file__)
+
+Message = Union[str, bytes, dict]
+
+# Close code sent to evicted clients ("try again later").
+EVICTION_CLOSE_CODE = 1013
+
+
+class _Connection:
+    """
+    Outbound state of a single WebSocket: its codec, bounded queue and writer
+    task.
+    """
+
+    def __init__(self, websocket: WebSocket, codec: Codec, max_queue_size: int):
+        self.websocket = websocket
+        self.codec = codec
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.writer: Optional[asyncio.Task] = None
 
 
 class WebSocketManager:
-    """Manages WebSocket connections."""
+    """
+    Manages WebSocket connections.
+
+    Every connection gets a bounded outbound queue drained by its own writer
+    task, so a broadcast only enqueues and never waits on a slow client.
+    Clients whose queue overflows, or whose sends exceed `send_timeout`
+    seconds, are evicted. Messages are encoded with the codec negotiated by
+    each connection.
+    """
 
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(
+        self,
+        max_queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+    ):
+        self.max_queue_size = max_queue_size or int(
+            os.getenv("WS_MAX_QUEUE_SIZE", "100")
+        )
+        self.send_timeout = send_timeout or float(os.getenv("WS_SEND_TIMEOUT", "5"))
+        self.active_connections: Dict[WebSocket, _Connection] = {}
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.evictions = 0
+        # Close handshakes of evicted clients, referenced until they finish.
+        self._closing: Set[asyncio.Task] = set()
 
-    async def connect(self, websocket: WebSocket):
-        """Accept and store a new WebSocket connection."""
-        await websocket.accept()
-        self.active_connections.append(websocket)
+    async def connect(
+        self, websocket: WebSocket, accept: bool = True, codec: Codec = codecs.JSON
+    ) -> Codec:
+        """
+        Accept and store a new WebSocket connection, returning its codec: the
+        negotiated one when accepting here, `codec` otherwise.
+        """
+        if accept:
+            codec = await codecs.accept(websocket)
+        connection = _Connection(websocket, codec, self.max_queue_size)
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.active_connections[websocket] = connection
+        return codec
 
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection on disconnect."""
-        self.active_connections.remove(websocket)
+        connection = self.active_connections.pop(websocket, None)
+        if connection is None:
+            return
+        if connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+        self.messages_dropped += connection.queue.qsize()
 
-    async def broadcast(self, message: str):
+    async def send(self, websocket: WebSocket, message: Message):
+        """Queue a message for a single client."""
+        connection = self.active_connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, self._encode(message, connection.codec))
+
+    async def broadcast(self, message: Message):
         """Broadcast a message to all WebSocket clients."""
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        # Encode once per codec, not once per recipient.
+        encoded: Dict[str, Union[str, bytes]] = {}
+        for connection in list(self.active_connections.values()):
+            codec = connection.codec
+            if codec.name not in encoded:
+                encoded[codec.name] = self._encode(message, codec)
+            self._enqueue(connection, encoded[codec.name])
+
+    def stats(self) -> dict:
+        """Connection count, queue depths and delivery counters."""
+        depths = [c.queue.qsize() for c in self.active_connections.values()]
+        return {
+            "connections": len(depths),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _encode(message: Message, codec: Codec) -> Union[str, bytes]:
+        # Strings and bytes are sent as they are, in text and binary frames.
+        if isinstance(message, dict):
+            return codec.encode(message)
+        return message
+
+    def _enqueue(self, connection: _Connection, encoded: Union[str, bytes]) -> None:
+        try:
+            connection.queue.put_nowait(encoded)
+        except asyncio.QueueFull:
+            self.messages_dropped += 1
+            self._evict(connection, "outbound queue full")
+
+    def _evict(self, connection: _Connection, reason: str) -> None:
+        if connection.websocket not in self.active_connections:
+            return
+        log.warning("Evicting slow WebSocket client: %s", reason)
+        self.evictions += 1
+        self.disconnect(connection.websocket)
+        task = asyncio.create_task(self._close(connection.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=EVICTION_CLOSE_CODE)
+        except Exception as e:
+            log.debug("Failed to close evicted WebSocket: %s", e)
+
+    async def _write(self, connection: _Connection) -> None:
+        websocket = connection.websocket
+        while True:
+            encoded = await connection.queue.get()
+            try:
+                if isinstance(encoded, bytes):
+                    send = websocket.send_bytes(encoded)
+                else:
+                    send = websocket.send_text(encoded)
+                await asyncio.wait_for(send, timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict(connection, f"send exceeded {self.send_timeout}s")
+                return
+            except Exception as e:
+                log.debug("WebSocket send failed, dropping connection: %s", e)
+                self.disconnect(websocket)
+                return
+            self.messages_sent += 1
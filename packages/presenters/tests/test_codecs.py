@@ -0,0 +1,107 @@
+import asyncio
+from typing import Dict
+
+import pytest
+from fastapi import WebSocketDisconnect
+from pydantic import TypeAdapter
+
+from presenters.websockets import codecs
+
+
+class FakeWebSocket:
+    def __init__(self, subprotocols=(), messages=()):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.messages = list(messages)
+        self.accepted_subprotocol = None
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        self.accepted_subprotocol = subprotocol
+
+    async def receive(self):
+        return self.messages.pop(0)
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def test_negotiate_follows_client_preference_and_defaults_to_json():
+    assert codecs.negotiate(["msgpack", "json"]) == (
+        codecs.CODECS["msgpack"],
+        "msgpack",
+    )
+    assert codecs.negotiate(["json", "msgpack"]) == (codecs.JSON, "json")
+    assert codecs.negotiate(["cbor"]) == (codecs.JSON, None)
+    assert codecs.negotiate([]) == (codecs.JSON, None)
+
+
+def test_msgpack_round_trips_raw_body_bytes():
+    payload = {"response": {"status": 403, "body": b"\x00<html>blocked"}}
+    websocket = FakeWebSocket(subprotocols=["msgpack"])
+
+    async def scenario():
+        codec = await codecs.accept(websocket)
+        await codecs.send(websocket, codec, payload)
+        websocket.messages.append(
+            {"type": "websocket.receive", "bytes": websocket.sent[0]}
+        )
+        return codec, await codecs.receive(websocket, codec)
+
+    codec, received = asyncio.run(scenario())
+
+    assert websocket.accepted_subprotocol == "msgpack"
+    assert codec.binary
+    assert isinstance(websocket.sent[0], bytes)
+    assert received == payload
+
+
+def test_json_text_frames_and_disconnect():
+    websocket = FakeWebSocket(
+        messages=[
+            {"type": "websocket.receive", "text": '{"bot_name": "bot"}'},
+            {"type": "websocket.disconnect", "code": 1000},
+        ]
+    )
+
+    async def scenario():
+        codec = await codecs.accept(websocket)
+        first = await codecs.receive(websocket, codec)
+        with pytest.raises(WebSocketDisconnect):
+            await codecs.receive(websocket, codec)
+        await codecs.send(websocket, codec, {"status": "ok", "raw": b"hi"})
+        return first
+
+    assert asyncio.run(scenario()) == {"bot_name": "bot"}
+    assert websocket.accepted_subprotocol is None
+    assert websocket.sent == ['{"status":"ok","raw":"aGk="}']
+
+
+def test_receive_validates_into_adapter_type():
+    adapter = TypeAdapter(Dict[str, int])
+    frames = [
+        {"type": "websocket.receive", "text": '{"status": "403"}'},
+        {"type": "websocket.receive", "bytes": codecs.MsgpackCodec().encode({"a": 1})},
+    ]
+    websocket = FakeWebSocket(messages=frames)
+
+    async def scenario():
+        text = await codecs.receive(websocket, codecs.JSON, adapter)
+        binary = await codecs.receive(websocket, codecs.CODECS["msgpack"], adapter)
+        return text, binary
+
+    assert asyncio.run(scenario()) == ({"status": 403}, {"a": 1})
+
+
+def test_codecs_must_implement_encode_and_decode():
+    class Incomplete(codecs.Codec):
+        name = "incomplete"
+        binary = False
+
+        def encode(self, obj):
+            return ""
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from agents_core.scheduler import CANCELLED, COMPLETED, JobScheduler
+from presenters.websockets.drain import DrainController
+from presenters.websockets.pipeline import PayloadPipeline
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+async def _noop(payload):
+    return {"status": "done"}
+
+
+def test_drain_pauses_bots_and_finishes_jobs():
+    async def scenario():
+        scheduler = JobScheduler(workers=2)
+        controller = DrainController(scheduler, timeout=1)
+        websocket = FakeWebSocket()
+        controller.pipelines.add(PayloadPipeline(websocket, _noop))
+        jobs = [
+            scheduler.submit("scraping", lambda: asyncio.sleep(0.01)) for _ in range(4)
+        ]
+        abandoned = await controller.drain()
+        return controller, websocket, jobs, abandoned
+
+    controller, websocket, jobs, abandoned = asyncio.run(scenario())
+
+    assert controller.draining
+    assert abandoned == 0
+    assert all(job.status == COMPLETED for job in jobs)
+    assert websocket.sent == [
+        {"type": "control", "action": "pause", "reason": "draining", "retry_after": 1}
+    ]
+
+
+def test_drain_abandons_jobs_past_the_deadline():
+    async def scenario():
+        scheduler = JobScheduler(workers=1)
+        controller = DrainController(scheduler, timeout=0.05)
+        running = scheduler.submit("scraping", lambda: asyncio.sleep(1))
+        queued = scheduler.submit("scraping", lambda: asyncio.sleep(1))
+        abandoned = await controller.drain()
+        return running, queued, abandoned
+
+    running, queued, abandoned = asyncio.run(scenario())
+
+    assert abandoned == 2
+    assert queued.status == CANCELLED
@@ -0,0 +1,47 @@
+from agents_core.metrics import MetricsRegistry
+from agents_orchestrators import llm_cache
+from presenters.rest.controllers import metrics_controller
+from presenters.websockets import metrics as ws_metrics
+from security.revocations import RevocationList
+from security.token_cache import token_cache
+
+
+def test_each_app_reports_its_own_process(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        token_cache, "revocations", RevocationList(str(tmp_path / "auth.db"))
+    )
+    rest_registry = MetricsRegistry(enabled=True)
+    ws_registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(metrics_controller, "metrics", rest_registry)
+    monkeypatch.setattr(ws_metrics, "metrics", ws_registry)
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+
+    metrics_controller.register_collectors()
+    ws_metrics.register_collectors()
+    rest_output = rest_registry.render()
+    ws_output = ws_registry.render()
+
+    assert "# TYPE jwt_cache_hits_total counter\njwt_cache_hits_total 0" in rest_output
+    assert "# TYPE jwt_cache_entries gauge" in rest_output
+    assert "jwt_cache" not in ws_output
+    assert "ws_connections" not in rest_output
+    assert "llm_limiter" not in rest_output
+    assert 'ws_connections{endpoint="scrapy"} 0' in ws_output
+    assert "graph_cache_entries" in ws_output
+    # Scraping does not create the LLM response cache, nor its database.
+    assert "llm_response_cache" not in ws_output
+    assert llm_cache.peek_llm_cache() is None
+
+
+def test_llm_cache_totals_are_counters(monkeypatch):
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(ws_metrics, "metrics", registry)
+    config = llm_cache.LLMCacheConfig(sqlite_path=None)
+    monkeypatch.setattr(llm_cache, "_llm_cache", llm_cache.LLMResponseCache(config))
+
+    ws_metrics.register_collectors()
+    output = registry.render()
+
+    assert "# TYPE llm_response_cache_misses_total counter" in output
+    assert 'llm_response_cache_hits_total{tier="disk"} 0' in output
+    assert "# TYPE llm_response_cache_entries gauge" in output
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from presenters.websockets.pipeline import PayloadPipeline
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+def test_reports_complete_out_of_order_with_correlation_ids():
+    async def handler(payload):
+        await asyncio.sleep(payload["delay"])
+        return {"status": "done"}
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = PayloadPipeline(websocket, handler, max_in_flight=2)
+        await pipeline.submit({"correlation_id": "slow", "delay": 0.05})
+        await pipeline.submit({"correlation_id": "fast", "delay": 0})
+        await pipeline.join()
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+
+    assert [report["correlation_id"] for report in sent] == ["fast", "slow"]
+
+
+def test_in_flight_limit_bounds_concurrency():
+    running = 0
+    peak = 0
+
+    async def handler(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"status": "done"}
+
+    async def scenario():
+        pipeline = PayloadPipeline(FakeWebSocket(), handler, max_in_flight=3)
+        for i in range(10):
+            await pipeline.submit({"correlation_id": i})
+        await pipeline.join()
+
+    asyncio.run(scenario())
+
+    assert peak == 3
+
+
+def test_handler_errors_are_reported():
+    async def handler(payload):
+        raise ValueError("boom")
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        pipeline = PayloadPipeline(websocket, handler)
+        await pipeline.submit({"correlation_id": "x"})
+        await pipeline.join()
+        return websocket.sent
+
+    assert asyncio.run(scenario()) == [
+        {"status": "error", "detail": "boom", "correlation_id": "x"}
+    ]
@@ -0,0 +1,45 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from application.usecases.agentic.orchestrator_usecase import OrchestratorUseCase
+from presenters.websockets.controllers import scrapy_ws_controller
+
+
+def _payload(correlation_id: str) -> dict:
+    return {
+        "usage_context": "scraping",
+        "correlation_id": correlation_id,
+        "request": {"url": "https://example.com", "headers": {}, "method": "GET"},
+        "response": {
+            "url": "https://example.com",
+            "status": 403,
+            "headers": {},
+            "body": None,
+        },
+    }
+
+
+def test_payload_holds_its_slot_until_the_report_was_pushed(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "fake")
+    monkeypatch.setenv("LLM_MODEL_NAME", "ws-back-pressure")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    monkeypatch.setattr(
+        scrapy_ws_controller, "orchestrator_usecase", OrchestratorUseCase()
+    )
+    app = FastAPI()
+    app.include_router(scrapy_ws_controller.router)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/scrapy/shop?max_in_flight=1") as ws:
+            ws.send_json(_payload("a"))
+            ws.send_json(_payload("b"))
+            frames = [ws.receive_json() for _ in range(4)]
+
+    # With one slot, "b" is only read, and acknowledged, once "a" was reported.
+    assert [(f["correlation_id"], f["status"]) for f in frames] == [
+        ("a", "queued"),
+        ("a", "completed"),
+        ("b", "queued"),
+        ("b", "completed"),
+    ]
+    assert frames[0]["job_id"] == frames[1]["job_id"]
@@ -0,0 +1,107 @@
+import asyncio
+
+import msgpack
+from presenters.websockets.codecs import CODECS
+from presenters.websockets.websocket_manager import WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0, subprotocols=()):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+        self.scope = {"subprotocols": list(subprotocols)}
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self, code):
+        self.closed_with = code
+
+
+def test_broadcast_does_not_wait_for_slow_clients():
+    async def scenario():
+        manager = WebSocketManager(max_queue_size=10, send_timeout=5)
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.5)
+        await manager.connect(fast)
+        await manager.connect(slow)
+
+        await asyncio.wait_for(manager.broadcast({"event": "ping"}), timeout=0.1)
+        await asyncio.sleep(0.01)
+        return fast.sent, manager.stats()
+
+    sent, stats = asyncio.run(scenario())
+
+    assert sent == ['{"event":"ping"}']
+    assert stats["connections"] == 2
+
+
+def test_clients_exceeding_their_queue_are_evicted():
+    async def scenario():
+        manager = WebSocketManager(max_queue_size=1, send_timeout=5)
+        stalled = FakeWebSocket(delay=10)
+        await manager.connect(stalled)
+        for _ in range(3):
+            await manager.broadcast("message")
+        await asyncio.sleep(0)
+        return manager, stalled
+
+    manager, stalled = asyncio.run(scenario())
+
+    assert manager.stats()["connections"] == 0
+    assert manager.evictions == 1
+    assert stalled.closed_with == 1013
+    # The close task was kept alive until it finished.
+    assert not manager._closing
+
+
+def test_clients_exceeding_the_send_timeout_are_evicted():
+    async def scenario():
+        manager = WebSocketManager(send_timeout=0.01)
+        stalled = FakeWebSocket(delay=1)
+        await manager.connect(stalled)
+        await manager.broadcast("message")
+        await asyncio.sleep(0.05)
+        return manager
+
+    manager = asyncio.run(scenario())
+
+    assert manager.stats()["connections"] == 0
+    assert manager.evictions == 1
+
+
+def test_disconnect_is_idempotent():
+    async def scenario():
+        manager = WebSocketManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+        manager.disconnect(websocket)
+        manager.disconnect(websocket)
+        return manager
+
+    assert asyncio.run(scenario()).stats()["connections"] == 0
+
+
+def test_messages_use_the_codec_of_each_connection():
+    async def scenario():
+        manager = WebSocketManager()
+        text, binary = FakeWebSocket(), FakeWebSocket(subprotocols=["msgpack"])
+        await manager.connect(text)
+        assert await manager.connect(binary) is CODECS["msgpack"]
+
+        await manager.broadcast({"event": "ping"})
+        await asyncio.sleep(0.01)
+        return text.sent, binary.sent
+
+    text_sent, binary_sent = asyncio.run(scenario())
+
+    assert text_sent == ['{"event":"ping"}']
+    assert [msgpack.unpackb(data) for data in binary_sent] == [{"event": "ping"}]
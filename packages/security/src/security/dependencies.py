@@ -1,7 +1,7 @@
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from security.jwt import verify_access_token
+from security.jwt import revoke_access_token, verify_access_token
 
 security = HTTPBearer()
 
@@ -16,3 +16,15 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Security(securi
         return user_data  # Returns user info (e.g., {"sub": "admin", "role": "admin"})
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+
+
+def revoke_current_token(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+):
+    """
+    Revoke the JWT the request was authenticated with.
+    """
+    try:
+        revoke_access_token(credentials.credentials)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
@@ -4,6 +4,8 @@ from typing import Dict
 
 import jwt
 
+from security.token_cache import token_cache, token_digest
+
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "supersecretkey")  # Change in production!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token expiration time
@@ -24,11 +26,33 @@ def create_access_token(data: Dict, expires_delta: timedelta = None):
 def verify_access_token(token: str):
     """
     Verify and decode a JWT access token.
+
+    Verified claims are cached until the token expires, so repeated requests
+    with the same token skip the decode and signature check.
     """
+    return _verify(token, token_digest(token))
+
+
+def _verify(token: str, digest: str) -> Dict:
+    if token_cache.is_revoked(digest):
+        raise ValueError("Token has been revoked")
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return cached
     try:
         decoded_token = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return decoded_token  # Returns user info
     except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired")
     except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
+    token_cache.put(digest, decoded_token)
+    return decoded_token  # Returns user info
+
+
+def revoke_access_token(token: str):
+    """
+    Revoke a valid JWT access token until it expires.
+    """
+    digest = token_digest(token)
+    claims = _verify(token, digest)
+    token_cache.revoke(digest, float(claims["exp"]))
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    digest TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class RevocationList:
+    """
+    Digests of revoked tokens, shared by every process through SQLite.
+
+    The list is mirrored in memory. Each check runs one `PRAGMA data_version`
+    query, which reads no table, and the mirror is reloaded only after another
+    process committed to the database. Entries are kept until the token would
+    have expired anyway.
+
+    The database path is read from `AUTH_DB_PATH` (default `auth.db`).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("AUTH_DB_PATH", "auth.db")
+        self._revoked: Dict[str, float] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        # Process that opened the connection; a forked child opens its own.
+        self._pid: Optional[int] = None
+        self._data_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn, self._pid, self._data_version = conn, os.getpid(), None
+        return self._conn
+
+    def _refresh(self) -> None:
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        rows = conn.execute(
+            "SELECT digest, expires_at FROM revoked_tokens WHERE expires_at > ?",
+            (time.time(),),
+        ).fetchall()
+        self._revoked = dict(rows)
+        self._data_version = version
+
+    def is_revoked(self, digest: str) -> bool:
+        with self._lock:
+            self._refresh()
+            expires_at = self._revoked.get(digest)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, digest: str, expires_at: float) -> None:
+        """Revoke a token digest until `expires_at`, in every process."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # Forget revocations of tokens that expired on their own.
+                conn.execute(
+                    "DELETE FROM revoked_tokens WHERE expires_at <= ?", (time.time(),)
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO revoked_tokens (digest, expires_at) "
+                    "VALUES (?, ?)",
+                    (digest, expires_at),
+                )
+            # Our own commits leave `data_version` unchanged.
+            self._revoked[digest] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM revoked_tokens")
+            self._revoked.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._revoked)
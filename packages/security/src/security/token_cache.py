@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from security.revocations import RevocationList
+
+
+def token_digest(token: str) -> str:
+    """Return the digest a token is cached under; the token itself is never kept."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of the claims of verified tokens.
+
+    Entries are keyed by the token digest and expire at the token's own `exp`
+    claim, so a token is decoded and its signature verified once per lifetime
+    instead of once per request. At most `max_entries` tokens are kept, least
+    recently used first out. Every method takes the digest (see
+    `token_digest`), which callers compute once per check.
+
+    Revoked tokens are remembered, by digest, until they would have expired
+    anyway, and are rejected whether or not they were cached. Revocations are
+    shared by every process, through `revocations`, so a token revoked by the
+    REST API is also rejected by the WebSocket workers.
+
+    Defaults are read from `JWT_CACHE_MAX_ENTRIES` (10000).
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        revocations: Optional[RevocationList] = None,
+    ):
+        self.max_entries = max_entries or int(
+            os.getenv("JWT_CACHE_MAX_ENTRIES", "10000")
+        )
+        self._entries: OrderedDict[str, Tuple[Dict, float]] = OrderedDict()
+        self.revocations = revocations if revocations is not None else RevocationList()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Return the cached claims of a token, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+        # Callers may add to the claims; the cached ones stay untouched.
+        return dict(claims)
+
+    def put(self, digest: str, claims: Dict) -> None:
+        """Cache the claims of a verified token until its `exp` claim."""
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            # Tokens without an expiry are verified every time.
+            return
+        if self.revocations.is_revoked(digest):
+            return
+        with self._lock:
+            self._entries[digest] = (dict(claims), float(expires_at))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, digest: str) -> bool:
+        return self.revocations.is_revoked(digest)
+
+    def revoke(self, digest: str, expires_at: float) -> None:
+        """Reject a token from now on, until `expires_at` (its `exp` claim)."""
+        self.revocations.add(digest, expires_at)
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        self.revocations.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "revoked": len(self.revocations),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = VerifiedTokenCache()
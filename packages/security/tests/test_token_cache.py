@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from security.jwt import create_access_token, revoke_access_token, verify_access_token
+from security.revocations import RevocationList
+from security.token_cache import VerifiedTokenCache, token_digest, token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUTH_DB_PATH", str(tmp_path / "auth.db"))
+    monkeypatch.setattr(token_cache, "revocations", RevocationList())
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_token_is_decoded_once_per_lifetime():
+    token = create_access_token({"sub": "admin", "role": "admin"})
+
+    with patch("security.jwt.jwt.decode", wraps=jwt.decode) as decode:
+        for _ in range(3):
+            assert verify_access_token(token)["sub"] == "admin"
+
+    assert decode.call_count == 1
+
+
+def test_token_is_hashed_once_per_check():
+    token = create_access_token({"sub": "admin"})
+
+    with patch("security.jwt.token_digest", wraps=token_digest) as digest:
+        verify_access_token(token)
+
+    assert digest.call_count == 1
+
+
+def test_cached_claims_cannot_be_altered_by_callers():
+    token = create_access_token({"sub": "admin"})
+    verify_access_token(token)["sub"] = "mallory"
+
+    assert verify_access_token(token)["sub"] == "admin"
+
+
+def test_entries_expire_with_the_token():
+    cache = VerifiedTokenCache()
+    cache.put("token", {"sub": "admin", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+
+
+def test_cache_is_bounded():
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    for token in ("a", "b", "c"):
+        cache.put(token, {"exp": exp})
+
+    assert cache.get("a") is None
+    assert cache.get("c") == {"exp": exp}
+
+
+def test_revoked_token_is_rejected():
+    token = create_access_token({"sub": "admin"}, expires_delta=timedelta(minutes=5))
+    verify_access_token(token)
+    revoke_access_token(token)
+
+    with pytest.raises(ValueError, match="revoked"):
+        verify_access_token(token)
+
+
+def test_revocations_reach_every_process(tmp_path):
+    path = str(tmp_path / "shared.db")
+    rest, worker = RevocationList(path), RevocationList(path)
+    worker_cache = VerifiedTokenCache(revocations=worker)
+    digest, exp = token_digest("token"), time.time() + 60
+    worker_cache.put(digest, {"sub": "admin", "exp": exp})
+    assert not worker_cache.is_revoked(digest)
+
+    rest.add(digest, exp)
+
+    assert worker_cache.is_revoked(digest)
+    assert len(worker) == 1
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(ValueError, match="Invalid token"):
+        verify_access_token("not-a-token")
+
+    assert token_cache.stats()["entries"] == 0
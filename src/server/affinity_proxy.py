@@ -0,0 +1,138 @@
+import asyncio
+import re
+import zlib
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from logger.log import get_logger_from_env
+
+log = get_logger_from_env(__file__)
+
+# Routes scoped to a bot: /ws/scrapy/{bot_name}[/errors] and /scrapy/{bot_name}/...
+_BOT_PATH = re.compile(r"^/(?:ws/)?scrapy/([^/]+)")
+# Job ids are prefixed with the index of the worker that owns them.
+_JOB_PATH = re.compile(r"^/jobs/w(\d+)-")
+
+MAX_HEAD_SIZE = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+def worker_prefix(index: int) -> str:
+    """Prefix of the job ids issued by a worker, understood by `select_worker`."""
+    return f"w{index}-"
+
+
+def select_worker(target: str, workers: int) -> int:
+    """
+    Return the index of the worker that serves a request target.
+
+    Bot-scoped routes, and requests filtered by `bot_name`, hash the bot name
+    with CRC32 so a bot always reaches the same worker; job lookups go to the
+    worker that issued the job id. A `worker` query parameter selects a worker
+    explicitly, e.g. for its scheduler state or metrics. Anything else is served
+    by worker 0.
+    """
+    parts = urlsplit(target)
+    bot_name: Optional[str] = None
+    match = _BOT_PATH.match(parts.path)
+    if match:
+        bot_name = match.group(1)
+    else:
+        match = _JOB_PATH.match(parts.path)
+        if match:
+            index = int(match.group(1))
+            return index if index < workers else 0
+        query = parse_qs(parts.query)
+        bot_name = query.get("bot_name", [None])[0]
+        worker = query.get("worker", [""])[0]
+        if bot_name is None and worker.isdigit():
+            index = int(worker)
+            return index if index < workers else 0
+    if bot_name is None:
+        return 0
+    return zlib.crc32(bot_name.encode("utf-8")) % workers
+
+
+def _close_after_response(head: bytes) -> bytes:
+    """Force `Connection: close` on a plain HTTP request head."""
+    lines = head.split(b"\r\n")
+    kept = [line for line in lines[1:] if not line.lower().startswith(b"connection:")]
+    return b"\r\n".join([lines[0], b"Connection: close", *kept])
+
+
+class AffinityProxy:
+    """
+    TCP front for the WebSocket workers with bot-affinity routing.
+
+    Only the request head is parsed, to pick the worker; the rest of the
+    connection, WebSocket frames included, is piped through untouched. Plain
+    HTTP requests are forced to `Connection: close`, so a kept-alive connection
+    cannot carry a request meant for another worker.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        upstream_ports: List[int],
+        upstream_host: str = "127.0.0.1",
+    ):
+        self.host = host
+        self.port = port
+        self.upstream_ports = upstream_ports
+        self.upstream_host = upstream_host
+
+    async def serve(self) -> None:
+        server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_HEAD_SIZE
+        )
+        log.info(
+            "Affinity proxy listening on %s:%s for %s WebSocket workers",
+            self.host,
+            self.port,
+            len(self.upstream_ports),
+        )
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        request_line = head.split(b"\r\n", 1)[0].split(b" ")
+        target = request_line[1].decode("latin-1") if len(request_line) > 1 else "/"
+        index = select_worker(target, len(self.upstream_ports))
+        if b"upgrade: websocket" not in head.lower():
+            head = _close_after_response(head)
+
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(
+                self.upstream_host, self.upstream_ports[index]
+            )
+        except OSError as e:
+            log.error("WebSocket worker %s is unreachable: %s", index, e)
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+
+        upstream_writer.write(head)
+        await asyncio.gather(
+            self._pipe(reader, upstream_writer),
+            self._pipe(upstream_reader, writer),
+        )
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while chunk := await reader.read(CHUNK_SIZE):
+                writer.write(chunk)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
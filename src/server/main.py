@@ -1,8 +1,12 @@
 import asyncio
+import gc
 import logging
 import multiprocessing
 import sys
 import uvicorn
+from agents_core.dynamic_agent_factory import DynamicAgentFactory
+from agents_core.scheduler import job_scheduler
+from server.affinity_proxy import AffinityProxy, worker_prefix
 from server.signal_handler import SignalHandler
 from cliargs.cli import new_args_parser
 from config.core import Config
@@ -21,6 +25,32 @@ def run_ws_server():
     uvicorn.run(ws_app, host="0.0.0.0", port=8001, log_level="info")
 
 
+def run_ws_worker(index: int, port: int):
+    """Run one of several WebSocket workers on a local port."""
+    # Job ids tell the affinity proxy which worker owns the job.
+    job_scheduler.id_prefix = worker_prefix(index)
+    uvicorn.run(ws_app, host="127.0.0.1", port=port, log_level="info")
+
+
+def run_ws_proxy(ports: list[int]):
+    """Route WebSocket connections on port 8001 to the workers by bot name."""
+    asyncio.run(AffinityProxy("0.0.0.0", 8001, ports).serve())
+
+
+def preload():
+    """
+    Warm what every worker would otherwise load on its own before forking, and
+    freeze the heap so the garbage collector does not touch the shared pages.
+    """
+    # The apps and the orchestrator modules are loaded at import time; agent
+    # modules are otherwise only imported on first use. LLM clients hold
+    # connection pools and locks that must not be shared across processes, so
+    # they, and the workflow graphs bound to them, are built by each worker.
+    DynamicAgentFactory.preload()
+    gc.collect()
+    gc.freeze()
+
+
 def _set_log_level_env_var(log_level: str):
     """
     Set the `LOG_LEVEL` environment variable for the `logger` module.
@@ -30,20 +60,36 @@ def _set_log_level_env_var(log_level: str):
     os.environ["LOG_LEVEL"] = log_level
 
 
+def _set_drain_timeout_env_var(drain_timeout: float):
+    """
+    Set the `DRAIN_TIMEOUT` environment variable for the WebSocket workers.
+    """
+    import os
+
+    os.environ["DRAIN_TIMEOUT"] = str(drain_timeout)
+
+
 def setup_service() -> tuple[Config, logging.Logger]:
     """
     Parse CLI arguments, load configuration, and set up logging.
     """
     parser = new_args_parser("Run agents-service.")
     args = parser.parse_args()
+    overrides = {}
+    if args.ws_workers is not None:
+        overrides["ws_workers"] = args.ws_workers
+    if args.drain_timeout is not None:
+        overrides["drain_timeout"] = args.drain_timeout
     config = Config(
         log_level=args.log_level,
         verbose=args.verbose,
         debug=args.debug,
+        **overrides,
     )
 
     log = setup_logging(__file__, log_level=args.log_level)
     _set_log_level_env_var(config.log_level)
+    _set_drain_timeout_env_var(config.drain_timeout)
     if args.verbose:
         log.info("Verbose mode enabled.")
     if args.debug:
@@ -54,15 +100,35 @@ def setup_service() -> tuple[Config, logging.Logger]:
 
 def main():
     config, log = setup_service()
-    log.info(f"Loaded configuration: {config}")
-
-    rest_process = multiprocessing.Process(target=run_rest_server)
-    ws_process = multiprocessing.Process(target=run_ws_server)
-
-    rest_process.start()
-    ws_process.start()
-
-    signal_handler = SignalHandler(rest_process, ws_process)
+    log.info("Loaded configuration: %s", config)
+
+    # Workers are forked from the preloaded parent and share its memory
+    # copy-on-write.
+    preload()
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=run_rest_server, name="rest")]
+    if config.ws_workers == 1:
+        ws_processes = [context.Process(target=run_ws_server, name="ws")]
+        processes += ws_processes
+    else:
+        ports = [config.ws_worker_base_port + i for i in range(config.ws_workers)]
+        ws_processes = [
+            context.Process(target=run_ws_worker, args=(i, port), name=f"ws-{i}")
+            for i, port in enumerate(ports)
+        ]
+        processes += ws_processes
+        processes.append(
+            context.Process(target=run_ws_proxy, args=(ports,), name="ws-proxy")
+        )
+        log.info("Starting %s WebSocket workers on ports %s.", config.ws_workers, ports)
+
+    for process in processes:
+        process.start()
+
+    # WebSocket workers finish their in-flight jobs before everything stops.
+    signal_handler = SignalHandler(
+        *processes, drain_processes=ws_processes, drain_timeout=config.drain_timeout
+    )
 
     async def run_signal_handler():
         signal_handler.register_signal_handler()
@@ -74,8 +140,8 @@ def main():
     except KeyboardInterrupt:
         pass
 
-    rest_process.join()
-    ws_process.join()
+    for process in processes:
+        process.join()
     # Exit the main function gracefully
     return 0
 
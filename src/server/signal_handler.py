@@ -1,31 +1,54 @@
 import asyncio
+import os
 import signal
 import logging
 
+from presenters.websockets.drain import DRAIN_SIGNAL
+
 logger = logging.getLogger("shutdown")
 
+# Extra time a draining worker gets to close its connections and exit.
+DRAIN_GRACE_SECONDS = 5.0
+
 
 class SignalHandler:
-    def __init__(self, rest_process, ws_process):
-        self.rest_process = rest_process
-        self.ws_process = ws_process
+    def __init__(self, *processes, drain_processes=(), drain_timeout: float = 0.0):
+        self.processes = processes
+        # Drained first, while the other processes (e.g. the proxy) keep serving.
+        self.drain_processes = drain_processes
+        self.drain_timeout = drain_timeout
         self.shutdown = asyncio.Event()
+        self._exiting = False
 
     async def handle_exit(self, signum, frame):
-        logger.info(f"Received termination signal ({signum}), initiating shutdown...")
-        self.shutdown.set()
-
-        if self.rest_process and self.rest_process.is_alive():
-            logger.info("Stopping REST API server...")
-            self.rest_process.terminate()
-            self.rest_process.join()
-
-        if self.ws_process and self.ws_process.is_alive():
-            logger.info("Stopping WebSocket server...")
-            self.ws_process.terminate()
-            self.ws_process.join()
+        if self._exiting:
+            return
+        self._exiting = True
+        logger.info("Received termination signal (%s), initiating shutdown...", signum)
+
+        await self.drain()
+        for process in self.processes:
+            if process and process.is_alive():
+                logger.info("Stopping %s server...", process.name)
+                process.terminate()
+                process.join()
 
         logger.info("All services stopped. Exiting gracefully.")
+        self.shutdown.set()
+
+    async def drain(self):
+        """Ask the drainable processes to finish their jobs, up to the deadline."""
+        draining = [p for p in self.drain_processes if p and p.is_alive()]
+        for process in draining:
+            logger.info("Draining %s server...", process.name)
+            os.kill(process.pid, DRAIN_SIGNAL)
+
+        # Each worker exits on its own once drained; stragglers are terminated
+        # by `handle_exit`.
+        deadline = self.drain_timeout + DRAIN_GRACE_SECONDS
+        await asyncio.gather(
+            *(asyncio.to_thread(process.join, deadline) for process in draining)
+        )
 
     def register_signal_handler(self):
         loop = asyncio.get_running_loop()
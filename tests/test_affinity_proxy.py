@@ -0,0 +1,57 @@
+import asyncio
+
+from server.affinity_proxy import AffinityProxy, select_worker, worker_prefix
+
+
+def test_bot_routes_are_sticky_per_bot():
+    workers = 4
+    index = select_worker("/ws/scrapy/shop?max_in_flight=8", workers)
+
+    assert select_worker("/ws/scrapy/shop/errors", workers) == index
+    assert select_worker("/scrapy/shop/errors", workers) == index
+    assert select_worker("/stats/blocks?bot_name=shop", workers) == index
+    assert len({select_worker(f"/ws/scrapy/bot-{i}", workers) for i in range(50)}) == 4
+
+
+def test_jobs_route_to_the_owning_worker():
+    assert select_worker(f"/jobs/{worker_prefix(2)}abc", 4) == 2
+    assert select_worker(f"/jobs/{worker_prefix(9)}abc", 4) == 0
+    assert select_worker("/jobs/", 4) == 0
+    assert select_worker("/jobs/?worker=3", 4) == 3
+    assert select_worker("/metrics?worker=7", 4) == 0
+
+
+def test_proxy_pipes_to_the_selected_worker():
+    async def scenario():
+        async def upstream(name, reader, writer):
+            head = await reader.readuntil(b"\r\n\r\n")
+            writer.write(name + b"|" + head)
+            await writer.drain()
+            writer.close()
+
+        servers = [
+            await asyncio.start_server(
+                lambda r, w, n=n: upstream(n, r, w), "127.0.0.1", 0
+            )
+            for n in (b"w0", b"w1")
+        ]
+        ports = [s.sockets[0].getsockname()[1] for s in servers]
+        proxy = AffinityProxy("127.0.0.1", 0, ports)
+        front = await asyncio.start_server(proxy._handle, "127.0.0.1", 0)
+        front_port = front.sockets[0].getsockname()[1]
+
+        target = "/jobs/w1-abc"
+        reader, writer = await asyncio.open_connection("127.0.0.1", front_port)
+        writer.write(
+            f"GET {target} HTTP/1.1\r\nHost: x\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await writer.drain()
+        response = await reader.read()
+        for server in (*servers, front):
+            server.close()
+        return response
+
+    response = asyncio.run(scenario())
+
+    assert response.startswith(b"w1|GET /jobs/w1-abc HTTP/1.1\r\nConnection: close\r\n")
+    assert b"keep-alive" not in response